@@ -0,0 +1,72 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Background job which works out where automatic spoons go, so Cura doesn't lock up while it's thinking.
+# It never touches the scene; whoever started it gets the results from getResult() once it's finished
+# and adds the spoons from the main thread.
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+from typing import Any, Callable
+
+from UM.Job import Job
+
+from .placement_engine import SpoonSettings
+from .slasheetools import log as log
+
+class AutoSpoonJob(Job):
+    def __init__(self, snapshots: list, settings: SpoonSettings, planner: Callable[[Any, SpoonSettings, Callable[[], bool]], Any]) -> None:
+        """
+        Args:
+            snapshots (list): Snapshot of each node to place spoons on.
+            settings (SpoonSettings): Spoon settings from when the job was started.
+            planner (Callable[[Any, SpoonSettings, Callable[[], bool]], Any]): Works out the spoons for one snapshot.
+                Gets called from worker threads so it can't touch the scene, and gets given isCancelled to check as it goes.
+        """
+        super().__init__()
+        self._snapshots: list = snapshots
+        self._settings: SpoonSettings = settings
+        self._planner = planner
+        self._cancelled: bool = False
+
+    def getSnapshots(self) -> list:
+        return self._snapshots
+
+    def getSettings(self) -> SpoonSettings:
+        return self._settings
+
+    def cancel(self) -> None:
+        """Stops the job as soon as the shape it's working on is finished."""
+        self._cancelled = True
+        super().cancel()  # Takes it out of the queue if it hasn't started yet
+
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self) -> None:
+        # Results go in the same order as the snapshots no matter which order they finish in
+        plans: list = [None] * len(self._snapshots)
+        done_count: int = 0
+        self.progress.emit(self, 0)
+
+        # Threads rather than processes because spawning processes from inside Cura is asking for trouble
+        worker_count = max(1, min(len(self._snapshots), os.cpu_count() or 1))
+        executor = ThreadPoolExecutor(max_workers=worker_count)
+        try:
+            futures = {executor.submit(self._planner, snapshot, self._settings, self.isCancelled): i for i, snapshot in enumerate(self._snapshots)}
+            for future in as_completed(futures):
+                if self._cancelled:
+                    log("d", "AutoSpoonJob cancelled")
+                    return
+                try:
+                    plans[futures[future]] = future.result()
+                except Exception as e:  # Leaves the plan for that node as None so the rest can still go ahead
+                    log("e", f"AutoSpoonJob couldn't place spoons on {self._snapshots[futures[future]].name}: {e}")
+                done_count += 1
+                self.progress.emit(self, done_count / len(self._snapshots))
+        finally:
+            # Don't start on any nodes still waiting if it's been cancelled
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not self._cancelled:
+            self.setResult(plans)
@@ -0,0 +1,204 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Runs SpoonOrder on a G-code file that's already been written instead of on Cura's gcode_dict.
+# The file gets memory-mapped and only the layers SpoonOrder is looking at get read into memory,
+# so the most it holds at once is a couple of layers instead of the whole print. Layers it doesn't
+# change get copied across to the new file straight from the map in big chunks.
+# Doesn't need Cura so the command line tool can use it too.
+
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from .slasheetools import log as log
+
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+TEMP_SUFFIX = ".spoonorder-tmp"
+
+def _find_line(mapped: mmap.mmap, prefix: bytes, start: int, end: int) -> int:
+    """Offset of the first line starting with prefix in [start, end), or -1."""
+    if start == 0 and mapped[:len(prefix)] == prefix:
+        return 0
+    found = mapped.find(b"\n" + prefix, max(start - 1, 0), end)
+    return -1 if found == -1 else found + 1
+
+def _line_end(mapped: mmap.mmap, position: int) -> int:
+    """Offset just after the end of the line position is on."""
+    end = mapped.find(b"\n", position)
+    return len(mapped) if end == -1 else end + 1
+
+def scan_gcode_sections(mapped: mmap.mmap) -> list[tuple[int, int]]:
+    """Finds the (start, end) offsets of each part of a G-code file, split up the same way as
+    script_helpers.split_gcode_layers() does (which is the same as Cura's gcode_dict).
+    Only searches the bytes, nothing gets decoded."""
+    size = len(mapped)
+    sections: list[tuple[int, int]] = []
+    position = 0
+
+    layer = _find_line(mapped, b";LAYER:", 0, size)
+    header_end = _find_line(mapped, b";Generated with", 0, size if layer == -1 else layer)
+    if header_end != -1:
+        position = _line_end(mapped, header_end)
+        sections.append((0, position))
+
+    while layer != -1:
+        if layer > position:
+            sections.append((position, layer))
+        next_layer = _find_line(mapped, b";LAYER:", layer + 1, size)
+        layer_end = size if next_layer == -1 else next_layer
+        time_elapsed = _find_line(mapped, b";TIME_ELAPSED:", layer, layer_end)
+        if time_elapsed != -1:
+            layer_end = _line_end(mapped, time_elapsed)
+        sections.append((layer, layer_end))
+        position = layer_end
+        layer = next_layer
+
+    if position < size:
+        sections.append((position, size))
+    return sections
+
+class MappedGcodeLayers:
+    """Stands in for the list of layers SpoonOrder.execute() works on.
+    Layers get decoded when they're asked for, and anything put back gets written out to the new file
+    along with all the unchanged layers before it. SpoonOrder only ever goes forwards so that works out."""
+    def __init__(self, mapped: mmap.mmap, sections: list[tuple[int, int]], output: BinaryIO) -> None:
+        self._mapped = mapped
+        self._sections = sections
+        self._output = output
+        self._written_to: int = 0  # Everything in the source before this has been written
+        self._cache: dict[int, str] = {}  # SpoonOrder asks for the same few layers a few times each
+        self.changed_layers: int = 0
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self._sections)
+        if not 0 <= index < len(self._sections):
+            raise IndexError(f"MappedGcodeLayers index {index} out of range")
+        text = self._cache.get(index)
+        if text is None:
+            start, end = self._sections[index]
+            text = self._mapped[start:end].decode("utf-8", errors="surrogateescape")
+            if len(self._cache) >= 3:
+                del self._cache[next(iter(self._cache))]
+            self._cache[index] = text
+        return text
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self._sections)):
+            yield self[index]
+
+    def __setitem__(self, index: int, text: str) -> None:
+        start, end = self._sections[index]
+        if start < self._written_to:
+            raise ValueError(f"MappedGcodeLayers can't change layer {index} after it's been written")
+        self._copy_to(start)
+        self._output.write(text.encode("utf-8", errors="surrogateescape"))
+        self._written_to = end
+        self._cache.pop(index, None)
+        self.changed_layers += 1
+
+    def _copy_to(self, position: int) -> None:
+        with memoryview(self._mapped) as view:
+            for chunk_start in range(self._written_to, position, COPY_CHUNK_SIZE):
+                self._output.write(view[chunk_start:min(chunk_start + COPY_CHUNK_SIZE, position)])
+        self._written_to = max(self._written_to, position)
+
+    def finish(self) -> None:
+        """Writes everything after the last changed layer."""
+        self._copy_to(len(self._mapped))
+
+class MappedGcode:
+    """A G-code file opened for reordering. Use it as a context manager:
+
+        with MappedGcode(path) as gcode:
+            if gcode.contains("SpoonTab"):
+                gcode.reorder(path, SpoonOrder(), settings)
+
+    The reordered file replaces the output when it's closed, so output can be the file that's open.
+    """
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file: BinaryIO | None = None
+        self._mapped: mmap.mmap | None = None
+        self._sections: list[tuple[int, int]] = []
+        self._pending: tuple[Path, Path] | None = None  # (temporary file, what it replaces)
+
+    def __enter__(self) -> "MappedGcode":
+        self._file = open(self.path, "rb")
+        if os.fstat(self._file.fileno()).st_size > 0:  # Can't map an empty file
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._sections = scan_gcode_sections(self._mapped)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._mapped is not None:
+            self._mapped.close()
+        self._file.close()
+        if self._pending is not None:
+            temporary, output = self._pending
+            if exc_type is None:
+                os.replace(temporary, output)
+            else:
+                temporary.unlink(missing_ok=True)
+
+    def contains(self, text: str) -> bool:
+        return self._mapped is not None and self._mapped.find(text.encode("utf-8")) != -1
+
+    def start_sections(self) -> list[str]:
+        """Everything before the first layer (the header and start G-code)."""
+        start_sections: list[str] = []
+        for start, end in self._sections:
+            if self._mapped[start:start + len(b";LAYER:")] == b";LAYER:":
+                break
+            start_sections.append(self._mapped[start:end].decode("utf-8", errors="surrogateescape"))
+        return start_sections
+
+    def footer(self) -> str:
+        """The ";SETTING_3" lines at the end of the file, for script_helpers.read_setting_footer()."""
+        if self._mapped is None:
+            return ""
+        footer_start = self._mapped.rfind(b"\n;SETTING_3 ")
+        if footer_start == -1:
+            return ""
+        # There's a few lines of it, so find the first one
+        while True:
+            previous = self._mapped.rfind(b"\n;SETTING_3 ", 0, footer_start)
+            if previous == -1 or self._mapped.find(b"\n", previous + 1, footer_start) != -1:
+                break
+            footer_start = previous
+        return self._mapped[footer_start + 1:].decode("utf-8", errors="surrogateescape")
+
+    def reorder(self, output: Path, order, settings: dict | None = None) -> int:
+        """Runs a SpoonOrder on the file and writes the result to output.
+
+        Args:
+            output (Path): Where to write the result. Can be the file being read.
+            order (SpoonOrder): Set up for spoons first or last.
+            settings (dict | None): Same as SpoonOrder.execute() takes.
+
+        Returns:
+            int: How many layers were changed. If none were and output is the same file, it's left alone.
+        """
+        if self._mapped is None:
+            return 0
+        output = Path(output)
+        temporary = output.with_name(output.name + TEMP_SUFFIX)
+        try:
+            with open(temporary, "wb") as output_file:
+                layers = MappedGcodeLayers(self._mapped, self._sections, output_file)
+                order.execute(layers, settings)
+                layers.finish()
+        except Exception:
+            temporary.unlink(missing_ok=True)
+            raise
+        if layers.changed_layers == 0 and output.resolve() == self.path.resolve():
+            temporary.unlink(missing_ok=True)
+        else:
+            self._pending = (temporary, output)
+        log("d", f"MappedGcode reordered {layers.changed_layers} layers of {self.path}")
+        return layers.changed_layers
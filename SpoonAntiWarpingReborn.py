@@ -58,13 +58,16 @@
 #   - Removed existing translation files. It can still be translated, but everything I've changed broke the existing one. Help gladly accepted!
 
 from dataclasses import dataclass
+import io
 import os.path
 import math
 import random  # To make node names reasonably unique
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+import weakref
 
 import numpy as np
-from scipy.spatial import ConvexHull
-import trimesh
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QApplication
 
@@ -95,9 +98,28 @@ from UM.Scene.Selection import Selection
 from UM.Scene.SceneNode import SceneNode
 from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 from UM.i18n import i18nCatalog
+from UM.JobQueue import JobQueue
+from UM.FileHandler.WriteFileJob import WriteFileJob
+
+# trimesh and scipy are slow to import and only needed once someone uses automatic placement,
+# so they're imported where they're used instead of slowing down Cura starting up.
+if TYPE_CHECKING:
+    from scipy.spatial import cKDTree
+    import trimesh
 
 from .slasheetools import log as log, validate_int, validate_float
+from .geometry_helpers import (RayMesh, base_footprint, flat_motion, flat_rigid_motion, move_flat_points, nearest_point_angles,
+                               nearest_point_on_outline, outermost_hulls, warm_up_imports, world_triangles)
 from .SpoonOrder import SpoonOrder
+from .MappedGcode import MappedGcode
+from .AutoSpoonJob import AutoSpoonJob
+from .SpoonPreviewHandle import SpoonPreviewHandle
+from .SpoonDecorator import SpoonDecorator
+from .SpoonRegistry import SpoonRegistry
+from .SpoonCollisionIndex import SpoonCollisionIndex
+from .stage_timing import StageTimer, format_report, report_log_line, timed_method
+from .placement_engine import (OUTLINE_TOLERANCE_NOZZLES, SpoonSettings, angle_reference_points, minimum_gap, outline_tolerance,
+                               spoon_circle, spoon_height, spoon_mesh, spoon_outset, spoon_positions)
 
 @dataclass
 class Notification:
@@ -106,6 +128,41 @@ class Notification:
     lifetime: float  # Notification lifetime in seconds
     id: int  # Becasue we've all gotten our notifications mixed up while out shopping... right?
 
+@dataclass
+class BaseFootprint:
+    """Holds the parts of a model touching the build plate so they don't need to be
+    sliced out of the mesh again until the mesh or its position changes."""
+    mesh_data: MeshData  # Only used as an identity check
+    transformation: np.ndarray  # World transformation the footprint was calculated with
+    height: float
+    tolerance: float  # How much the contours were simplified
+    contours: list[np.ndarray]  # Outline of each area touching the plate as (x, z) points
+    hulls: list[Polygon]  # Convex hull of each of those contours
+
+@dataclass
+class AutoPlacement:
+    """A spoon automatic placement has decided on but hasn't added yet."""
+    node: CuraSceneNode
+    position: Vector
+    shape: Polygon
+    angle: float
+    transformation: np.ndarray  # Node's world transformation when it was worked out
+
+@dataclass
+class NodeSnapshot:
+    """Copy of everything automatic placement needs from a node,
+    so the geometry can be worked out away from the main thread."""
+    node: CuraSceneNode  # Only to match results back up; don't touch it off the main thread
+    name: str
+    mesh_data: MeshData
+    vertices: np.ndarray
+    indices: np.ndarray | None
+    transformation: np.ndarray
+    height: float
+    tolerance: float  # How much to simplify the outlines, see _outline_tolerance()
+    footprint: BaseFootprint | None  # Cached footprint if there's a valid one
+    fallback_hull: Polygon | None  # Cura's convex hull for when the footprint doesn't work out
+
 Resources.addSearchPath(
     os.path.join(os.path.abspath(os.path.dirname(__file__)))
 )  # Plugin translation file import
@@ -119,8 +176,10 @@ class SpoonAntiWarpingReborn(Tool):
     def __init__(self) -> None:
         super().__init__()
 
-        # List of created spoons (for delete all function)
-        self._all_created_spoons: list[SceneNode] = []
+        # Base footprints of models so automatic placement doesn't need to slice them every time
+        self._footprint_cache: weakref.WeakKeyDictionary[SceneNode, BaseFootprint] = weakref.WeakKeyDictionary()
+        # World space triangles of models that have been clicked on, with the mesh and transformation they came from
+        self._ray_mesh_cache: weakref.WeakKeyDictionary[SceneNode, tuple[MeshData, np.ndarray, RayMesh]] = weakref.WeakKeyDictionary()
 
         self._node_name_prefix: str = "<SpoonTab:"
         self._node_name_suffix: str = ">"
@@ -150,13 +209,57 @@ class SpoonAntiWarpingReborn(Tool):
 
         self._controller = self.getController()
 
+        # Keeps track of every spoon in the scene (for delete all function)
+        self._spoon_registry = SpoonRegistry(self._controller.getScene(), self._is_spoon_by_name)
+        # Where all the spoons and models are, so new spoons don't get put on top of them
+        self._collision_index = SpoonCollisionIndex(self._controller.getScene(), self._spoon_registry)
+
+        # Spoons follow their model around as its children, but get stretched or tipped over if it's scaled or tilted.
+        # So those get put back where they belong on the model, once it's stopped changing.
+        self._spoon_parent_transformations: dict[SceneNode, np.ndarray] = {}  # What each model's transformation was last time we looked
+        self._moved_spoon_parents: dict[SceneNode, None] = {}
+        self._relocating_spoons: bool = False
+        self._relocate_timer = QTimer()
+        self._relocate_timer.setInterval(300)
+        self._relocate_timer.setSingleShot(True)
+        self._relocate_timer.timeout.connect(self._relocateMovedSpoons)
+        # Undo and redo put spoons back along with their model, so they don't need relocating.
+        # The stack doesn't say why it changed, so it's worked out from what's on it, see _onOperationStackChanged().
+        self._operation_count: int = 0
+        self._last_operation = None
+        self._spoon_registry.spoonRegistered.connect(self._onSpoonRegistered)
+        self._spoon_registry.spoonUnregistered.connect(self._onSpoonUnregistered)
+
         self._selection_pass = None
 
         self._application: CuraApplication = CuraApplication.getInstance()
 
         self._order_script = SpoonOrder()
 
-        self.setExposedProperties("SpoonDiameter", "HandleLength", "HandleWidth", "LayerCount", "TeardropShape", "InputsValid", "Notifications", "PrintOrder", "AutoDensity")
+        # Where the time goes when placing spoons and when reordering G-code on save
+        self._stage_timer = StageTimer()
+        self._order_timer = StageTimer()
+        self._order_script.timer = self._order_timer  # So its phases show up in the report as well
+        self._profiling_report: str = ""
+
+        # Automatic placement runs in the background
+        self._auto_job: AutoSpoonJob = None
+        self._auto_progress: float = 0.0
+        self._auto_running: bool = False
+        self._auto_job_is_preview: bool = False
+
+        # Preview of automatic placement, drawn as the tool's handle so it isn't part of the scene
+        self._preview_handle = SpoonPreviewHandle()
+        self.setHandle(self._preview_handle)
+        self._preview_placements: list[AutoPlacement] = []
+        self._preview_active: bool = False
+        # Typing in a setting changes it a few times in a row, so only redo the preview once it settles down
+        self._preview_refresh_timer = QTimer()
+        self._preview_refresh_timer.setInterval(150)
+        self._preview_refresh_timer.setSingleShot(True)
+        self._preview_refresh_timer.timeout.connect(self.previewAutoSpoonMesh)
+
+        self.setExposedProperties("SpoonDiameter", "HandleLength", "HandleWidth", "LayerCount", "TeardropShape", "InputsValid", "Notifications", "PrintOrder", "AutoDensity", "AutoPlacement", "AutoProgress", "AutoRunning", "PreviewActive", "PreviewCount", "Profiling")
 
         # Note: if the selection is cleared with this tool active, there is no way to switch to
         # another tool than to reselect an object (by clicking it) because the tool buttons in the
@@ -180,6 +283,12 @@ class SpoonAntiWarpingReborn(Tool):
         self._preferences.addPreference("spoonawreborn/print_order", "Unchanged")
         self._preferences.addPreference("spoonawreborn/teardrop_shape", False)
         self._preferences.addPreference("spoonawreborn/auto_density", "Dense")
+        self._preferences.addPreference("spoonawreborn/auto_placement", "Corners")
+        self._preferences.addPreference("spoonawreborn/outline_tolerance", OUTLINE_TOLERANCE_NOZZLES)
+        self._preferences.addPreference("spoonawreborn/preload_geometry", True)
+        self._preferences.addPreference("spoonawreborn/profiling", False)
+        self._preferences.addPreference("spoonawreborn/profile_memory", False)
+        self._preferences.addPreference("spoonawreborn/order_after_write", False)
 
 
         self._spoon_diameter = float(self._preferences.getValue("spoonawreborn/spoon_diameter"))
@@ -189,20 +298,54 @@ class SpoonAntiWarpingReborn(Tool):
         self._print_order: str = self._preferences.getValue("spoonawreborn/print_order")
         self._teardrop_shape = bool(self._preferences.getValue("spoonawreborn/teardrop_shape"))
         self._auto_density: str = self._preferences.getValue("spoonawreborn/auto_density")
+        self._auto_placement: str = self._preferences.getValue("spoonawreborn/auto_placement")
+        # Fraction of the nozzle size outlines on the build plate get simplified to (0 to keep every point)
+        self._outline_tolerance_nozzles = float(self._preferences.getValue("spoonawreborn/outline_tolerance"))
+        # Reorder the G-code file after it's saved instead of gcode_dict before, for prints too big to have two copies of in memory
+        self._order_after_write = bool(self._preferences.getValue("spoonawreborn/order_after_write"))
+        self._pending_file_order: dict | None = None  # Settings to reorder the saved file with once its write job finishes
+        profiling = bool(self._preferences.getValue("spoonawreborn/profiling"))
+        self._stage_timer.setEnabled(profiling)
+        self._order_timer.setEnabled(profiling)
+        # Memory goes through tracemalloc, which makes everything a lot slower, so it has its own preference
+        profile_memory = bool(self._preferences.getValue("spoonawreborn/profile_memory"))
+        self._stage_timer.setTrackMemory(profile_memory)
+        self._order_timer.setTrackMemory(profile_memory)
 
         self._last_picked_node: SceneNode = None
         self._last_event: Event = None
 
+        operation_stack = self._application.getOperationStack()
+        self._operation_count = len(operation_stack.getOperations())
+        self._last_operation = operation_stack.getOperations()[-1] if self._operation_count else None
+        operation_stack.changed.connect(self._onOperationStackChanged)
+
         # Connect order script to write start
         self._application.getOutputDeviceManager().writeStarted.connect(self._run_spoon_order)
+
+        # Get the geometry libraries imported in the background once Cura's up and running
+        if self._preferences.getValue("spoonawreborn/preload_geometry"):
+            self._application.engineCreatedSignal.connect(self._start_geometry_warm_up)
         # Connect order script connector to plugins loaded
         #self._application.pluginsLoaded.connect(self._connect_write_signal)
 
     #def _connect_write_signal(self):
         #self._application.getOutputDeviceManager().writeStarted.connect(self._run_spoon_order)
 
+    def _start_geometry_warm_up(self) -> None:
+        threading.Thread(target=self._warm_up_geometry, name="SpoonAWRebornWarmUp", daemon=True).start()
+
+    def _warm_up_geometry(self) -> None:
+        try:
+            log("d", f"Spoon Anti-Warping Reborn imported geometry libraries in the background in {warm_up_imports() * 1000:.0f}ms")
+        except Exception as e:
+            # Not the end of the world, they'll just get imported when they're needed
+            log("w", f"Spoon Anti-Warping Reborn couldn't import geometry libraries in the background: {e}")
+
     def event(self, event: Event) -> None:
         super().event(event)
+        if event.type == Event.ToolDeactivateEvent:
+            self.clearAutoSpoonPreview()
         modifiers = QApplication.keyboardModifiers()
         ctrl_is_active: bool = modifiers & Qt.KeyboardModifier.ControlModifier
 
@@ -230,7 +373,7 @@ class SpoonAntiWarpingReborn(Tool):
             log("d", f"SpoonAntiWarpingReborn.event has picked node {picked_node.getName()}")
 
             # if it's a spoon_mesh -> remove it
-            if self._is_spoon_by_name(picked_node.getName()):
+            if self._spoon_registry.isSpoon(picked_node):
                 log("d", f"SpoonAntiWarpingReborn.event() > {picked_node.getName()} is a spoon so will be deleted.")
                 self._removeSpoonMesh(picked_node)
                 return
@@ -259,6 +402,17 @@ class SpoonAntiWarpingReborn(Tool):
             self._last_picked_node = picked_node
             self._last_event = event
 
+            # Automatic placement keeps its own run going, so a click while it's working gets counted as part of it
+            if self._auto_job is None:
+                self._stage_timer.begin("Click to add")
+            # Work out where the click hit the model straight from its mesh if we can
+            with self._stage_timer.stage("ray_cast"):
+                picked_position = self._ray_cast_position(picked_node, event)
+            if picked_position is not None:
+                self._place_picked_spoon(picked_node, picked_position)
+                return
+
+            # Otherwise fall back to rendering a picking pass
             # Hide all currently shown messages
             try:  # In a try...except for now at least, just to make sure anything gets caught
                 self._hide_messages()
@@ -274,14 +428,60 @@ class SpoonAntiWarpingReborn(Tool):
         event = self._last_event
         # Create a pass for picking a world-space location from the mouse location
         active_camera = self._controller.getScene().getActiveCamera()
-        picking_pass = PickingPass(active_camera.getViewportWidth(), active_camera.getViewportHeight())
-        picking_pass.render()
+        with self._stage_timer.stage("picking_pass"):
+            picking_pass = PickingPass(active_camera.getViewportWidth(), active_camera.getViewportHeight())
+            picking_pass.render()
 
-        picked_position = picking_pass.getPickedPosition(event.x, event.y)
+            picked_position = picking_pass.getPickedPosition(event.x, event.y)
         log("dd", f"picked_position = {repr(picked_position)} on {picked_node}")
 
-        if not self._check_valid_placement(picked_position):
+        self._place_picked_spoon(picked_node, picked_position)
+
+    def _ray_cast_position(self, node: CuraSceneNode, event: Event) -> Vector | None:
+        """Finds where a click hit a node by casting a ray from the camera at its mesh.
+        Returns None if it can't work it out so the picking pass can have a go."""
+        try:
+            ray_mesh = self._get_ray_mesh(node)
+            if ray_mesh is None:
+                return None
+            ray = self._controller.getScene().getActiveCamera().getRay(event.x, event.y)
+            origin = np.array([ray.origin.x, ray.origin.y, ray.origin.z])
+            direction = np.array([ray.direction.x, ray.direction.y, ray.direction.z])
+            distance = ray_mesh.intersect(origin, direction)
+        except Exception as e:
+            log("e", f"_ray_cast_position couldn't cast a ray at {node.getName()}: {e}")
+            return None
+        if distance is None:
+            log("d", f"_ray_cast_position missed {node.getName()}")
+            return None
+        hit = origin + direction * distance
+        log("dd", f"_ray_cast_position hit {node.getName()} at {hit}")
+        return Vector(float(hit[0]), float(hit[1]), float(hit[2]))
+
+    def _get_ray_mesh(self, node: CuraSceneNode) -> RayMesh | None:
+        """Gets the world space triangles of a node for ray casting, only rebuilding them if it's changed."""
+        mesh_data = node.getMeshData()
+        if mesh_data is None or mesh_data.getVertexCount() == 0:
+            return None
+        transformation = node.getWorldTransformation().getData()
+        cached = self._ray_mesh_cache.get(node)
+        if cached is not None and cached[0] is mesh_data and np.array_equal(cached[1], transformation):
+            return cached[2]
+        ray_mesh = RayMesh(world_triangles(mesh_data.getVertices(), mesh_data.getIndices(), transformation))
+        self._ray_mesh_cache[node] = (mesh_data, transformation.copy(), ray_mesh)
+        return ray_mesh
+
+    def _place_picked_spoon(self, picked_node: CuraSceneNode, picked_position: Vector) -> None:
+        # Need to know which way it'll point to know if it'll hit anything
+        with self._stage_timer.stage("defineAngle"):
+            spoon_angle = self.defineAngle(picked_node, picked_position)
+
+        with self._stage_timer.stage("collision_checks"):
+            placement_valid = self._check_valid_placement(picked_position, picked_node, spoon_angle)
+        if not placement_valid:
             log("d", f"picked_position {picked_position} deemed invalid")
+            if self._auto_job is None:
+                self._finish_timing(self._stage_timer)
             try:
                 self._show_messages()
             except Exception as e:
@@ -289,7 +489,9 @@ class SpoonAntiWarpingReborn(Tool):
             return
 
         # Add the spoon_mesh at the picked location
-        self._createSpoonMesh(picked_node, picked_position)
+        self._createSpoonMesh(picked_node, picked_position, angle=spoon_angle)
+        if self._auto_job is None:
+            self._finish_timing(self._stage_timer)
 
         try:
             self._show_messages()
@@ -339,7 +541,7 @@ class SpoonAntiWarpingReborn(Tool):
         self._notifications_string = "<br><br>".join(notification.text for notification in self._notifications)
         self.propertyChanged.emit()
 
-    def _check_valid_placement(self, picked_position) -> bool:
+    def _check_valid_placement(self, picked_position, parent: CuraSceneNode = None, angle: float = None) -> bool:
         # Check to see if Cura picked a spot off the build plate
         global_stack = CuraApplication.getInstance().getGlobalContainerStack()
         machine_width = float(global_stack.getProperty("machine_width", "value"))
@@ -367,9 +569,22 @@ class SpoonAntiWarpingReborn(Tool):
             self._notification_add(catalog.i18nc("spoon_on_plate_edge", "A spoon can't be that close to edge of the build plate. You should move your object in a bit."), 7.5)
             return False
 
-        #TODO: Use SceneNode.collidesWithBbox()
+        if parent is not None and angle is not None:
+            center, radius = self._spoon_circle(picked_position, angle)
+            # Same gap as automatic spoons get so it doesn't matter which way they were added
+            clearance = minimum_gap(self._auto_density, self._spoon_diameter)
+            collision = self._collision_index.spoonCollision(center, radius, parent, clearance)
+            if collision is not None:
+                log("d", f"Spoon at {picked_position} would run into {collision}")
+                self._notification_add(catalog.i18nc("spoon_collision", "There's no room for a spoon there. It would overlap or be too close to another spoon or model."), 7.5)
+                return False
+
         return True
 
+    def _spoon_circle(self, position: Vector, angle: float) -> tuple[tuple[float, float], float]:
+        """Where the round part of a spoon at position pointing at angle would be, as ((x, z), radius)."""
+        return spoon_circle(position.x, position.z, angle, self._spoon_diameter, self._handle_length)
+
     def _random_name_part(self) -> str:
         """Returns a 4 digit hexadecimal number."""
         # I'll be honest here. The hex parts of the name are mostly to make it
@@ -380,37 +595,83 @@ class SpoonAntiWarpingReborn(Tool):
         return f"{self._node_name_prefix}{self._random_name_part()}{self._node_name_suffix}"
 
     def _is_spoon_by_name(self, node_name: str) -> bool:
-        """Returns a bool of whether a name meets the criteria to belong to a spoon object"""
+        """Returns a bool of whether a name meets the criteria to belong to a spoon object.
+        Only used to recognise spoons from before they had a SpoonDecorator."""
         # If I wanted to be really thorough, I'd use a regex to check the hex digits.
         # But this should be close enough.
         return node_name.startswith(self._node_name_prefix) and node_name.rstrip("()0123456790 ").endswith(self._node_name_suffix)
 
-    def _createSpoonMesh(self, parent: CuraSceneNode, position: Vector, shape: Polygon = None):
+    def _placement_settings(self) -> SpoonSettings:
+        """The current settings automatic placement needs, so a job can keep using them if they're changed while it's running.
+        Spoons get built with the settings from when they're added and outlines use each model's own nozzle, so those aren't in here."""
+        return SpoonSettings(
+            spoon_diameter = self._spoon_diameter,
+            handle_length = self._handle_length,
+            handle_width = self._handle_width,
+            teardrop_shape = self._teardrop_shape,
+            density = self._auto_density,
+            placement = self._auto_placement,
+            reference_distance = self._default_reference_distance
+        )
+
+    def _spoon_settings(self) -> dict:
+        """The current spoon creation settings, to be stored with each spoon."""
+        return {
+            "spoon_diameter": self._spoon_diameter,
+            "handle_length": self._handle_length,
+            "handle_width": self._handle_width,
+            "layer_count": self._layer_count,
+            "teardrop_shape": self._teardrop_shape
+        }
+
+    def _spoon_height(self, layer_count: int | None = None) -> float:
+        """How tall spoons need to be for the number of layers they're set to (or layer_count if it's given)."""
+        extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]
+        #self._Extruder_count=global_container_stack.getProperty("machine_extruder_count", "value")
+
+        _layer_height_0: float = extruder_stack.getProperty("layer_height_0", "value")
+        _layer_height: float = extruder_stack.getProperty("layer_height", "value")
+        return spoon_height(_layer_height_0, _layer_height, self._layer_count if layer_count is None else layer_count)
+
+    def _createSpoonMesh(self, parent: CuraSceneNode, position: Vector, shape: Polygon = None, angle: float = None):
+        node = self._buildSpoonNode(parent, position, shape, angle)
+        self._addSpoonNodes([(node, parent)])
+
+    @timed_method("buildSpoonNode", "_stage_timer")
+    def _buildSpoonNode(self, parent: CuraSceneNode, position: Vector, shape: Polygon = None, angle: float = None,
+                        settings: dict | None = None, name: str | None = None) -> CuraSceneNode:
+        """Creates a spoon node ready to go into the scene without actually putting it there.
+        Uses the current spoon settings unless it's given the settings of one that's being remade."""
         node = CuraSceneNode()
-        log("d", f"_createSpoonMesh has a shape of {shape}")
+        log("d", f"_buildSpoonNode has a shape of {shape}")
 
         # local_transformation = parent.getLocalTransformation()
         # Logger.log('d', "Parent local_transformation --> " + str(local_transformation))
 
-        node.setName(self._generate_node_name())
+        node.setName(name if name is not None else self._generate_node_name())
         node.setSelectable(True)
 
+        if settings is None:
+            settings = self._spoon_settings()
+
         # Offset for height of click to position spoon on plate
         height_offset=position.y
 
-        extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]
-        #self._Extruder_count=global_container_stack.getProperty("machine_extruder_count", "value")
-
-        _layer_height_0: float = extruder_stack.getProperty("layer_height_0", "value")
-        _layer_height: float = extruder_stack.getProperty("layer_height", "value")
-        _spoon_height: float = (_layer_height_0 * 1.2) + (_layer_height * (self._layer_count -1) )
+        _spoon_height: float = self._spoon_height(settings["layer_count"])
 
-        _angle: float = self.defineAngle(parent, position, shape)
+        _angle: float = angle if angle is not None else self.defineAngle(parent, position, shape)
         # Logger.log('d', "Info createSpoonMesh Angle --> " + str(_angle))
 
-        mesh = self._createSpoon(self._spoon_diameter,self._handle_length,self._handle_width, 10, height_offset, _spoon_height, self._teardrop_shape, _angle)
+        mesh = self._createSpoon(settings["spoon_diameter"], settings["handle_length"], settings["handle_width"], 10, height_offset, _spoon_height, settings["teardrop_shape"], _angle)
+
+        # Remember where it goes on the model itself so it can be put back there if the model gets rotated or scaled
+        try:
+            local_anchor = np.linalg.solve(parent.getWorldTransformation().getData(), [position.x, position.y, position.z, 1.0])[:3]
+        except np.linalg.LinAlgError:  # Scaled to nothing. Good luck with that.
+            local_anchor = None
 
         node.setMeshData(mesh.build())
+        node.addDecorator(SpoonDecorator((position.x, position.y, position.z), _angle, parent.getName(), settings, local_anchor))
 
         active_build_plate = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
         node.addDecorator(BuildPlateDecorator(active_build_plate))
@@ -437,31 +698,163 @@ class SpoonAntiWarpingReborn(Tool):
         new_instance.resetState()  # Slashee says: I'm not sure if this actually does anything
         settings.addInstance(new_instance)
 
+        node.setPosition(position, CuraSceneNode.TransformSpace.World)  # Set the World Transformmation
+
+        return node
+
+    @timed_method("scene_operations", "_stage_timer")
+    def _addSpoonNodes(self, spoons: list[tuple[CuraSceneNode, CuraSceneNode]]) -> None:
+        """Puts a batch of (spoon, parent) pairs into the scene as a single undo step
+        and only tells everyone about it once."""
+        if not spoons:
+            return
+
         # First add node to the scene at the correct position/scale, before parenting, so the Spoon mesh does not get scaled with the parent
+        root = self._controller.getScene().getRoot()
         scene_op = GroupedOperation()
-        scene_op.addOperation(AddSceneNodeOperation(node, self._controller.getScene().getRoot())) # This one will set the model with the right transformation
-        scene_op.addOperation(SetParentOperation(node, parent)) # This one will link the tab with the parent ( Scale)
-
-        node.setPosition(position, CuraSceneNode.TransformSpace.World)  # Set the World Transformmation
+        for node, parent in spoons:
+            scene_op.addOperation(AddSceneNodeOperation(node, root)) # This one will set the model with the right transformation
+            scene_op.addOperation(SetParentOperation(node, parent)) # This one will link the tab with the parent ( Scale)
 
-        self._all_created_spoons.append(node)
-        self.propertyChanged.emit()
         scene_op.push()
+        for node, _ in spoons:
+            self._spoon_registry.register(node)
+        log("d", f"_addSpoonNodes added {len(spoons)} spoons in one operation")
 
-        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
+        self.propertyChanged.emit()
+        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(spoons[-1][0])
 
     def _removeSpoonMesh(self, node: CuraSceneNode):
-        parent = node.getParent()
-        if parent == self._controller.getScene().getRoot():
-            parent = None
+        self._removeSpoonMeshes([node])
+
+    def _removeSpoonMeshes(self, nodes: list[CuraSceneNode]) -> None:
+        """Removes a batch of spoons from the scene as a single undo step
+        and only tells everyone about it once."""
+        if not nodes:
+            return
 
-        remove_op = RemoveSceneNodeOperation(node)
+        root = self._controller.getScene().getRoot()
+        parents: list[SceneNode] = []
+        remove_op = GroupedOperation()
+        for node in nodes:
+            parent = node.getParent()
+            if parent and parent != root and parent not in parents:
+                parents.append(parent)
+            remove_op.addOperation(RemoveSceneNodeOperation(node))
         remove_op.push()
+        log("d", f"_removeSpoonMeshes removed {len(nodes)} spoons in one operation")
+
+        for node in nodes:
+            self._spoon_registry.unregister(node)
 
-        if parent and not Selection.isSelected(parent):
-            Selection.add(parent)
+        for parent in parents:
+            if not Selection.isSelected(parent):
+                Selection.add(parent)
 
-        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
+        self.propertyChanged.emit()
+        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(root)
+
+    def _onSpoonRegistered(self, spoon: SceneNode) -> None:
+        parent = spoon.getParent()
+        if parent is None or parent in self._spoon_parent_transformations:
+            return
+        self._spoon_parent_transformations[parent] = parent.getWorldTransformation().getData().copy()
+        parent.transformationChanged.connect(self._onSpoonParentTransformed)
+
+    def _onSpoonUnregistered(self, spoon: SceneNode) -> None:
+        for parent in list(self._spoon_parent_transformations):
+            if not self._spoon_registry.getSpoonsOf(parent):
+                del self._spoon_parent_transformations[parent]
+                self._moved_spoon_parents.pop(parent, None)
+                parent.transformationChanged.disconnect(self._onSpoonParentTransformed)
+
+    def _onSpoonParentTransformed(self, node: SceneNode) -> None:
+        # Children pass their signals up through their parent, so this gets the spoons themselves moving as well
+        if self._relocating_spoons or node not in self._spoon_parent_transformations:
+            return
+        self._moved_spoon_parents[node] = None
+        self._relocate_timer.start()  # Dragging or typing in a rotation changes it a lot in a row
+
+    def _onOperationStackChanged(self) -> None:
+        """Forgets about models which were moved by undo or redo, since their spoons got put back along with them.
+        Relocating them would push another operation, which throws away the rest of the redo steps.
+
+        Undo and redo only move around in the stack. Anything new gets added to the end (or merged with what's there),
+        so if the last operation is the same one as before nothing's been pushed."""
+        operations = self._application.getOperationStack().getOperations()
+        last_operation = operations[-1] if operations else None
+        undo_or_redo = len(operations) == self._operation_count and last_operation is self._last_operation
+        self._operation_count = len(operations)
+        self._last_operation = last_operation
+        if not undo_or_redo or not self._moved_spoon_parents:
+            return
+        # Whatever the spoons are on now is what they've been put back to match
+        for parent in self._moved_spoon_parents:
+            if parent in self._spoon_parent_transformations:
+                self._spoon_parent_transformations[parent] = parent.getWorldTransformation().getData().copy()
+        log("d", f"_onOperationStackChanged left {len(self._moved_spoon_parents)} models' spoons alone while undoing/redoing")
+        self._moved_spoon_parents.clear()
+
+    def _relocateMovedSpoons(self) -> None:
+        """Puts spoons back on models which have been tilted or scaled since they were added.
+        Spoons on models which have only been moved around the build plate are still right so they're left alone.
+        Everything that changes goes in one operation so it's one step to undo.
+
+        Scaling only stretches the model's outline on the build plate, so the cached footprint gets moved along
+        with it (see _onFootprintNodeMoved()). Only tilted models need slicing again."""
+        moved_parents = list(self._moved_spoon_parents)
+        self._moved_spoon_parents.clear()
+
+        root = self._controller.getScene().getRoot()
+        replacements: list[tuple[SceneNode, CuraSceneNode]] = []
+        relocate_op = GroupedOperation()
+        for parent in moved_parents:
+            old_transformation = self._spoon_parent_transformations.get(parent)
+            if old_transformation is None or parent.getParent() is None:
+                continue
+            transformation = parent.getWorldTransformation().getData().copy()
+            self._spoon_parent_transformations[parent] = transformation
+            if flat_rigid_motion(old_transformation, transformation) is not None:
+                continue
+
+            spoons = [spoon for spoon in self._spoon_registry.getSpoonsOf(parent) if spoon.callDecoration("getSpoonLocalAnchor") is not None]
+            if not spoons:
+                continue
+            hulls = [hull for hull in self._get_base_convex_hulls(parent) if hull.getPoints() is not None and len(hull.getPoints()) >= 3]
+            if not hulls:
+                fallback_hull = parent.callDecoration("getConvexHull")
+                if fallback_hull is None:
+                    log("w", f"_relocateMovedSpoons couldn't find where {parent.getName()} is on the build plate")
+                    continue
+                hulls = [fallback_hull]
+
+            for spoon in spoons:
+                local_anchor = spoon.callDecoration("getSpoonLocalAnchor")
+                anchor = transformation @ np.array([*local_anchor, 1.0])
+                # Wherever the anchor's ended up, the spoon goes on the nearest edge of what's touching the plate
+                nearest = [nearest_point_on_outline(hull.getPoints(), (anchor[0], anchor[2])) + (hull,) for hull in hulls]
+                point, _, hull = min(nearest, key=lambda candidate: candidate[1])
+                angle = float(self.defineAngles(parent, point.reshape(1, 2), hull)[0])
+                replacement = self._buildSpoonNode(parent, Vector(point[0], 0, point[1]), hull, angle,
+                                                   settings=spoon.callDecoration("getSpoonSettings"), name=spoon.getName())
+                relocate_op.addOperation(RemoveSceneNodeOperation(spoon))
+                relocate_op.addOperation(AddSceneNodeOperation(replacement, root))
+                relocate_op.addOperation(SetParentOperation(replacement, parent))
+                replacements.append((spoon, replacement))
+
+        if not replacements:
+            return
+        self._relocating_spoons = True
+        try:
+            relocate_op.push()
+        finally:
+            self._relocating_spoons = False
+        for spoon, replacement in replacements:
+            self._spoon_registry.unregister(spoon)
+            self._spoon_registry.register(replacement)
+        log("d", f"_relocateMovedSpoons put {len(replacements)} spoons back on their models")
+        self.propertyChanged.emit()
+        self._controller.getScene().sceneChanged.emit(root)
 
     def _onSelectionChanged(self):
         # When selection is passed from one object to another object, first the selection is cleared
@@ -489,239 +882,26 @@ class SpoonAntiWarpingReborn(Tool):
         type_infill_mesh = node_stack.getProperty("infill_mesh", "value")
         type_cutting_mesh = node_stack.getProperty("cutting_mesh", "value")
         type_support_mesh = node_stack.getProperty("support_mesh", "value")
-        type_spoon_mesh = self._is_spoon_by_name(node.getName())
+        type_spoon_mesh = self._spoon_registry.isSpoon(node)
         type_anti_overhang_mesh = node_stack.getProperty("anti_overhang_mesh", "value")
 
         return not any((type_infill_mesh, type_cutting_mesh, type_support_mesh, type_spoon_mesh, type_anti_overhang_mesh))
 
-    def _tangential_point_on_circle(self, center, radius, start_point):
-        """Return 2 tangenital points of circle from a given point
-        ...even though only the first one is ever used."""
-        # Calculation of the distance between point_fix and (center[0], center[1])
-        start_distance = math.sqrt((center[0] - start_point[0])**2 + (center[1] - start_point[1])**2)
-
-        # Search for the points of tangency of the line with the circle
-        tangency_points = []
-
-        # If point_fix is on the circle, there is only one point of tangency
-        if start_distance == radius:
-            tangency_points.append((start_point[0], start_point[1]))
-
-        else:
-            # Calculation of the angle between the line and the radius of the circle passing through the point of tangency
-            theta = math.asin(radius / start_distance)
-            # Calculation of the angle of the line
-            alpha = math.atan2(center[1] - start_point[1] , center[0] - start_point[0] )
-            # Calculation of the angles of the two rays passing through the points of tangency
-            beta1 = alpha + theta
-            beta2 = alpha - theta
-            # Calculation of the coordinates of the tangency points
-            tan_x_1 = center[0] - radius* math.sin(beta1)
-            tan_y_1 = center[1] + radius* math.cos(beta1)
-            tangency_points.append((tan_x_1, tan_y_1))
-
-            tan_x_2 = center[0] - radius* math.sin(beta2)
-            tan_y_2 = center[1] + radius* math.cos(beta2)
-            tangency_points.append((tan_x_2, tan_y_2))
-        return tangency_points
-
     # Spoon creation
+    @timed_method("createSpoon", "_stage_timer")
     def _createSpoon(self, size, handle_length, handle_width, segments,
-                     height, max_y, teardrop_shape, angle):
+                     height, max_y, teardrop_shape, angle) -> MeshBuilder:
+        vertices, indices = spoon_mesh(size, handle_length, handle_width, segments, height, max_y, teardrop_shape, angle)
         mesh = MeshBuilder()
-        # Per-vertex normals require duplication of vertices
-        circle_radius = size / 2
-        # First layer length
-        max_y = -height + max_y
-        negative_height = -height
-
-        segment_degrees = round((360 / segments),4)
-        segment_radians = math.radians(segments)
-
-        vertices = []
-
-        # Add the handle of the spoon
-        half_handle_width = handle_width / 2
-
-        if teardrop_shape:
-            circle_start = [0, half_handle_width]
-            circle_center = [(circle_radius + handle_length), 0]
-            tangent_points = self._tangential_point_on_circle(circle_center, circle_radius, circle_start)
-            #log("d", f"Tangent points: {tangent_points}")
-            vertex_count = 20
-            vertices = [ # 5 faces with 4 corners each
-                [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width,  max_y,  half_handle_width], [ tangent_points[0][0],  max_y,  tangent_points[0][1]], [ tangent_points[0][0], negative_height,  tangent_points[0][1]],
-                [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [ tangent_points[0][0], negative_height, -tangent_points[0][1]], [ tangent_points[0][0],  max_y, -tangent_points[0][1]],
-                [ tangent_points[0][0], negative_height, -tangent_points[0][1]], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width, negative_height,  half_handle_width], [ tangent_points[0][0], negative_height,  tangent_points[0][1]],
-                [-half_handle_width,  max_y, -half_handle_width], [ tangent_points[0][0],  max_y, -tangent_points[0][1]], [ tangent_points[0][0],  max_y,  tangent_points[0][1]], [-half_handle_width,  max_y,  half_handle_width],
-                [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width,  max_y,  half_handle_width]
-            ]
-            max_width=tangent_points[0][1]
-            max_length=tangent_points[0][0]
-        else:
-            vertex_count = 20
-            vertices = [ # 5 faces with 4 corners each
-                [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width,  max_y,  half_handle_width], [ handle_length,  max_y,  half_handle_width], [ handle_length, negative_height,  half_handle_width],
-                [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [ handle_length, negative_height, -half_handle_width], [ handle_length,  max_y, -half_handle_width],
-                [ handle_length, negative_height, -half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width, negative_height,  half_handle_width], [ handle_length, negative_height,  half_handle_width],
-                [-half_handle_width,  max_y, -half_handle_width], [ handle_length,  max_y, -half_handle_width], [ handle_length,  max_y,  half_handle_width], [-half_handle_width,  max_y,  half_handle_width],
-                [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width,  max_y,  half_handle_width]
-            ]
-            max_width=half_handle_width
-            max_length=handle_length
-
-        # Add Round Part of the Spoon
-        vertex_count_round = 0
-        # Used to fill in any gaps if the division of the circle into segments didn't quite add up
-        remainder_1 = 0
-        remainder_2 = 0
-
-        for i in range(0, math.ceil(segment_degrees)):
-            if (circle_radius*math.cos((i+1)*segment_radians)) >= 0 or (abs(circle_radius*math.sin((i+1)*segment_radians)) > max_width and abs(circle_radius*math.sin(i*segment_radians)) > max_width)  :
-                vertex_count_round += 1
-                # Top
-                vertices.append([handle_length+circle_radius, max_y, 0])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), max_y, circle_radius*math.sin((i+1)*segment_radians)])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), max_y, circle_radius*math.sin(i*segment_radians)])
-                #Side 1a
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), max_y, circle_radius*math.sin(i*segment_radians)])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), max_y, circle_radius*math.sin((i+1)*segment_radians)])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), negative_height, circle_radius*math.sin((i+1)*segment_radians)])
-                #Side 1b
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), negative_height, circle_radius*math.sin((i+1)*segment_radians)])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), negative_height, circle_radius*math.sin(i*segment_radians)])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), max_y, circle_radius*math.sin(i*segment_radians)])
-                #Bottom
-                vertices.append([handle_length+circle_radius, negative_height, 0])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), negative_height, circle_radius*math.sin(i*segment_radians)])
-                vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), negative_height, circle_radius*math.sin((i+1)*segment_radians)])
-            else :
-                if remainder_1 == 0 :
-                    remainder_1 = i*segment_radians
-                    remainder_2 = 2*math.pi-remainder_1
-
-                    if teardrop_shape :
-                        vertex_count_round += 1
-                        # Top
-                        vertices.append([handle_length+circle_radius, max_y, 0])
-                        vertices.append([max_length, max_y, max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
-                        #Side 1a
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
-                        vertices.append([max_length, max_y, max_width])
-                        vertices.append([max_length, negative_height, max_width])
-                        #Side 1b
-                        vertices.append([max_length, negative_height, max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
-                        #Bottom
-                        vertices.append([handle_length+circle_radius, negative_height, 0])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
-                        vertices.append([max_length, negative_height, max_width])
-
-                        vertex_count_round += 1
-                        # Top
-                        vertices.append([handle_length+circle_radius, max_y, 0])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
-                        vertices.append([max_length, max_y, -max_width])
-                        #Side 1a
-                        vertices.append([max_length, max_y, -max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
-                        #Side 1b
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
-                        vertices.append([max_length, negative_height, -max_width])
-                        vertices.append([max_length, max_y, -max_width])
-                        #Bottom
-                        vertices.append([handle_length+circle_radius, negative_height, 0])
-                        vertices.append([max_length, negative_height, -max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
-                    else:
-                        vertex_count_round += 1
-                        # Top
-                        vertices.append([handle_length+circle_radius, max_y, 0])
-                        vertices.append([handle_length, max_y, max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
-                        #Side 1a
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
-                        vertices.append([handle_length, max_y, max_width])
-                        vertices.append([handle_length, negative_height, max_width])
-                        #Side 1b
-                        vertices.append([handle_length, negative_height, max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
-                        #Bottom
-                        vertices.append([handle_length+circle_radius, negative_height, 0])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
-                        vertices.append([handle_length, negative_height, max_width])
-
-                        vertex_count_round += 1
-                        # Top
-                        vertices.append([handle_length+circle_radius, max_y, 0])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
-                        vertices.append([handle_length, max_y, -max_width])
-                        #Side 1a
-                        vertices.append([handle_length, max_y, -max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
-                        #Side 1b
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
-                        vertices.append([handle_length, negative_height, -max_width])
-                        vertices.append([handle_length, max_y, -max_width])
-                        #Bottom
-                        vertices.append([handle_length+circle_radius, negative_height, 0])
-                        vertices.append([handle_length, negative_height, -max_width])
-                        vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
-
-        # Add link part between handle and Round Part
-        # Top center
-        vertices.append([max_length, max_y, max_width])
-        vertices.append([handle_length+circle_radius, max_y, 0])
-        vertices.append([max_length, max_y, -max_width])
-
-        # Bottom  center
-        vertices.append([max_length, negative_height, -max_width])
-        vertices.append([handle_length+circle_radius, negative_height, 0])
-        vertices.append([max_length, negative_height, max_width])
-
-        # Rotate the mesh
-        vertex_total = vertex_count_round * 12 + 6 + vertex_count
-        rotated_vertices = []
-        # Logger.log('d', "Angle Rotation : {}".format(angle))
-        for i in range(0,vertex_total) :
-            xr = (vertices[i][0] * math.cos(angle)) - (vertices[i][2] * math.sin(angle))
-            yr = (vertices[i][0] * math.sin(angle)) + (vertices[i][2] * math.cos(angle))
-            zr = vertices[i][1]
-            rotated_vertices.append([xr, zr, yr])
-
-        mesh.setVertices(np.asarray(rotated_vertices, dtype=np.float32))
-
-        indices = []
-        for i in range(0, vertex_count, 4): # All 6 quads (12 triangles)
-            indices.append([i, i+2, i+1])
-            indices.append([i, i+3, i+2])
-
-        # for every angle increment 12 Vertices
-        vertex_total = vertex_count_round * 12 + 6 + vertex_count
-        for i in range(vertex_count, vertex_total, 3): #
-            indices.append([i, i+1, i+2])
-        mesh.setIndices(np.asarray(indices, dtype=np.int32))
-
+        mesh.setVertices(vertices)
+        mesh.setIndices(indices)
         mesh.calculateNormals()
         return mesh
 
     def removeAllSpoonMesh(self):
-        log("d", f"removeAllSpoonMesh run with _all_created_spoons of {self._all_created_spoons}")
-        if self._all_created_spoons:
-            for node in self._all_created_spoons:
-                if self._is_spoon_by_name(node.getName()):
-                    self._removeSpoonMesh(node)
-            self._all_created_spoons.clear()
-        # The list has no persistence so we need to check by name anyway
-        for node in DepthFirstIterator(self._application.getController().getScene().getRoot()):
-            if self._is_spoon_by_name(node.getName()):
-                self._removeSpoonMesh(node)
-            self.propertyChanged.emit()
+        spoons = self._spoon_registry.getSpoons()
+        log("d", f"removeAllSpoonMesh running with {len(spoons)} spoons in the registry")
+        self._removeSpoonMeshes(spoons)
 
     # Source code from MeshTools Plugin
     # Copyright (c) 2020 Aldo Hoeben / fieldOfView
@@ -741,84 +921,43 @@ class SpoonAntiWarpingReborn(Tool):
 
         return []
 
-    def get_hull_bounds(self, hull_points: np.ndarray) -> tuple[float, float]:
-        """Calculates the width and height of a set of hull points."""
-        min_x = np.min(hull_points[:, 0])
-        max_x = np.max(hull_points[:, 0])
-        min_y = np.min(hull_points[:, 1])
-        max_y = np.max(hull_points[:, 1])
-        width = max_x - min_x
-        height = max_y - min_y
-        return width, height
-
-    def get_hull_bounds_center(self, hull_points: np.ndarray) -> np.ndarray:
-        """Calculates the center of the bounding box of a set of hull points."""
-        min_x = np.min(hull_points[:, 0])
-        max_x = np.max(hull_points[:, 0])
-        min_y = np.min(hull_points[:, 1])
-        max_y = np.max(hull_points[:, 1])
-        center_x = (min_x + max_x) / 2.0
-        center_y = (min_y + max_y) / 2.0
-        return np.array([center_x, center_y])
-
-    def get_corner_scale_factor(self, hull_points: np.ndarray, main_outset: float) -> float:
-        """Calculates a scaling factor for corner outset."""
-        width, height = self.get_hull_bounds(hull_points)
-        larger_dimension = max(width, height)
-        if larger_dimension == 0:  # Avoid division by zero for degenerate cases
-            return 1.0 + (0.70 * main_outset)
-        return 1.0 + (0.70 * main_outset) / larger_dimension
-
-    def line_segment_length_numpy(self, point1: np.ndarray, point2: np.ndarray) -> float:
-        """
-        Calculates the Euclidean distance between two 2D points using NumPy.
-
-        Args:
-            point1 (np.ndarray): A NumPy array of shape (2,) representing the first point [x1, y1].
-            point2 (np.ndarray): A NumPy array of shape (2,) representing the second point [x2, y2].
-
-        Returns:
-            float: The length of the line segment.
-        """
-        return np.linalg.norm(point2 - point1)
+    def defineAngle(self, node: CuraSceneNode, spoon_position: Vector, shape: Polygon = None) -> float:
+        """Computes the angle to a point on the convex hull for the spoon to point at."""
+        return float(self.defineAngles(node, np.array([[spoon_position.x, spoon_position.z]]), shape)[0])
 
-    def _generate_reference_points(self, hull_points: np.ndarray, desired_spacing_mm: float) -> np.ndarray:
-        """
-        Generates a series of reference points along the edges of a convex hull
-        for nearest-point calculations. Avoids duplicate vertices.
+    def defineAngles(self, node: CuraSceneNode, positions: np.ndarray, shape: Polygon = None) -> np.ndarray:
+        """Computes the angles for a batch of spoons on the same shape.
+        The reference geometry only gets built once no matter how many spoons there are.
 
         Args:
-            hull_points (np.ndarray): A NumPy array of shape (n, 2) representing the vertices of the convex hull in order.
-            desired_spacing_mm (float): The desired spacing between reference points along the edges in millimeters.
+            node (CuraSceneNode): The node the spoons are being added to.
+            positions (np.ndarray): (x, z) positions of the spoons, shape (n, 2).
+            shape (Polygon): Hull to point the spoons away from. Uses the node's convex hull if None.
 
         Returns:
-            np.ndarray: A NumPy array of shape (m, 2) containing all the reference points.
+            np.ndarray: The angle (in radians) for each spoon, shape (n,).
         """
-        if desired_spacing_mm is None:
-            desired_spacing_mm = self._default_reference_distance
-        all_edge_points = []
-        num_hull_points = len(hull_points)
-
-        for i in range(num_hull_points):
-            start_point = hull_points[i]
-            end_point = hull_points[(i + 1) % num_hull_points]
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        result_angles = np.zeros(len(positions))  # Needs to be declared at the top in case of an emergency exit.
 
-            edge_length = self.line_segment_length_numpy(start_point, end_point)
-            num_points = max(2, int(edge_length / desired_spacing_mm) + 1)
+        if len(positions) == 0:
+            return result_angles
 
-            edge_points = np.linspace(start_point, end_point, num_points)[:-1]
-            all_edge_points.append(edge_points)
+        if not node.callDecoration("isSliceable"):
+            log("w", f"{node.getName} is not sliceable")
+            return result_angles
 
-        combined_points = np.concatenate(all_edge_points, axis=0)
-        return combined_points
+        reference_tree = self._angle_reference_tree(node, shape, self._placement_settings())
+        if reference_tree is None:
+            return result_angles
 
-    def defineAngle(self, node: CuraSceneNode, spoon_position: Vector, shape: Polygon = None) -> float:
-        """Computes the angle to a point on the convex hull for the spoon to point at."""
-        result_angle = 0  # Needs to be declared at the top in case of an emergency exit.
+        # Find point closest to each start position (set on the build plate for distance)
+        return nearest_point_angles(reference_tree, positions)
 
-        if not node.callDecoration("isSliceable"):
-            log("w", f"{node.getName} is not sliceable")
-            return result_angle
+    def _angle_reference_tree(self, node: CuraSceneNode, shape: Polygon, settings: SpoonSettings) -> "cKDTree | None":
+        """Builds a KD-tree of the points around a hull which spoons point away from.
+        Everything about the spoons comes from settings so it doesn't matter if they're changed while a job's running."""
+        from scipy.spatial import cKDTree
 
         object_hull = None
         object_points = None
@@ -829,111 +968,82 @@ class SpoonAntiWarpingReborn(Tool):
         if shape is not None:
             object_hull = shape
             object_points = shape.getPoints()
-            log("d", f"defineAngle getting hull {object_hull} and points {object_points} from shape")
+            log("d", f"_angle_reference_tree getting hull {object_hull} and points {object_points} from shape")
         elif object_points is None:
-            log("d", f"defineAngle is using node because shape is {shape}")
+            log("d", f"_angle_reference_tree is using node because shape is {shape}")
             object_hull: Polygon = node.callDecoration("getConvexHullBoundary")
             if object_hull is None:
                 object_hull = node.callDecoration("getConvexHull")
 
             if not object_hull or object_hull.getPoints() is None:
                 log("w", f"{node.getName()} cannot be calculated because a convex hull cannot be generated.")
-                return result_angle
+                return None
 
             object_points = object_hull.getPoints()
 
         log("d", f"object_points = {object_points}")
 
-        spoon_outset = round((self._spoon_diameter + self._handle_length) * 1.1, 4)
-        log("d", f"spoon_circle_radius = {spoon_outset}")
-        #minkowski_circle = Polygon.approximatedCircle(spoon_outset)
-        #outer_minkowski_circle = minkowski_circle.translate(object_points[0][0], object_points[0][1])
-
-        minkowski_square_points = [[spoon_outset, -spoon_outset],
-                            [-spoon_outset, -spoon_outset],
-                            [-spoon_outset, spoon_outset],
-                            [spoon_outset, spoon_outset]]
-
-        minkowski_square = Polygon(minkowski_square_points)
-        #log("d", f"minkowski_square = {repr(minkowski_square)}")
-
-        minkowski_points = object_hull.getMinkowskiHull(minkowski_square).getPoints()
-        #log("d", f"minkowski_hull_points = {repr(minkowski_points)}")
-
-        reference_points = self._generate_reference_points(minkowski_points, self._default_reference_distance)
-        #log("d", f"reference_points = {repr(reference_points)}")
-
-        # Create a convex hull smaller than the Minkowski hull so points on the convex hull have a point close to them perpendicularly
-        scaled_convex_hull_points = Polygon.scale(object_hull, self.get_corner_scale_factor(object_hull.getPoints(), spoon_outset), self.get_hull_bounds_center(object_hull.getPoints()))
-        #log("d", f"scaled_convex_hull_points = {repr(scaled_convex_hull_points)}")
-
-        combined_points = np.concatenate((reference_points, scaled_convex_hull_points.getPoints()), axis=0)
-
-        # Angle Ref for angle / Y Dir
-        angle_reference = Vector(0, 0, 1)
-        min_length = math.inf
-        # Set on the build plate for distance
-        start_position = Vector(spoon_position.x, 0, spoon_position.z)
-        closest_point: Vector = None  # Not actually using this at the moment; could be useful in the future
-        
-        # Find point closest to start position
-        for point in combined_points:
-            # Logger.log('d', "Point : {}".format(point))
-            test_position = Vector(point[0], 0, point[1])
-            difference_vector = start_position - test_position
-            length = difference_vector.length()
-
-            if 0 < length < min_length:
-                min_length = length
-                closest_point = test_position
-                angle_vector = difference_vector.normalized()
-                calculated_angle = math.asin(angle_reference.dot(angle_vector))
-
-                if angle_vector.x >= 0:
-                    result_angle = math.pi + calculated_angle
-                else :
-                    result_angle = -calculated_angle
-
-        return result_angle
-
-    # Used to compare union convex hulls to allow for floating point inaccuracies
-    def _compare_polygons_with_tolerance(self, poly1: Polygon, poly2: Polygon, tolerance=1e-6):
-        points1 = poly1.getPoints()
-        points2 = poly2.getPoints()
-
-        if points1 is None and points2 is None:
-            return True
-        if points1 is None or points2 is None or len(points1) != len(points2):
-            return False
-
-        # Sort the points before comparison to handle different vertex order
-        sorted_points1 = np.sort(points1, axis=0)
-        sorted_points2 = np.sort(points2, axis=0)
-
-        return np.allclose(sorted_points1, sorted_points2, atol=tolerance, rtol=tolerance)
+        return cKDTree(angle_reference_points(object_points, spoon_outset(settings.spoon_diameter, settings.handle_length), settings.reference_distance))
 
     def addAutoSpoonMesh(self) -> None:
         """Automatically adds spoons to points on the convex hull of the selected object"""
         log("d", "addAutoSpoonMesh running")
+        self.clearAutoSpoonPreview()
+        self._startAutoSpoonJob(preview=False)
+
+    def previewAutoSpoonMesh(self) -> None:
+        """Shows where automatic spoons would go without adding anything to the scene."""
+        log("d", "previewAutoSpoonMesh running")
+        if self._auto_job is not None:
+            if not self._auto_job_is_preview:
+                log("d", "previewAutoSpoonMesh can't run while spoons are being added")
+                return
+            # Settings changed while the last preview was still working, so start again
+            self.cancelAutoSpoonMesh()
+        self._preview_active = True
+        self._startAutoSpoonJob(preview=True)
+
+    def confirmAutoSpoonMesh(self) -> None:
+        """Adds the spoons from the preview to the scene."""
+        if self._auto_job is not None and self._auto_job_is_preview:
+            log("d", "confirmAutoSpoonMesh waiting for the preview to finish first")
+            return
+        self._stage_timer.begin("Confirm preview")
+        placements = [placement for placement in self._preview_placements if self._placement_still_valid(placement)]
+        self.clearAutoSpoonPreview()
+        log("d", f"confirmAutoSpoonMesh adding {len(placements)} spoons")
+        self._commitPlacements(placements)
+        self._finish_timing(self._stage_timer)
+
+    def clearAutoSpoonPreview(self) -> None:
+        if self._auto_job is not None and self._auto_job_is_preview:
+            self.cancelAutoSpoonMesh()
+        self._preview_refresh_timer.stop()
+        self._preview_placements = []
+        self._preview_active = False
+        self._preview_handle.setPreviewMesh(None)
+        self.propertyChanged.emit()
 
-        # Minimum gap between automatic spoons as a fraction of spoon diameter
-        minimum_spoon_gap: float = 0.8
-        match self._auto_density:
-            case "Tight":
-                minimum_spoon_gap = 0.65
-            case "Dense":
-                minimum_spoon_gap = 0.8
-            case "Normal":
-                minimum_spoon_gap = 0.9
-            case "Sparse":
-                minimum_spoon_gap = 1.0
-            case _:
-                minimum_spoon_gap = 0.8
+    def _refreshAutoSpoonPreview(self) -> None:
+        """Settings changed, so if there's a preview it needs redoing."""
+        if self._preview_active:
+            self._preview_refresh_timer.start()
+
+    def _startAutoSpoonJob(self, preview: bool) -> None:
+        if self._auto_job is not None:
+            log("d", "_startAutoSpoonJob is already running")
+            return
+
+        # Take the settings now in case they get changed while the job's running
+        settings = self._placement_settings()
+
+        self._stage_timer.begin("Automatic preview" if preview else "Add automatically")
 
         nodes_list = self._getAllSelectedNodes()
         if not nodes_list:
             nodes_list = DepthFirstIterator(self._application.getController().getScene().getRoot())
 
+        snapshots: list[NodeSnapshot] = []
         for node in nodes_list:
             if not node.callDecoration("isSliceable"):
                 continue
@@ -945,151 +1055,338 @@ class SpoonAntiWarpingReborn(Tool):
                 continue
             # and Selection.isSelected(node)
             # Logger.log('d', "Mesh : {}".format(node.getName()))
-            log("d", "addAutoSpoonMesh: node just passed checks")
+            log("d", "_startAutoSpoonJob: node just passed checks")
+            with self._stage_timer.stage("snapshot"):
+                snapshots.append(self._snapshot_node(node))
 
-            shapes: list[np.ndarray] = None
-            try:
-                shapes = self._get_base_convex_hulls(node)
-            except Exception as e:
-                log("e", f"Exception in _get_base_convex_hulls: {e}")
-            if shapes is not None:
-                for shape in shapes:
-                    log("d", f"addAutoSpoonMesh: just got base convex hulls {shape}")
-
-                # Filter out any hulls completely inside one another
-                if len(shapes) > 1:
-                    filtered_hulls = []
-                    log("d", "Filtering hulls")
-                    true_element = True
-                    false_element = False
-                    is_base = [true_element for _ in range(len(shapes))]
-                    is_child = [false_element for _ in range(len(shapes))]
-                    for a, hull_a in enumerate(shapes):
-                        for b, hull_b in enumerate(shapes):
-                            if a == b:
-                                continue
-                            if is_child[a] or is_child[b]:
-                                continue
-                            try:
-                                union_hull = hull_a.unionConvexHulls(hull_b)
-                            except Exception as e:
-                                log("e", f"Couldn't create union hull for overlap test: {e}")
-                            log("d", f"union_hull = {union_hull}")
-                            if self._compare_polygons_with_tolerance(union_hull, hull_a):
-                                # b is fully contained within a
-                                is_base[b] = False
-                                is_child[b] = True
-                            if self._compare_polygons_with_tolerance(union_hull, hull_b):
-                                # a is fully contained within b
-                                is_base[a] = False
-                                is_child[a] = True
-                                break
-                    log("d", f"Looped through hulls, is_base = {is_base}, is_child = {is_child}")
-                    for i, hull in enumerate(shapes):
-                        if is_base[i]:
-                            filtered_hulls.append(hull)
-                    shapes = filtered_hulls
-
-            # If the complicated way doesn't work fall back to the regular way
-            if shapes is None or len(shapes) == 0:
-                log("i", "addAutoSpoonMesh: falling back to regular hull")
-                hull_polygon: Polygon = node.callDecoration("getConvexHullBoundary")
-                if hull_polygon is None:
-                    hull_polygon = node.callDecoration("getConvexHull")
-
-                if not hull_polygon or not hull_polygon.isValid():
-                    log("w", f"Object {node.getName()} cannot be calculated because it has no convex hull.")
-                    continue
-                shapes = [hull_polygon]
+        if not snapshots:
+            self._stage_timer.cancel()
+            return
 
-            minimum_gap = minimum_spoon_gap * self._spoon_diameter
-                
-            #points = hull_polygon.getPoints()
-            for shape in shapes:
-                shape_points = shape.getPoints()
-                if shape_points is None:
-                    continue
-                    
-                log("d", "addAutoSpoonMesh: in loop for each shape")
+        # The geometry can take a while on big models, so do it in the background and add the spoons once it's done
+        self._auto_job = AutoSpoonJob(snapshots, settings, self._plan_auto_spoons)
+        self._auto_job_is_preview = preview
+        self._auto_job.progress.connect(self._onAutoSpoonJobProgress)
+        self._auto_job.finished.connect(self._onAutoSpoonJobFinished)
+        self._auto_progress = 0.0
+        self._auto_running = True
+        self.propertyChanged.emit()
+        self._auto_job.start()
 
-                first_point: Vector = Vector(shape_points[0][0],0,shape_points[0][1])
-                last_spoon_position: Vector = None
+    def cancelAutoSpoonMesh(self) -> None:
+        """Stops automatic placement without adding any of its spoons."""
+        if self._auto_job is None:
+            return
+        log("d", "cancelAutoSpoonMesh cancelling automatic placement")
+        self._auto_job.cancel()
+        self._stage_timer.cancel()
+        self._finishAutoSpoonJob()
+
+    def _finishAutoSpoonJob(self) -> None:
+        self._auto_job.progress.disconnect(self._onAutoSpoonJobProgress)
+        self._auto_job.finished.disconnect(self._onAutoSpoonJobFinished)
+        self._auto_job = None
+        self._auto_running = False
+        self._auto_progress = 0.0
+        self.propertyChanged.emit()
 
-                log("d", "About to list points in convex hull")
-                for point in shape_points:
-                    log("d", point)
+    def _onAutoSpoonJobProgress(self, job: AutoSpoonJob, amount: float) -> None:
+        if job is not self._auto_job:
+            return
+        self._auto_progress = float(amount)
+        self.propertyChanged.emit()
+
+    def _onAutoSpoonJobFinished(self, job: AutoSpoonJob) -> None:
+        # Signals from the job get passed to the main thread, so it's safe to touch the scene in here
+        if job is not self._auto_job or job.isCancelled():
+            return
+        preview = self._auto_job_is_preview
+        self._finishAutoSpoonJob()
+        plans = job.getResult()
+        if plans is None:
+            self._stage_timer.cancel()
+            return
+
+        with self._stage_timer.stage("collision_checks"):
+            placements = self._acceptPlacements(job.getSnapshots(), plans, job.getSettings())
+        if preview:
+            self._preview_placements = placements
+            with self._stage_timer.stage("preview_mesh"):
+                self._preview_handle.setPreviewMesh(self._buildPreviewMesh(placements))
+            log("d", f"_onAutoSpoonJobFinished previewing {len(placements)} spoons")
+            self.propertyChanged.emit()
+        else:
+            self._commitPlacements(placements)
+        self._finish_timing(self._stage_timer)
+
+    def _finish_timing(self, timer: StageTimer) -> None:
+        """Ends a timed run, logs it and shows it in the tool panel."""
+        report = timer.end()
+        if report is None:
+            return
+        log("i", report_log_line(report))
+        self._profiling_report = format_report(report)
+        self.propertyChanged.emit()
 
-                for i, point in enumerate(shape_points):
-                    point_position = Vector(point[0], 0, point[1])
-                    if not last_spoon_position:
-                        self._createSpoonMesh(node, point_position, shape)
-                        last_spoon_position = point_position
+    def _acceptPlacements(self, snapshots: list[NodeSnapshot], plans: list, settings: SpoonSettings) -> list[AutoPlacement]:
+        """Goes through what the job came up with and keeps the spoons which won't run into anything
+        or come closer to it than the density's minimum gap."""
+        minimum_spoon_gap = minimum_gap(settings.density, settings.spoon_diameter)
+        accepted: list[AutoPlacement] = []
+        # Spoons which are accepted get a placeholder in the collision index until they're really in the scene
+        pending_keys: list[tuple] = []
+        try:
+            for snapshot, plan in zip(snapshots, plans):
+                if plan is None:
+                    continue
+                node = snapshot.node
+                # The model might have been moved or deleted while the job was running
+                if node.getParent() is None or not np.array_equal(node.getWorldTransformation().getData(), snapshot.transformation):
+                    log("w", f"{snapshot.name} changed during automatic placement so it won't get spoons")
+                    continue
+                footprint, placements = plan
+                if footprint is not None and footprint is not snapshot.footprint:
+                    self._store_footprint(node, footprint)
+
+                # Spoons on the same shape are kept apart by the density setting, so they only get checked
+                # against everything else (other islands, other models and spoons which are already there)
+                # which needs to be at least the same gap away
+                shape_keys: dict[int, set[tuple]] = {}
+                for point_position, shape, spoon_angle in placements:
+                    same_shape = shape_keys.setdefault(id(shape), set())
+                    center, radius = spoon_circle(point_position.x, point_position.z, spoon_angle, settings.spoon_diameter, settings.handle_length)
+                    collision = self._collision_index.spoonCollision(center, radius, node, minimum_spoon_gap, ignore=same_shape)
+                    if collision is not None:
+                        log("d", f"Skipping automatic spoon at {point_position} on {snapshot.name} because it would be too close to {collision}")
                         continue
+                    pending_key = ("pending", len(pending_keys))
+                    self._collision_index.addPending(pending_key, center, radius)
+                    pending_keys.append(pending_key)
+                    same_shape.add(pending_key)
+                    accepted.append(AutoPlacement(node, point_position, shape, spoon_angle, snapshot.transformation))
+        finally:
+            for pending_key in pending_keys:
+                self._collision_index.removePending(pending_key)
+        return accepted
+
+    def _placement_still_valid(self, placement: AutoPlacement) -> bool:
+        node = placement.node
+        if node.getParent() is None or not np.array_equal(node.getWorldTransformation().getData(), placement.transformation):
+            log("w", f"{node.getName()} changed since it was previewed so it won't get spoons")
+            return False
+        return True
+
+    def _commitPlacements(self, placements: list[AutoPlacement]) -> None:
+        new_spoons = [(self._buildSpoonNode(placement.node, placement.position, placement.shape, placement.angle), placement.node)
+                      for placement in placements]
+        # Everything goes in at once so it's one undo step and one re-slice
+        self._addSpoonNodes(new_spoons)
+
+    def _buildPreviewMesh(self, placements: list[AutoPlacement]) -> MeshData | None:
+        """Makes one mesh with every spoon in it for the preview, instead of a scene node each."""
+        if not placements:
+            return None
+        # Every spoon is the same shape, just rotated and moved, so only make it once
+        template = self._createSpoon(self._spoon_diameter, self._handle_length, self._handle_width, 10, 0, self._spoon_height(), self._teardrop_shape, 0)
+        template_vertices = template.getVertices()
+        template_indices = template.getIndices()
+
+        angles = np.array([placement.angle for placement in placements])
+        positions = np.array([[placement.position.x, placement.position.z] for placement in placements])
+        cos_angles = np.cos(angles)[:, None]
+        sin_angles = np.sin(angles)[:, None]
+        template_x = template_vertices[None, :, 0]
+        template_z = template_vertices[None, :, 2]
+
+        # Same rotation as _createSpoon, then moved to where each spoon goes
+        vertices = np.empty((len(placements), len(template_vertices), 3), dtype=np.float32)
+        vertices[:, :, 0] = template_x * cos_angles - template_z * sin_angles + positions[:, 0, None]
+        vertices[:, :, 1] = template_vertices[None, :, 1]
+        vertices[:, :, 2] = template_x * sin_angles + template_z * cos_angles + positions[:, 1, None]
+        indices = template_indices[None, :, :] + (np.arange(len(placements)) * len(template_vertices))[:, None, None]
+
+        mesh = MeshBuilder()
+        mesh.setVertices(vertices.reshape(-1, 3))
+        mesh.setIndices(indices.reshape(-1, 3).astype(np.int32))
+        mesh.setColors(np.tile(np.array(SpoonPreviewHandle.PreviewColor, dtype=np.float32), (len(placements) * len(template_vertices), 1)))
+        mesh.calculateNormals()
+        return mesh.build()
+
+    def _outline_tolerance(self, node: CuraSceneNode) -> float:
+        """How far a node's outline on the build plate can be simplified, based on the nozzle it's printed with."""
+        if self._outline_tolerance_nozzles <= 0:
+            return 0.0
+        extruder_stacks = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()
+        if not extruder_stacks:
+            return 0.0
+        try:
+            extruder_stack = extruder_stacks[int(node.callDecoration("getExtruderPosition"))]
+        except (TypeError, ValueError, IndexError):
+            extruder_stack = extruder_stacks[0]
+        return outline_tolerance(float(extruder_stack.getProperty("machine_nozzle_size", "value")), self._outline_tolerance_nozzles)
+
+    def _snapshot_node(self, node: CuraSceneNode, height: float = 0.05) -> NodeSnapshot:
+        """Grabs everything automatic placement needs from a node while we're on the main thread."""
+        mesh_data = node.getMeshData()
+        tolerance = self._outline_tolerance(node)
+        fallback_hull: Polygon = node.callDecoration("getConvexHullBoundary")
+        if fallback_hull is None:
+            fallback_hull = node.callDecoration("getConvexHull")
+        return NodeSnapshot(
+            node = node,
+            name = node.getName(),
+            mesh_data = mesh_data,
+            vertices = mesh_data.getVertices() if mesh_data else None,
+            indices = mesh_data.getIndices() if mesh_data else None,
+            transformation = node.getWorldTransformation().getData().copy(),
+            height = height,
+            tolerance = tolerance,
+            footprint = self._cached_footprint(node, height, tolerance),
+            fallback_hull = fallback_hull
+        )
+
+    def _plan_auto_spoons(self, snapshot: NodeSnapshot, settings: SpoonSettings,
+                          is_cancelled: Callable[[], bool] = lambda: False) -> tuple[BaseFootprint | None, list[tuple[Vector, Polygon, float]]]:
+        """Works out where the spoons go on a node and which way they point.
+        Only uses what's in the snapshot and settings so it's safe to run off the main thread.
 
-                    difference_vector = last_spoon_position - point_position
-                    difference_length = round(difference_vector.length(),4)
+        Args:
+            snapshot (NodeSnapshot): The node to place spoons on.
+            settings (SpoonSettings): The spoon settings from when placement started.
+            is_cancelled (Callable[[], bool]): Gets checked between shapes so a cancelled job doesn't keep going.
 
-                    first_to_last_distance = (first_point - point_position).length() if i == len(shape_points) - 1 else 0
+        Returns:
+            tuple[BaseFootprint | None, list[tuple[Vector, Polygon, float]]]: The node's footprint
+            (None if it couldn't be calculated) and the position, shape and angle of each spoon.
+        """
+        footprint = snapshot.footprint
+        shapes: list[Polygon] = None
+        try:
+            if footprint is None:
+                with self._stage_timer.stage("base_footprint"):
+                    footprint = self._calculate_base_footprint(snapshot)
+            shapes = list(footprint.hulls)
+        except Exception as e:
+            log("e", f"Exception calculating base footprint of {snapshot.name}: {e}")
+        if shapes is not None:
+            for shape in shapes:
+                log("d", f"_plan_auto_spoons: just got base convex hulls {shape}")
+
+            # Filter out any hulls completely inside one another
+            if len(shapes) > 1:
+                log("d", "Filtering hulls")
+                outer_hull_indices = outermost_hulls([shape.getPoints() if shape.getPoints() is not None else np.zeros((0, 2)) for shape in shapes])
+                log("d", f"Filtered hulls, keeping {outer_hull_indices} of {len(shapes)}")
+                shapes = [shapes[i] for i in outer_hull_indices]
+
+        # If the complicated way doesn't work fall back to the regular way
+        if shapes is None or len(shapes) == 0:
+            log("i", "_plan_auto_spoons: falling back to regular hull")
+            hull_polygon = snapshot.fallback_hull
+            if not hull_polygon or not hull_polygon.isValid():
+                log("w", f"Object {snapshot.name} cannot be calculated because it has no convex hull.")
+                return footprint, []
+            shapes = [hull_polygon]
+
+        minimum_spoon_gap = minimum_gap(settings.density, settings.spoon_diameter)
+        placements: list[tuple[Vector, Polygon, float]] = []
+        #points = hull_polygon.getPoints()
+        for shape in shapes:
+            if is_cancelled():
+                log("d", f"_plan_auto_spoons stopping on {snapshot.name} because it's been cancelled")
+                return footprint, []
+            shape_points = shape.getPoints()
+            if shape_points is None or len(shape_points) == 0:
+                continue
 
-                    # Make sure not to place spoons too close together
-                    if (first_to_last_distance == 0 and difference_length >= minimum_gap) or (first_to_last_distance >= minimum_gap and difference_length >= minimum_gap):
+            log("d", "_plan_auto_spoons: in loop for each shape")
+            spoon_points = spoon_positions(shape_points, minimum_spoon_gap, settings.placement)
+            spoon_vectors: list[Vector] = [Vector(point[0], 0, point[1]) for point in spoon_points]
 
-                        self._createSpoonMesh(node, point_position, shape)
-                        last_spoon_position = point_position
+            # Work out where every spoon on this shape points in one go so the reference geometry is only built once
+            with self._stage_timer.stage("defineAngles"):
+                reference_tree = self._angle_reference_tree(None, shape, settings)
+                if reference_tree is None:
+                    spoon_angles = np.zeros(len(spoon_vectors))
+                else:
+                    spoon_angles = nearest_point_angles(reference_tree, spoon_points)
+            for point_position, spoon_angle in zip(spoon_vectors, spoon_angles):
+                placements.append((point_position, shape, float(spoon_angle)))
+        return footprint, placements
 
-    def _get_base_convex_hulls(self, node: CuraSceneNode, height: float = 0.05) -> list[np.ndarray]:
+    def _get_base_convex_hulls(self, node: CuraSceneNode, height: float = 0.05) -> list[Polygon]:
         if not node:
             return None
-        trimesh_mesh = self._toTriMesh(node.getMeshDataTransformed())
-        log("d", f"_get_base_convex_hulls using trimesh = {trimesh_mesh}")
-        log("d", f"_get_base_convex_hulls trimesh is watertight? {trimesh_mesh.is_watertight}")
-        min_y = trimesh_mesh.bounds[0][1]
-        slice_y = min_y + height
-
-        plane_origin = np.array([0, slice_y, 0])
-        plane_normal = np.array([0, 1, 0])
-
-        section = trimesh_mesh.section(plane_normal=plane_normal, plane_origin=plane_origin)
-        if section is not None:
-            if hasattr(section, 'discrete'):  # It's a Path3D (series of contours)
-                uranium_polygons = []
-                for contour in section.discrete:
-                    vertices_2d = np.array([[point[0], point[2]] for point in contour])
-                    if vertices_2d.shape[0] >= 3:
-                        hull = ConvexHull(vertices_2d)
-                        hull_points = vertices_2d[hull.vertices]
-                        uranium_polygon = Polygon(hull_points)
-                        uranium_polygons.append(uranium_polygon)
-                return uranium_polygons
-            elif hasattr(section, 'vertices'): # It's a Trimesh (intersection is a face)
-                vertices_2d = section.vertices[:, [0,2]]
-                if vertices_2d.shape[0] >= 3:
-                    hull = ConvexHull(vertices_2d)
-                    hull_points = vertices_2d[hull.vertices]
-                    return [Polygon(hull_points)]
-                else:
-                    return []
-            else:
-                return []
-        else:
-            return []
+        footprint = self._get_base_footprint(node, height)
+        return list(footprint.hulls)
+
+    def _get_base_footprint(self, node: CuraSceneNode, height: float = 0.05) -> BaseFootprint:
+        """Gets the footprint of a node from the cache if it's still valid, otherwise calculates it."""
+        snapshot = self._snapshot_node(node, height)
+        if snapshot.footprint is not None:
+            return snapshot.footprint
+
+        footprint = self._calculate_base_footprint(snapshot)
+        self._store_footprint(node, footprint)
+        return footprint
+
+    def _cached_footprint(self, node: CuraSceneNode, height: float = 0.05, tolerance: float = 0.0) -> BaseFootprint | None:
+        """Returns the cached footprint of a node, or None if there isn't one or it's out of date."""
+        footprint = self._footprint_cache.get(node)
+        if (footprint is not None
+            and footprint.mesh_data is node.getMeshData()
+            and footprint.height == height
+            and footprint.tolerance == tolerance
+            and np.array_equal(footprint.transformation, node.getWorldTransformation().getData())):
+            log("d", f"_cached_footprint using cached footprint for {node.getName()}")
+            return footprint
+        return None
+
+    def _store_footprint(self, node: CuraSceneNode, footprint: BaseFootprint) -> None:
+        if node not in self._footprint_cache:
+            node.transformationChanged.connect(self._onFootprintNodeMoved)
+            node.meshDataChanged.connect(self._onFootprintNodeChanged)
+        self._footprint_cache[node] = footprint
+
+    def _onFootprintNodeMoved(self, node: SceneNode) -> None:
+        """Moves a cached footprint along with its node if it's only been moved, turned or scaled on the build plate,
+        otherwise it has to be sliced out again so it gets thrown away."""
+        # Children pass their signals up through their parent, so this can be a spoon as well.
+        footprint = self._footprint_cache.get(node)
+        if footprint is None:
+            return
+        transformation = node.getWorldTransformation().getData().copy()
+        motion = flat_motion(footprint.transformation, transformation)
+        if motion is None:
+            self._onFootprintNodeChanged(node)
+            return
+        self._footprint_cache[node] = BaseFootprint(footprint.mesh_data, transformation, footprint.height, footprint.tolerance,
+                                                    [move_flat_points(contour, motion) for contour in footprint.contours],
+                                                    [Polygon(move_flat_points(hull.getPoints(), motion)) for hull in footprint.hulls])
 
+    def _onFootprintNodeChanged(self, node: SceneNode) -> None:
+        """Throws away a cached footprint when its node's mesh is changed (or it's been moved in a way it can't follow)."""
+        if node not in self._footprint_cache:
+            return
+        del self._footprint_cache[node]
+        node.transformationChanged.disconnect(self._onFootprintNodeMoved)
+        node.meshDataChanged.disconnect(self._onFootprintNodeChanged)
+
+    def _calculate_base_footprint(self, snapshot: NodeSnapshot) -> BaseFootprint:
+        """Slices a node just above its lowest point to get the outlines and convex hulls of what's there."""
+        contours: list[np.ndarray] = []
+        hull_points: list[np.ndarray] = []
+        if snapshot.vertices is not None and len(snapshot.vertices) > 0:
+            contours, hull_points = base_footprint(snapshot.vertices, snapshot.indices, snapshot.transformation,
+                                                   snapshot.height, snapshot.tolerance)
+        log("d", f"_calculate_base_footprint found {len(contours)} areas on the build plate for {snapshot.name}")
+        return BaseFootprint(snapshot.mesh_data, snapshot.transformation, snapshot.height, snapshot.tolerance,
+                             contours, [Polygon(points) for points in hull_points])
 
     #----------------------------------------
     # Initial Source code from  fieldOfView
     #----------------------------------------
-    def _toTriMesh(self, mesh_data: MeshData) -> trimesh.base.Trimesh:
-        if not mesh_data:
-            return trimesh.base.Trimesh()
-
-        indices = mesh_data.getIndices()
-        if indices is None:
-            # some file formats (eg 3mf) don't supply indices, but have unique vertices per face
-            indices = np.arange(mesh_data.getVertexCount()).reshape(-1, 3)
-
-        return trimesh.base.Trimesh(vertices=mesh_data.getVertices(), faces=indices)
-
-    def _toMeshData(self, tri_node: trimesh.base.Trimesh) -> MeshData:
+    def _toMeshData(self, tri_node: "trimesh.base.Trimesh") -> MeshData:
         # Rotate the part to laydown on the build plate
         # Modification from 5@xes
         #tri_node.apply_transform(trimesh.transformations.rotation_matrix(math.radians(90), [-1, 0, 0]))
@@ -1131,12 +1428,84 @@ class SpoonAntiWarpingReborn(Tool):
             case _:
                 log("w", "_run_spoon_order got unmatched string for _print_order")
         
+        if self._order_after_write and self._writes_plain_gcode(output_device):
+            # Settings get read now while it's definitely the main thread and they're what it was sliced with
+            if self._pending_file_order is None:  # Still connected if the last write never got as far as starting its job
+                JobQueue.getInstance().jobFinished.connect(self._on_write_job_finished)
+            self._pending_file_order = self._order_script.getCuraSettings()
+            log("d", f"_run_spoon_order will reorder the file {output_device.getId()} writes once it's finished")
+            return
+
         scene = self._application.getController().getScene()
         gcode_dict = getattr(scene, "gcode_dict", {})
+        self._order_timer.begin("Print order")
         for plate_id in gcode_dict:
             for layer in gcode_dict[plate_id]:
                 log("d", layer.replace("\n",","))
-            gcode_dict[plate_id] = self._order_script.execute(gcode_dict[plate_id])
+            with self._order_timer.stage("SpoonOrder.execute"):
+                gcode_dict[plate_id] = self._order_script.execute(gcode_dict[plate_id])
+        self._finish_timing(self._order_timer)
+
+    def _writes_plain_gcode(self, output_device) -> bool:
+        """Whether a device looks like it's about to write uncompressed G-code to a local file. Anything else
+        (removable drives pick their own format, .gcode.gz, .ufp, network printers) gets ordered in gcode_dict before it's written.
+
+        The write job isn't around yet, so this is only a guess at when to order. Whether the saved file gets opened
+        is up to _is_plain_gcode_job once the job's finished."""
+        if output_device.getId() != "local_file":
+            return False
+        # The save dialog sets this just before the write starts, but it's left over from last time if there wasn't a dialog
+        return self._preferences.getValue("local_file/last_used_type") == "text/x-gcode"
+
+    def _is_plain_gcode_job(self, job: WriteFileJob) -> bool:
+        """Whether a finished write job really did write uncompressed G-code, going by the file it wrote rather than any settings."""
+        path = job.getFileName()
+        if not path or not path.lower().endswith(".gcode"):
+            return False
+        # Cura opens the stream in text mode for text writers and binary for everything else (.gcode.gz, .ufp)
+        return isinstance(job.getStream(), io.TextIOBase)
+
+    def _on_write_job_finished(self, job) -> None:
+        """Gets the saved file's name from its write job, the same way Cura adds it to the recent files list."""
+        if not isinstance(job, WriteFileJob):
+            return
+        JobQueue.getInstance().jobFinished.disconnect(self._on_write_job_finished)
+        settings = self._pending_file_order
+        self._pending_file_order = None
+        if settings is None or not job.getResult():
+            return
+        path = job.getFileName()
+        if not self._is_plain_gcode_job(job):
+            log("w", f"Spoon Anti-Warping Reborn expected to save G-code but {path} was written instead, so its print order hasn't been changed")
+            return
+        order = SpoonOrder(self._order_script.target_name, self._order_script.spoons_first)
+        self._start_file_order(job, path, order, settings)
+
+    def _start_file_order(self, job, path: str, order: SpoonOrder, settings: dict) -> None:
+        # The output device closes the file after the job's finished, so wait until that's done
+        if not job.getStream().closed:
+            self._application.callLater(self._start_file_order, job, path, order, settings)
+            return
+        threading.Thread(target=self._order_written_file, args=(path, order, settings), name="SpoonAWRebornFileOrder").start()
+
+    def _order_written_file(self, path: str, order: SpoonOrder, settings: dict) -> None:
+        start = time.perf_counter()
+        # Own timer since this isn't on the main thread. It only gets logged, not shown in the panel.
+        order.timer = StageTimer(self._order_timer.isEnabled(), self._order_timer.isTrackingMemory())
+        order.timer.begin("Print order (saved file)")
+        try:
+            with MappedGcode(path) as gcode:
+                if not gcode.contains(order.target_name):
+                    order.timer.cancel()
+                    return
+                changed_layers = gcode.reorder(path, order, settings)
+            log("i", f"Spoon Anti-Warping Reborn reordered {changed_layers} layers of {path} in {time.perf_counter() - start:.2f}s")
+            report = order.timer.end()
+            if report is not None:
+                log("i", report_log_line(report))
+        except Exception as e:
+            order.timer.cancel()
+            log("e", f"Spoon Anti-Warping Reborn couldn't reorder {path}: {e}")
 
     def getSpoonDiameter(self) -> float:
         """_spoon_diameter setter for QML"""
@@ -1146,6 +1515,7 @@ class SpoonAntiWarpingReborn(Tool):
         """_spoon_diameter setter for QML"""
         self._spoon_diameter = validate_float(SpoonDiameter, minimum=0.1, clamp=True, default=self._spoon_diameter)
         self._preferences.setValue("spoonawreborn/spoon_diameter", self._spoon_diameter)
+        self._refreshAutoSpoonPreview()
         self.propertyChanged.emit()
 
     def getHandleLength(self) -> float:
@@ -1157,6 +1527,7 @@ class SpoonAntiWarpingReborn(Tool):
 
         self._handle_length = validate_float(HandleLength, minimum=0.1, clamp=True, default=self._handle_length)
         self._preferences.setValue("spoonawreborn/handle_length", self._handle_length)
+        self._refreshAutoSpoonPreview()
         self.propertyChanged.emit()
 
     def getHandleWidth(self) -> float:
@@ -1167,6 +1538,7 @@ class SpoonAntiWarpingReborn(Tool):
         """_handle_width setter for QML"""
         self._handle_width = validate_float(HandleWidth, minimum=0.1, clamp=True, default=self._handle_width)
         self._preferences.setValue("spoonawreborn/handle_width", self._handle_width)
+        self._refreshAutoSpoonPreview()
         self.propertyChanged.emit()
 
     def getLayerCount(self) -> int:
@@ -1177,6 +1549,7 @@ class SpoonAntiWarpingReborn(Tool):
         """_layer_count setter for QML"""
         self._layer_count = validate_int(LayerCount, minimum=1, clamp=True)
         self._preferences.setValue("spoonawreborn/layer_count", self._layer_count)
+        self._refreshAutoSpoonPreview()
         self.propertyChanged.emit()
 
     def getTeardropShape(self) -> bool:
@@ -1187,6 +1560,7 @@ class SpoonAntiWarpingReborn(Tool):
         """_teardrop_shape setter for QML"""
         self._teardrop_shape = value
         self._preferences.setValue("spoonawreborn/teardrop_shape", self._teardrop_shape)
+        self._refreshAutoSpoonPreview()
         self.propertyChanged.emit()
 
     def getInputsValid(self) -> bool:
@@ -1228,4 +1602,61 @@ class SpoonAntiWarpingReborn(Tool):
         """_auto_density setter for QML"""
         self._auto_density = value
         self._preferences.setValue("spoonawreborn/auto_density", self._auto_density)
+        self._refreshAutoSpoonPreview()
         self.propertyChanged.emit()
+
+    def getAutoPlacement(self) -> str:
+        """_auto_placement getter for QML"""
+        return self._auto_placement
+
+    def setAutoPlacement(self, value: str) -> None:
+        """_auto_placement setter for QML"""
+        self._auto_placement = value
+        self._preferences.setValue("spoonawreborn/auto_placement", self._auto_placement)
+        self._refreshAutoSpoonPreview()
+        self.propertyChanged.emit()
+
+    def getAutoProgress(self) -> float:
+        """_auto_progress getter for QML"""
+        return self._auto_progress
+
+    def setAutoProgress(self, value: float) -> None:
+        """Progress comes from the job, not the QML. So this does nothing."""
+        log("d", f"Something ran setAutoProgress with {value}")
+        return
+
+    def getAutoRunning(self) -> bool:
+        """_auto_running getter for QML"""
+        return self._auto_running
+
+    def setAutoRunning(self, value: bool) -> None:
+        """Use addAutoSpoonMesh and cancelAutoSpoonMesh instead. So this does nothing."""
+        log("d", f"Something ran setAutoRunning with {value}")
+        return
+
+    def getPreviewActive(self) -> bool:
+        """_preview_active getter for QML"""
+        return self._preview_active
+
+    def setPreviewActive(self, value: bool) -> None:
+        """Use previewAutoSpoonMesh and clearAutoSpoonPreview instead. So this does nothing."""
+        log("d", f"Something ran setPreviewActive with {value}")
+        return
+
+    def getPreviewCount(self) -> int:
+        """Number of spoons in the preview for QML"""
+        return len(self._preview_placements)
+
+    def setPreviewCount(self, value: int) -> None:
+        """The QML should never run this. So it does nothing."""
+        log("d", f"Something ran setPreviewCount with {value}")
+        return
+
+    def getProfiling(self) -> str:
+        """Breakdown of the last timed run for QML. Empty unless spoonawreborn/profiling is turned on."""
+        return self._profiling_report
+
+    def setProfiling(self, value: str) -> None:
+        """Timing comes from the runs, not the QML. So this does nothing."""
+        log("d", f"Something ran setProfiling with {value}")
+        return
@@ -0,0 +1,144 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Keeps a SpatialGrid of where every spoon and model is on the build plate,
+# so checking whether a new spoon would run into something doesn't mean looking at everything.
+# Anything that changes just gets marked and is sorted out the next time someone asks.
+
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+
+from .geometry_helpers import SpatialGrid
+from .SpoonRegistry import SpoonRegistry
+from .slasheetools import log as log
+
+class SpoonCollisionIndex:
+    def __init__(self, scene: Scene, registry: SpoonRegistry, cell_size: float = 20.0) -> None:
+        self._scene: Scene = scene
+        self._registry: SpoonRegistry = registry
+        self._grid: SpatialGrid = SpatialGrid(cell_size)
+
+        self._models: set[SceneNode] = set()
+        self._dirty_models: set[SceneNode] = set()
+        self._dirty_spoons: set[SceneNode] = set()
+        self._rescan: bool = True  # Nothing's been looked at yet
+
+        self._scene.sceneChanged.connect(self._onSceneChanged)
+        self._registry.spoonRegistered.connect(self._onSpoonRegistered)
+        self._registry.spoonUnregistered.connect(self._onSpoonUnregistered)
+
+    def spoonCollision(self, center: tuple[float, float], radius: float, parent: SceneNode = None, clearance: float = 0.0, ignore=()):
+        """Finds what a spoon with its round part at center would run into or come too close to.
+
+        Args:
+            center (tuple[float, float]): (x, z) center of the round part of the spoon.
+            radius (float): Radius of the round part of the spoon.
+            parent (SceneNode): Model the spoon would be attached to. Spoons are supposed to touch it.
+            clearance (float): Gap the spoon needs between it and anything else.
+            ignore: Any other keys which don't count.
+
+        Returns:
+            The spoon or model it would overlap or be too close to, or None if it's clear.
+        """
+        self._update()
+        own_model = self._topLevelNode(parent)
+        if own_model is not None:
+            ignore = set(ignore)
+            ignore.add(own_model)
+        return self._grid.circle_collision(center, radius, clearance, ignore=ignore)
+
+    def addPending(self, key, center: tuple[float, float], radius: float) -> None:
+        """Holds a spot for a spoon which isn't in the scene yet so later checks can see it."""
+        self._grid.insert_circle(key, center, radius)
+
+    def removePending(self, key) -> None:
+        self._grid.remove(key)
+
+    def _update(self) -> None:
+        if self._rescan:
+            self._rescan = False
+            root = self._scene.getRoot()
+            models = {node for node in root.getChildren() if self._isModel(node)}
+            for gone in self._models - models:
+                self._grid.remove(gone)
+            self._dirty_models |= models - self._models
+            self._models = models
+            # Catch anything the registry knew about before we were listening
+            for spoon in self._registry.getSpoons():
+                if spoon not in self._grid:
+                    self._dirty_spoons.add(spoon)
+
+        for model in self._dirty_models:
+            if model not in self._models:
+                continue
+            self._updateModel(model)
+            # Spoons move with their model
+            for parent in self._registry.getParents():
+                if self._topLevelNode(parent) is model:
+                    self._dirty_spoons.update(self._registry.getSpoonsOf(parent))
+        self._dirty_models.clear()
+
+        for spoon in self._dirty_spoons:
+            self._updateSpoon(spoon)
+        self._dirty_spoons.clear()
+
+    def _updateModel(self, model: SceneNode) -> None:
+        hull = model.callDecoration("getConvexHull")
+        points = hull.getPoints() if hull is not None else None
+        if points is None or len(points) == 0:
+            self._grid.remove(model)
+            return
+        self._grid.insert_polygon(model, points)
+
+    def _updateSpoon(self, spoon: SceneNode) -> None:
+        if not self._registry.isRegistered(spoon):
+            self._grid.remove(spoon)
+            return
+        circle = spoon.callDecoration("getSpoonCircle")
+        if circle is not None:
+            self._grid.insert_circle(spoon, (circle[0], circle[1]), circle[2])
+            return
+        # Spoons from older versions don't know how big they are, so use their bounding box
+        bounding_box = spoon.getBoundingBox()
+        if bounding_box is None:
+            self._grid.remove(spoon)
+            return
+        minimum = bounding_box.minimum
+        maximum = bounding_box.maximum
+        self._grid.insert_polygon(spoon, [[minimum.x, minimum.z], [maximum.x, minimum.z],
+                                          [maximum.x, maximum.z], [minimum.x, maximum.z]])
+
+    def _isModel(self, node: SceneNode) -> bool:
+        if self._registry.isSpoon(node):
+            return False
+        return bool(node.callDecoration("isSliceable") or node.callDecoration("isGroup"))
+
+    def _topLevelNode(self, node: SceneNode) -> SceneNode | None:
+        """The node directly under the root that a node belongs to (itself if it's already there)."""
+        root = self._scene.getRoot()
+        while node is not None and node.getParent() is not root:
+            node = node.getParent()
+        return node
+
+    def _onSceneChanged(self, source: SceneNode) -> None:
+        if source is None:
+            return
+        if source is self._scene.getRoot():
+            self._rescan = True
+            return
+        top_level = self._topLevelNode(source)
+        if top_level is None:
+            # Not in the scene any more
+            self._rescan = True
+        else:
+            self._dirty_models.add(top_level)
+            if top_level not in self._models:
+                self._rescan = True
+
+    def _onSpoonRegistered(self, spoon: SceneNode) -> None:
+        self._dirty_spoons.add(spoon)
+
+    def _onSpoonUnregistered(self, spoon: SceneNode) -> None:
+        self._dirty_spoons.discard(spoon)
+        self._grid.remove(spoon)
+        log("dd", f"SpoonCollisionIndex dropped {spoon.getName()}")
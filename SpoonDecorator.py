@@ -0,0 +1,113 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Scene node decorator which marks a node as a spoon.
+# It holds on to how the spoon was made, and copies that into the node's metadata
+# so Cura saves it in project files along with everything else.
+
+import json
+import math
+
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
+
+from .slasheetools import log as log
+
+class SpoonDecorator(SceneNodeDecorator):
+    # Key used in the node's metadata (and therefore the project file)
+    METADATA_KEY = "spoonawreborn_spoon"
+
+    def __init__(self, anchor: tuple[float, float, float] = (0.0, 0.0, 0.0), angle: float = 0.0,
+                 parent_name: str = "", settings: dict | None = None,
+                 local_anchor: tuple[float, float, float] | None = None) -> None:
+        super().__init__()
+        self._anchor: tuple[float, float, float] = tuple(float(value) for value in anchor)
+        self._angle: float = float(angle)
+        self._parent_name: str = parent_name
+        self._settings: dict = dict(settings) if settings else {}
+        self._local_anchor: tuple[float, float, float] | None = tuple(float(value) for value in local_anchor) if local_anchor is not None else None
+
+    def setNode(self, node: SceneNode) -> None:
+        super().setNode(node)
+        self._writeMetadata()
+
+    def isSpoon(self) -> bool:
+        return True
+
+    def getSpoonAnchor(self) -> tuple[float, float, float]:
+        """World position the spoon was placed at."""
+        return self._anchor
+
+    def getSpoonAngle(self) -> float:
+        return self._angle
+
+    def getSpoonLocalAnchor(self) -> tuple[float, float, float] | None:
+        """Where the spoon was placed in its parent's own coordinates, so it can be found again after the parent
+        gets rotated or scaled. None if it doesn't know (ie. it's from an older version)."""
+        return self._local_anchor
+
+    def getSpoonParentName(self) -> str:
+        """Name of the model the spoon was added to when it was created."""
+        return self._parent_name
+
+    def getSpoonSettings(self) -> dict:
+        """Spoon diameter, handle size etc. the spoon was made with."""
+        return dict(self._settings)
+
+    def getSpoonCircle(self) -> tuple[float, float, float] | None:
+        """Where the round part of the spoon is now, as (x, z, radius) on the build plate.
+        None if the spoon doesn't know what size it was made (ie. it's from an older version)."""
+        node = self.getNode()
+        try:
+            spoon_radius = float(self._settings["spoon_diameter"]) / 2
+            center_distance = float(self._settings["handle_length"]) + spoon_radius
+        except (KeyError, TypeError, ValueError):
+            return None
+        if node is None:
+            return None
+        # The mesh is made already rotated, so the circle is along the angle from the node's origin
+        transformation = node.getWorldTransformation().getData()
+        local_x = center_distance * math.cos(self._angle)
+        local_z = center_distance * math.sin(self._angle)
+        world_x = transformation[0, 0] * local_x + transformation[0, 2] * local_z + transformation[0, 3]
+        world_z = transformation[2, 0] * local_x + transformation[2, 2] * local_z + transformation[2, 3]
+        scale = math.hypot(transformation[0, 0], transformation[2, 0])  # In case it's been scaled along with its parent
+        return world_x, world_z, spoon_radius * scale
+
+    def getSpoonParameters(self) -> dict:
+        return {
+            "anchor": list(self._anchor),
+            "angle": self._angle,
+            "parent": self._parent_name,
+            "settings": self._settings,
+            "local_anchor": list(self._local_anchor) if self._local_anchor is not None else None
+        }
+
+    def _writeMetadata(self) -> None:
+        node = self.getNode()
+        metadata = getattr(node, "metadata", None)  # Only exists in versions of Cura which save it
+        if metadata is not None:
+            metadata[self.METADATA_KEY] = json.dumps(self.getSpoonParameters())
+
+    @classmethod
+    def fromMetadata(cls, value) -> "SpoonDecorator":
+        """Recreates a decorator from what got saved in a node's metadata.
+        Anything that can't be read just gets left at the defaults."""
+        value = getattr(value, "value", value)  # Project files can hand back a setting object instead of a str
+        try:
+            parameters = json.loads(value) if isinstance(value, str) else dict(value)
+        except (TypeError, ValueError) as e:
+            log("w", f"SpoonDecorator couldn't read saved spoon parameters {value}: {e}")
+            parameters = {}
+        try:
+            return cls(anchor=parameters.get("anchor", (0.0, 0.0, 0.0)),
+                       angle=parameters.get("angle", 0.0),
+                       parent_name=parameters.get("parent", ""),
+                       settings=parameters.get("settings", {}),
+                       local_anchor=parameters.get("local_anchor"))
+        except (TypeError, ValueError) as e:
+            log("w", f"SpoonDecorator got invalid saved spoon parameters {parameters}: {e}")
+            return cls()
+
+    def __deepcopy__(self, memo) -> "SpoonDecorator":
+        return SpoonDecorator(self._anchor, self._angle, self._parent_name, self._settings, self._local_anchor)
@@ -7,13 +7,14 @@
 
 from dataclasses import dataclass, field
 import math
+import re
 
-from cura.CuraApplication import CuraApplication
-
+# CuraApplication gets imported when it's needed so this can run outside of Cura
 #from UM.Application import Application
 
 from .script_helpers import *
 from .slasheetools import log as log
+from .stage_timing import StageTimer
 
 @dataclass
 class GcodeSection:
@@ -43,27 +44,85 @@ class GcodeSection:
     ends_retracted: bool = False
     starts_hopped: bool = False
     ends_hopped: bool = False
-    
+
+    extruder: int = 0
+    tool_change: bool = False  # Cura's G-code around a tool change rather than part of an object
+
+@dataclass
+class ExtruderRun:
+    """Everything printed between two tool changes. Sections only get reordered among the others in their run,
+    since the extruder end/start G-code Cura puts around a tool change has to stay between the same objects."""
+    spoons: list[GcodeSection] = field(default_factory = list)
+    others: list[GcodeSection] = field(default_factory = list)
+    control_lines: list[str] = field(default_factory = list)
+    tool_change: list[str] = field(default_factory = list)  # The tool change after the run (if there is one), exactly as Cura wrote it
+
+@dataclass
+class ExtruderSettings:
+    """The settings which can be different for each extruder, in G-code units (speeds are in mm/min)."""
+    retract_enabled: bool = False
+    retract_length: float = 0.0
+    retract_speed: float = 0.0
+    retract_prime_speed: float = 0.0
+
+    hop_enabled: bool = False
+    hop_height: float = 0.0
+    hop_speed: float = 0.0
+
+    feedrate_z: float = 0.0
+    travel_speed: float = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "ExtruderSettings":
+        """Converts from Cura's settings (which has every key in SpoonOrder.SETTING_DEFAULTS)."""
+        extruder = cls()
+        extruder.retract_enabled = bool(settings["retraction_enable"])
+        if extruder.retract_enabled:
+            extruder.retract_length = float(settings["retraction_amount"])
+            extruder.retract_speed = float(settings["retraction_speed"]) * 60
+            extruder.retract_prime_speed = float(settings["retraction_prime_speed"]) * 60
+
+        extruder.hop_enabled = bool(settings["retraction_hop_enabled"])
+        if extruder.hop_enabled:
+            extruder.hop_height = float(settings["retraction_hop"])
+            extruder.hop_speed = float(settings["speed_z_hop"]) * 60
+        else:
+            extruder.feedrate_z = float(settings["machine_max_feedrate_z"]) * 60
+        extruder.travel_speed = float(settings["speed_travel"]) * 60
+        return extruder
+
 class SpoonOrder:
     LINE_LAYER_START = ";LAYER:"
     LINE_MESH_START = ";MESH:"
+    # The name from ;MESH: lines, or None for a tool change
+    MESH_OR_TOOL_CHANGE_PATTERN = re.compile(r"^(?:;MESH:(.*)|T\d+(?![\d.]))", re.MULTILINE)
 
     # The following lines are saved until the end of the layer (where you usually want them to take effect).
     END_CONTROL_LINES = ("M104", "M109", "M140", "M190", "M141", "M191")
 
+    # Every setting execute() uses, with Cura's defaults for anything not given when running outside of Cura.
+    SETTING_DEFAULTS = {
+        "retraction_enable": True,
+        "retraction_amount": 6.5,
+        "retraction_speed": 25.0,
+        "retraction_prime_speed": 25.0,
+        "retraction_hop_enabled": False,
+        "retraction_hop": 0.2,
+        "speed_z_hop": 10.0,
+        "machine_max_feedrate_z": 299792458000.0,
+        "speed_travel": 120.0,
+        "relative_extrusion": False,
+        "layer_height_0": 0.3,
+    }
+    # The ones in there which each extruder can have its own value for
+    EXTRUDER_SETTING_KEYS = ("retraction_enable", "retraction_amount", "retraction_speed", "retraction_prime_speed",
+                             "retraction_hop_enabled", "retraction_hop", "speed_z_hop", "speed_travel")
+
     def __init__(self, target_name: str = "SpoonTab", spoons_first: bool = True) -> None:
         # Initialise all my variables in advance so that my linter doesn't yell at me for using variables which may not have been initialised.
-        self.retract_enabled: bool = False
-        self.retract_length: float = 0.0
-        self.retract_speed: float = 0.0
-        self.retract_prime_speed: float = 0.0
-        
-        self.hop_enabled: bool = False
-        self.hop_height: float = 0.0
-        self.hop_speed: float = 0.0
-
-        self.feedrate_z: float = 0.0
-        self.travel_speed: float = 0.0
+        # Settings for each extruder by number, and what to use for any extruder that isn't in there
+        self.extruders: dict[int, ExtruderSettings] = {}
+        self.default_extruder: ExtruderSettings = ExtruderSettings()
 
         self.initial_layer_height: float = 0.0
         self.relative_extrusion: bool = False
@@ -75,10 +134,16 @@ class SpoonOrder:
         self._global_stack = None
         self._extruder_stack = None
 
-    def getStackProperty(self, key: str, key_property: str = "value"):
+        # Splits execute() into phases if it's enabled and a run's going. Swap in a shared one to include it in that.
+        self.timer: StageTimer = StageTimer()
+
+    def getStackProperty(self, key: str, key_property: str = "value", extruder_stack = None):
         """For some reason the extruder was giving me actual, in use values when the global stack wasn't.
-        Other than those they're the same. Global stack remains as a fallback."""
-        extruder_value = self._extruder_stack.getProperty(key, key_property)
+        Other than those they're the same. Global stack remains as a fallback.
+        Uses the first extruder's stack unless it's given a different one."""
+        if extruder_stack is None:
+            extruder_stack = self._extruder_stack
+        extruder_value = extruder_stack.getProperty(key, key_property)
         global_value = self._global_stack.getProperty(key, key_property)
         log("d", f"For key {key}, extruder value = {extruder_value}, global value = {global_value}")
         if extruder_value is not None:
@@ -87,35 +152,95 @@ class SpoonOrder:
             return global_value
 
 
-    def execute(self, data: list[str]) -> list[str]:  # I know it doesn't need the same signature as a post. But it doesn't hurt.
-        """Run the not-quite-a-post-processing-script script!"""
+    def getCuraSettings(self) -> dict:
+        """Gets everything in SETTING_DEFAULTS from Cura's active stacks, with each extruder's own values in "extruders"."""
+        from cura.CuraApplication import CuraApplication
 
         # For some reason instantiating these here works when doing it in __init__() doesn't.
         self._global_stack = CuraApplication.getInstance().getGlobalContainerStack()
-        self._extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]
+        extruder_stacks = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()
+        self._extruder_stack = extruder_stacks[0]
+        settings = {key: self.getStackProperty(key, "value") for key in self.SETTING_DEFAULTS}
+        settings["extruders"] = {int(stack.getMetaDataEntry("position", index)): {key: self.getStackProperty(key, "value", stack) for key in self.EXTRUDER_SETTING_KEYS}
+                                 for index, stack in enumerate(extruder_stacks)}
+        return settings
+
+    def settingsFor(self, extruder: int) -> ExtruderSettings:
+        return self.extruders.get(extruder, self.default_extruder)
+
+    def _section_travel(self, section: GcodeSection) -> str:
+        """Travel to the start of a section using the settings for the extruder it's printed with."""
+        extruder = self.settingsFor(section.extruder)
+        return make_travel(section.start_x, section.start_y, extruder.travel_speed, section.start_z,
+                           extruder.retract_enabled, section.start_e, extruder.retract_length, extruder.retract_speed, extruder.retract_prime_speed,
+                           extruder.hop_enabled, extruder.hop_height, extruder.hop_speed,
+                           section.start_has_move, section.start_has_zdown, section.start_has_prime, section.starts_retracted, self.relative_extrusion)
+
+    def _layer_order(self, layer: str) -> tuple[bool, bool]:
+        """Whether the spoons in a layer are already all before (or after) everything else, going by its ;MESH: lines.
+        Only searches the text, so it's a lot cheaper than splitting the layer up to find out.
+
+        Returns:
+            tuple[bool, bool]: Whether it's in order between each tool change (which is as far as execute() can change it),
+                and whether it's still out of order across them.
+        """
+        seen_second_group = False
+        seen_second_group_in_run = False
+        in_order = True
+        for match in self.MESH_OR_TOOL_CHANGE_PATTERN.finditer(layer):
+            name = match.group(1)
+            if name is None:
+                seen_second_group_in_run = False  # Sections can't be moved across a tool change
+            elif name.startswith("NONMESH"):
+                pass  # Travels and such between objects, it doesn't matter which side of the spoons they're on
+            elif (self.target_name in name) != self.spoons_first:
+                seen_second_group = seen_second_group_in_run = True
+            elif seen_second_group_in_run:
+                return False, False
+            elif seen_second_group:
+                in_order = False
+        return True, not in_order
+
+    def _needs_reorder(self, layer: str) -> bool:
+        """Whether execute() will change a layer. Anything that doesn't get checked for also has to be left alone
+        by the layer before it, so this is used for both."""
+        return self.LINE_LAYER_START in layer and self.target_name in layer and not self._layer_order(layer)[0]
+
+    def _tool_change_start(self, lines: list[str]) -> int | None:
+        """Where the G-code for the first tool change in some lines starts: straight after the last extrusion before the T command,
+        so it includes the retract and the extruder end G-code. None if there isn't a tool change."""
+        tool_change_index = next((index for index, line in enumerate(lines) if get_tool_change(line) is not None), None)
+        if tool_change_index is None:
+            return None
+        return next((index + 1 for index in range(tool_change_index - 1, -1, -1) if is_extrusion_move(lines[index])), 0)
+
+    def execute(self, data: list[str], settings: dict | None = None) -> list[str]:  # I know it doesn't need the same signature as a post. But it doesn't hurt.
+        """Run the not-quite-a-post-processing-script script!
+
+        Args:
+            data (list[str]): G-code split up the same way as Cura's gcode_dict.
+            settings (dict | None): Values for the keys in SETTING_DEFAULTS. Anything missing uses the default.
+                Can have an "extruders" dict of extruder number -> settings which are different for that extruder.
+                Gets them from Cura if None, so they have to be given when running outside of Cura.
+        """
+        self.timer.checkpoint(None)
+        if settings is None:
+            settings = self.getCuraSettings()
+        settings = {**self.SETTING_DEFAULTS, **settings}
+        extruder_overrides: dict = settings.pop("extruders", None) or {}
         log("d", "SpoonOrder.execute() running")
 
-        # Get all the variables we're going to care about
-        self.retract_enabled = bool(self.getStackProperty("retraction_enable", "value"))
-        if self.retract_enabled:
-            self.retract_length = float(self.getStackProperty("retraction_amount", "value"))
-            self.retract_speed = float(self.getStackProperty("retraction_speed", "value")) * 60
-            self.retract_prime_speed = float(self.getStackProperty("retraction_prime_speed", "value")) * 60
-    
-        self.hop_enabled = bool(self.getStackProperty("retraction_hop_enabled", "value"))
-        if self.hop_enabled:
-            self.hop_height = float(self.getStackProperty("retraction_hop", "value"))
-            self.hop_speed = float(self.getStackProperty("speed_z_hop", "value")) * 60
-        else:
-            self.feedrate_z = float(self.getStackProperty("machine_max_feedrate_z", "value")) * 60
-        self.travel_speed = float(self.getStackProperty("speed_travel", "value")) * 60
-        self.relative_extrusion = bool(self.getStackProperty("relative_extrusion", "value"))
+        # Get all the variables we're going to care about.
+        # Worked out once for each extruder so tool changes only need to look them up.
+        self.default_extruder = ExtruderSettings.from_settings(settings)
+        self.extruders = {int(index): ExtruderSettings.from_settings({**settings, **overrides})
+                          for index, overrides in extruder_overrides.items()}
+        self.relative_extrusion = bool(settings["relative_extrusion"])
 
-        self.initial_layer_height = float(self.getStackProperty("layer_height_0", "value"))
+        self.initial_layer_height = float(settings["layer_height_0"])
 
         # whole_gcode: str = ("\n".join(data)).splitlines()
 
-        layer_process_markers: list[str] = [";LAYER:", self.target_name]  # All of these need to be present for it process a layer
         section_delimiters: tuple[str] = (";LAYER:", ";MESH:")
         start_line = ";LAYER:"
         end_line = ";TIME_"
@@ -124,19 +249,33 @@ class SpoonOrder:
         previous_layer_lines_unaltered: list[str] = None
         spoon_key = self.target_name
         first_layer_processed: bool = False
+        current_extruder: int = 0  # Followed through every T command, whether the layer gets reordered or not
+        layers_in_order: int = 0
+        tool_change_layers: int = 0
+        self.timer.checkpoint("settings")
         
         for layer_index, layer in enumerate(data):
-            # Some basic checks to see if this is something we want to bother with
-            if not all(marker in layer for marker in layer_process_markers):
+            # Skip anything without spoons, or where Cura's already put them where we want them
+            has_spoons = self.LINE_LAYER_START in layer and self.target_name in layer
+            in_order, split_by_tool_change = self._layer_order(layer) if has_spoons else (True, False)
+            if in_order:
+                if has_spoons:
+                    layers_in_order += 1
+                    if split_by_tool_change:
+                        tool_change_layers += 1
+                    previous_layer_lines_unaltered = None  # The next layer can get it from data like previous_layer_lines
                 previous_layer_lines = None
+                current_extruder = get_last_tool_change(layer, current_extruder)
+                self.timer.checkpoint("skip_layer")
                 continue
             
             # Reset all the gcode sections
             layer_start_lines: GcodeSection = GcodeSection()
             spoon_lines: list[GcodeSection] = []
             non_spoon_lines: list[GcodeSection] = []
-            layer_end_lines: GcodeSection = GcodeSection
+            layer_end_lines: GcodeSection = GcodeSection()
             control_lines: list[str] = []
+            runs: list[ExtruderRun] = []  # Every run before the current one
 
             current_section: GcodeSection = None
 
@@ -158,8 +297,15 @@ class SpoonOrder:
                 previous_layer_lines_unaltered = previous_layer_lines
             
             for line_index, line in enumerate(layer_lines):
-                if line.startswith(section_delimiters) or line.startswith(end_line):
-                    if current_section is not None:
+                tool_change = get_tool_change(line)
+                if tool_change is not None:
+                    current_extruder = tool_change
+                # A tool change between objects ends the run, and takes everything after the last extrusion before it along
+                ends_run: bool = (tool_change is not None and current_section is not None and not current_section.tool_change
+                                  and not current_section.first_section and not current_section.last_section)
+                if line.startswith(section_delimiters) or line.startswith(end_line) or ends_run:
+                    tool_change_lines: list[str] = []
+                    if current_section is not None and not current_section.tool_change:
                         # Add last line if it's the last line
                         if line.startswith(end_line):
                             current_section.lines.append(line)
@@ -168,8 +314,35 @@ class SpoonOrder:
                         elif line.startswith(start_line):
                             current_section.first_section = True
 
+                        # Keep the tool change's G-code aside so none of it gets filtered, commented out or moved
+                        tool_change_start = self._tool_change_start(current_section.lines + [line] if ends_run else current_section.lines)
+                        if tool_change_start is not None:
+                            tool_change_lines = current_section.lines[tool_change_start:]
+                            del current_section.lines[tool_change_start:]
+                            if ends_run and not self.relative_extrusion:
+                                # Whatever gets printed before it now, it needs the extruder where it was when Cura wrote it
+                                tool_change_e = get_last_e_value(layer_lines[:current_section.start_line_index + tool_change_start])
+                                if tool_change_e is not None:
+                                    tool_change_lines.insert(0, f"G92 E{tool_change_e}  ; SpoonOrder resetting extruder for tool change")
+                        control_lines.extend(control_line for control_line in current_section.lines if control_line.startswith(self.END_CONTROL_LINES))
+                        current_section.lines = [section_line for section_line in current_section.lines if not section_line.startswith(self.END_CONTROL_LINES)]
+                        if not current_section.lines:
+                            current_section = None  # It was nothing but the start of the tool change
+
+                    if current_section is not None and current_section.tool_change:
+                        # The ;TYPE line at the end belongs to the next section, same as after any other section
+                        if current_section.lines[-1].startswith(";TYPE:"):
+                            current_section.lines.pop()
+                        elif line.startswith(end_line):
+                            current_section.lines.append(line)
+                        runs.append(ExtruderRun(spoon_lines, non_spoon_lines, control_lines, current_section.lines))
+                        spoon_lines, non_spoon_lines, control_lines = [], [], []
+                        current_section = None
+                    elif current_section is not None:
+                        extruder = self.settingsFor(current_section.extruder)
+
                         # Check to see if it retracts at the end of the startup gcode
-                        if ";LAYER:0" in layer and self.retract_enabled and current_section.first_section:
+                        if ";LAYER:0" in layer and extruder.retract_enabled and current_section.first_section:
                             for start_retract in reversed(data[layer_index - 1].splitlines()):
                                 if start_retract.startswith("G1 "):
                                     if is_retract_line(start_retract):
@@ -189,12 +362,12 @@ class SpoonOrder:
                             if filter_index < section_end_index:
                                 filtered_section_lines.append(filter_line)
                                 continue
-                            if self.hop_enabled:
-                                if is_z_hop_line(filter_line, self.hop_speed):
+                            if extruder.hop_enabled:
+                                if is_z_hop_line(filter_line, extruder.hop_speed):
                                     continue
-                            if self.retract_enabled:
-                                if is_retract_line(filter_line, self.retract_speed) \
-                                    or is_retract_line(filter_line, self.retract_prime_speed):
+                            if extruder.retract_enabled:
+                                if is_retract_line(filter_line, extruder.retract_speed) \
+                                    or is_retract_line(filter_line, extruder.retract_prime_speed):
                                     continue
                             filtered_section_lines.append(filter_line)
                         current_section.lines = filtered_section_lines
@@ -222,9 +395,9 @@ class SpoonOrder:
                                     current_section.start_y = start_line_y
                             elif start_line.startswith("G1 ") or (start_line.startswith(("G2 ", "G3 ")) and "E" in start_line):
                                 if not current_section.start_has_zdown:
-                                    current_section.start_has_zdown = is_z_hop_line(start_line, self.hop_speed)
+                                    current_section.start_has_zdown = is_z_hop_line(start_line, extruder.hop_speed)
                                 if not current_section.start_has_prime:
-                                    current_section.start_has_prime = is_retract_line(start_line, self.retract_prime_speed)
+                                    current_section.start_has_prime = is_retract_line(start_line, extruder.retract_prime_speed)
                         # Check for coords to see if it contains a move
                         if current_section.start_x and current_section.start_y:
                             current_section.start_has_move = True
@@ -254,7 +427,7 @@ class SpoonOrder:
 
                         # Comment out moves in last section; we only need the coordinates
                         if current_section.last_section:
-                            if layer_index < (len(data) - 1) and self.target_name in data[layer_index + 1]:
+                            if layer_index < (len(data) - 1) and self._needs_reorder(data[layer_index + 1]):
                                 new_last_section: list[str] = []
                                 for last_section_line in current_section.lines:
                                     if last_section_line.startswith(("G0 ", "G1 ", "G2 ", "G3 ")):
@@ -270,7 +443,7 @@ class SpoonOrder:
                             first_layer_processed = True
                             layer_z = self.initial_layer_height
                             current_section.start_z = layer_z
-                        elif (self.hop_enabled or (not first_layer_processed and current_section.first_section)) and (layer_z == math.inf or layer_z is None):
+                        elif (extruder.hop_enabled or (not first_layer_processed and current_section.first_section)) and (layer_z == math.inf or layer_z is None):
                             # We need to get the layer Z as the lowest Z value
                             log("d", "SpoonOrder getting Z value from lowest on layer")
                             for z_line in layer_lines:
@@ -304,25 +477,28 @@ class SpoonOrder:
                                 current_section.start_x = 0.0
                                 current_section.start_y = 0.0
                             #log("w", f"Just couldn't get starting coords for section starting layer {current_section.layer_index} line {current_section.start_line_index}")
-                        if not travelled_first_z and self.hop_enabled:
-                            current_section.lines.insert(1, f"G1 F{self.hop_speed if self.hop_enabled else self.feedrate_z} Z{layer_z}")
+                        if not travelled_first_z and extruder.hop_enabled:
+                            current_section.lines.insert(1, f"G1 F{extruder.hop_speed if extruder.hop_enabled else extruder.feedrate_z} Z{layer_z}")
                             travelled_first_z = True
                         # Get starting E co-ord
                         if self.relative_extrusion:
                             current_section.start_e = 0.0
                         else:
                             if current_section.start_line_index > 0:
-                                new_e = get_last_e_non_retract(layer_lines[:current_section.start_line_index], self.retract_speed, self.retract_prime_speed)
+                                new_e = get_last_e_non_retract(layer_lines[:current_section.start_line_index], extruder.retract_speed, extruder.retract_prime_speed)
                                 if new_e is not None:
                                     current_section.start_e = new_e
                             if not current_section.start_e:
                                 try:
-                                    current_section.start_e = get_last_e_non_retract(previous_layer_lines_unaltered, self.retract_speed, self.retract_prime_speed)
+                                    current_section.start_e = get_last_e_non_retract(previous_layer_lines_unaltered, extruder.retract_speed, extruder.retract_prime_speed)
                                 except Exception as e:
                                     log("e", f"Problem where Pylint gets current_section.start_e wrong: {e}")
                             if not current_section.start_e:
                                 current_section.start_e = 0.0
                         
+                        # Tool changes at the start or end of the layer stay where they are
+                        if not ends_run:
+                            current_section.lines.extend(tool_change_lines)
                         # Add it to the proper pile
                         if current_section.first_section:
                             layer_start_lines = current_section
@@ -353,56 +529,49 @@ class SpoonOrder:
                         current_section.name = line
                     current_section.start_line_index = line_index
                     current_section.layer_index = layer_index
+                    current_section.extruder = current_extruder
+                    if ends_run:
+                        current_section.tool_change = True
+                        current_section.lines = tool_change_lines
 
-                if line.startswith(self.END_CONTROL_LINES):
-                    control_lines.append(line)
-                elif current_section is not None:
+                if current_section is not None:
                     current_section.lines.append(line)
+            self.timer.checkpoint("split_sections")
             # Put together the jigsaw pieces of the layer
             new_layer: list[str] = []
             if layer_start_lines.lines:
                 new_layer.append(layer_start_lines.lines[0])  # Start with ";LAYER" heading
                 # First layer only gets a travel if it has any extrusion moves
                 if any(is_extrusion_move(initial_layer_line) for initial_layer_line in layer_start_lines.lines):
-                    new_layer.append(make_travel(layer_start_lines.start_x, layer_start_lines.start_y, self.travel_speed, layer_start_lines.start_z,
-                                             self.retract_enabled, layer_start_lines.start_e, self.retract_length, self.retract_speed, self.retract_prime_speed,
-                                             self.hop_enabled, self.hop_height, self.hop_speed,
-                                             layer_start_lines.start_has_move, layer_start_lines.start_has_zdown, layer_start_lines.start_has_prime, layer_start_lines.starts_retracted, self.relative_extrusion))
+                    new_layer.append(self._section_travel(layer_start_lines))
                 new_layer.extend(layer_start_lines.lines[1:])
-            if self.spoons_first:
-                for spoon in spoon_lines:
-                    new_layer.append(make_travel(spoon.start_x, spoon.start_y, self.travel_speed, spoon.start_z,
-                                                 self.retract_enabled, spoon.start_e, self.retract_length, self.retract_speed, self.retract_prime_speed,
-                                                 self.hop_enabled, self.hop_height, self.hop_speed,
-                                                 spoon.start_has_move, spoon.start_has_zdown, spoon.start_has_prime, spoon.starts_retracted, self.relative_extrusion))
-                    new_layer.extend(spoon.lines)
-            for non_spoon in non_spoon_lines:
-                new_layer.append(make_travel(non_spoon.start_x, non_spoon.start_y, self.travel_speed, non_spoon.start_z,
-                                                self.retract_enabled, non_spoon.start_e, self.retract_length, self.retract_speed, self.retract_prime_speed,
-                                                self.hop_enabled, self.hop_height, self.hop_speed,
-                                                non_spoon.start_has_move, non_spoon.start_has_zdown, non_spoon.start_has_prime, non_spoon.starts_retracted, self.relative_extrusion))
-                new_layer.extend(non_spoon.lines)
-            if not self.spoons_first:
-                for spoon in spoon_lines:
-                    new_layer.append(make_travel(spoon.start_x, spoon.start_y, self.travel_speed, spoon.start_z,
-                                                 self.retract_enabled, spoon.start_e, self.retract_length, self.retract_speed, self.retract_prime_speed,
-                                                 self.hop_enabled, self.hop_height, self.hop_speed,
-                                                 spoon.start_has_move, spoon.start_has_zdown, spoon.start_has_prime, spoon.starts_retracted, self.relative_extrusion))
-                    new_layer.extend(spoon.lines)
-            if control_lines:
-                new_layer.extend(control_lines)
+            runs.append(ExtruderRun(spoon_lines, non_spoon_lines, control_lines))
+            for run in runs:
+                ordered_sections = run.spoons + run.others if self.spoons_first else run.others + run.spoons
+                for section in ordered_sections:
+                    new_layer.append(self._section_travel(section))
+                    new_layer.extend(section.lines)
+                new_layer.extend(run.control_lines)
+                new_layer.extend(run.tool_change)
             if layer_end_lines.lines:
                 #new_layer.append(make_travel(layer_end_lines.start_x, layer_end_lines.start_y, self.travel_speed, layer_end_lines.start_z,
                 #                             self.retract_enabled, layer_end_lines.start_e, self.retract_length, self.retract_speed, self.retract_prime_speed,
                 #                             self.hop_enabled, self.hop_height, self.hop_speed))
                 new_layer.extend(layer_end_lines.lines)
-                if not (layer_index < (len(data) - 1) and self.target_name in data[layer_index + 1]):
+            if layer_end_lines.lines:
+                if not (layer_index < (len(data) - 1) and self._needs_reorder(data[layer_index + 1])):
                     new_layer.append(f"G92 E{get_last_e_value(layer_lines)}  ; SpoonOrder resetting extruder for one last time")
 
+            self.timer.checkpoint("assemble_layer")
+
             # Need the original version as well in case we played around with the end
             previous_layer_lines_unaltered = layer_lines
 
             data[layer_index] = "\n".join(new_layer) + "\n"
             # Only change this after we've processed it
             previous_layer_lines = data[layer_index].splitlines()
+            self.timer.checkpoint("write_layer")
+        log("d", f"SpoonOrder left {layers_in_order} layers with spoons alone since they were already in order")
+        if tool_change_layers:
+            log("w", f"SpoonOrder couldn't reorder {tool_change_layers} layers because their spoons are printed with a different extruder than what they should go before or after")
         return data
\ No newline at end of file
@@ -0,0 +1,31 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Draws the preview of automatic placement.
+# It's the tool's handle rather than a scene node, so it doesn't get saved, sliced, or undone,
+# and changing it doesn't make Cura re-slice anything.
+
+from UM.Mesh.MeshData import MeshData
+from UM.Scene.ToolHandle import ToolHandle
+
+class SpoonPreviewHandle(ToolHandle):
+    # RGBA for every vertex of the preview. Has to be different to the axis colours or clicking it would pick an axis.
+    PreviewColor = (0.3, 0.75, 1.0, 1.0)
+
+    def __init__(self, parent = None) -> None:
+        super().__init__(parent)
+        self._name = "SpoonPreviewHandle"
+        # The preview is in world coordinates so it shouldn't get bigger or smaller with the camera
+        self._auto_scale = False
+
+    def buildMesh(self) -> None:
+        # Nothing to show until there's a preview
+        pass
+
+    def setPreviewMesh(self, mesh: MeshData | None) -> None:
+        self.setSolidMesh(mesh)
+
+    def _onSelectionCenterChanged(self) -> None:
+        # Other handles follow the selection around, but this one has to stay at the origin
+        # so the preview lines up with where the spoons will go.
+        pass
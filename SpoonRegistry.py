@@ -0,0 +1,134 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Keeps track of every spoon in the scene so nothing has to go searching the whole scene for them.
+# Kept up to date from the scene's signals, so spoons which get removed (or come back with undo)
+# are noticed no matter what removed them.
+
+from typing import Callable
+
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+from UM.Signal import Signal
+
+from .SpoonDecorator import SpoonDecorator
+from .slasheetools import log as log
+
+class SpoonRegistry:
+    def __init__(self, scene: Scene, legacy_name_check: Callable[[str], bool] | None = None) -> None:
+        self._scene: Scene = scene
+        # Spoons from before they had a decorator can only be identified by name
+        self._legacy_name_check = legacy_name_check
+
+        # Dicts used as ordered sets so spoons come back in the order they were added
+        self._spoon_parents: dict[SceneNode, SceneNode] = {}
+        self._spoons_by_parent: dict[SceneNode, dict[SceneNode, None]] = {}
+
+        self._scene.sceneChanged.connect(self._onSceneChanged)
+
+    # Both get the spoon as their argument
+    spoonRegistered = Signal()
+    spoonUnregistered = Signal()
+
+    def isSpoon(self, node: SceneNode) -> bool:
+        """Checks if a node is a spoon, adopting it if it's one that was loaded from a file."""
+        if node is None:
+            return False
+        if node.callDecoration("isSpoon"):
+            return True
+        return self._adoptSpoon(node)
+
+    def register(self, spoon: SceneNode) -> None:
+        parent = spoon.getParent()
+        if spoon in self._spoon_parents and self._spoon_parents[spoon] is parent:
+            return
+        self._forget(spoon)
+        self._spoon_parents[spoon] = parent
+        self._spoons_by_parent.setdefault(parent, {})[spoon] = None
+        self.spoonRegistered.emit(spoon)
+
+    def unregister(self, spoon: SceneNode) -> None:
+        self._forget(spoon)
+
+    def isRegistered(self, spoon: SceneNode) -> bool:
+        return spoon in self._spoon_parents
+
+    def getSpoons(self) -> list[SceneNode]:
+        return list(self._spoon_parents)
+
+    def getSpoonsOf(self, parent: SceneNode) -> list[SceneNode]:
+        return list(self._spoons_by_parent.get(parent, {}))
+
+    def getSpoonCount(self) -> int:
+        return len(self._spoon_parents)
+
+    def getParents(self) -> list[SceneNode]:
+        """All the nodes which currently have spoons attached."""
+        return list(self._spoons_by_parent)
+
+    def _forget(self, spoon: SceneNode) -> None:
+        if spoon not in self._spoon_parents:
+            return
+        old_parent = self._spoon_parents.pop(spoon)
+        siblings = self._spoons_by_parent.get(old_parent)
+        if siblings is not None:
+            siblings.pop(spoon, None)
+            if not siblings:
+                del self._spoons_by_parent[old_parent]
+        self.spoonUnregistered.emit(spoon)
+
+    def _adoptSpoon(self, node: SceneNode) -> bool:
+        """Puts a decorator on spoons which don't have one yet,
+        either from a project file or from an older version of the plugin."""
+        metadata = getattr(node, "metadata", None) or {}
+        if SpoonDecorator.METADATA_KEY in metadata:
+            node.addDecorator(SpoonDecorator.fromMetadata(metadata[SpoonDecorator.METADATA_KEY]))
+            log("d", f"SpoonRegistry restored spoon {node.getName()} from saved metadata")
+            return True
+        if self._legacy_name_check is not None and self._legacy_name_check(node.getName()):
+            node.addDecorator(SpoonDecorator())
+            log("d", f"SpoonRegistry adopted spoon {node.getName()} by its name")
+            return True
+        return False
+
+    def _isInScene(self, node: SceneNode) -> bool:
+        root = self._scene.getRoot()
+        while node is not None:
+            if node is root:
+                return True
+            node = node.getParent()
+        return False
+
+    def _checkNode(self, node: SceneNode) -> None:
+        """Registers a node if it's a spoon in the scene, or forgets it if it's a spoon which isn't."""
+        if node in self._spoon_parents:
+            if node.getParent() is None or not self._isInScene(node):
+                self._forget(node)
+            elif node.getParent() is not self._spoon_parents[node]:
+                self.register(node)
+        elif self.isSpoon(node) and self._isInScene(node):
+            self.register(node)
+
+    def _onSceneChanged(self, source: SceneNode) -> None:
+        # Nodes pass their children's signals up, so the source is the node whose children changed
+        # (or a node which moved). Spoons always sit directly under the model they belong to,
+        # so looking two levels down covers models being added with their spoons attached.
+        if source is None:
+            return
+
+        for spoon in self.getSpoonsOf(source):
+            self._checkNode(spoon)
+        self._checkNode(source)
+
+        for child in source.getChildren():
+            self._checkNode(child)
+            if child not in self._spoon_parents:
+                for grandchild in child.getChildren():
+                    self._checkNode(grandchild)
+
+        if source is self._scene.getRoot():
+            # Whole models (and their spoons) can be removed at once
+            for parent in self.getParents():
+                if not self._isInScene(parent):
+                    for spoon in self.getSpoonsOf(parent):
+                        self._forget(spoon)
@@ -1,11 +1,17 @@
 # Copyright (c) 2023 5@xes
 # Based on the TabPlus plugin  and licensed under LGPLv3 or higher.
 
+import time
+
+_import_start = time.perf_counter()
 from . import SpoonAntiWarpingReborn
+_import_time = time.perf_counter() - _import_start
 
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("spoonawreborn")
 
+from .slasheetools import log as log
+
 def getMetaData():
     _qml_file="qml/spoonawreborn.qml"
 
@@ -20,4 +26,10 @@ def getMetaData():
     }
 
 def register(app):
-    return { "tool": SpoonAntiWarpingReborn.SpoonAntiWarpingReborn() }
+    create_start = time.perf_counter()
+    tool = SpoonAntiWarpingReborn.SpoonAntiWarpingReborn()
+    create_time = time.perf_counter() - create_start
+    # Geometry libraries aren't imported until they're needed, so these should stay small
+    log("i", f"Spoon Anti-Warping Reborn startup took {(_import_time + create_time) * 1000:.0f}ms "
+             f"(import {_import_time * 1000:.0f}ms, creating tool {create_time * 1000:.0f}ms)")
+    return { "tool": tool }
@@ -0,0 +1,234 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Times the plugin's geometry hot paths on synthetic meshes without needing Cura,
+# and prints the results as JSON so they can be compared between releases.
+#
+# Usage (from the plugin directory):
+#   python benchmarks/benchmark_geometry.py                      Everything, 1k to 5M triangles
+#   python benchmarks/benchmark_geometry.py --quick              Small meshes only, for a quick look
+#   python benchmarks/benchmark_geometry.py --sizes 1000 50000 --shapes box --output results.json
+
+import argparse
+import datetime
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import stand_ins
+import synthetic_meshes
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 5_000_000]
+QUICK_SIZES = [1_000, 10_000]
+
+def measure(function: Callable[[], object], repeat: int) -> dict:
+    """Runs something once to warm up, once under tracemalloc for its peak memory, then times it repeat times."""
+    function()
+
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {
+        "calls": repeat,
+        "seconds_per_call": {
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+        },
+        "peak_memory_bytes": peak_memory,
+    }
+
+def result(benchmark: str, mesh: str, triangles: int | None, measurement: dict, **extra) -> dict:
+    median = measurement["seconds_per_call"]["median"]
+    triangles_per_second = None
+    if triangles is not None:
+        triangles_per_second = triangles / median if median > 0 else math.inf
+    return {
+        "benchmark": benchmark,
+        "mesh": mesh,
+        "triangles": triangles,
+        **measurement,
+        "triangles_per_second": triangles_per_second,
+        **extra,
+    }
+
+def repeats_for(triangles: int, repeat: int) -> int:
+    """Fewer runs for the huge meshes so the whole thing finishes in a sensible time."""
+    if triangles >= 1_000_000:
+        return max(1, min(repeat, 2))
+    return repeat
+
+def nested_hulls(count: int, seed: int = 0) -> list[np.ndarray]:
+    """Random convex hulls where about half are inside another one, like holes and bosses on a base."""
+    from scipy.spatial import ConvexHull
+    generator = np.random.default_rng(seed)
+    hulls = []
+    while len(hulls) < count:
+        center = generator.uniform(-100, 100, 2)
+        radius = generator.uniform(3, 15)
+        for scale in (1.0, 0.5)[:count - len(hulls)]:
+            points = center + generator.normal(size=(24, 2)) * radius * scale
+            hulls.append(points[ConvexHull(points).vertices])
+    return hulls
+
+def check_spoon_clearance(placement_engine) -> None:
+    """Spoons on different areas have to be at least the density's minimum gap apart, not just not overlapping."""
+    settings = placement_engine.SpoonSettings()
+    gap = placement_engine.minimum_gap(settings.density, settings.spoon_diameter)
+    # Pointing straight along x, so the round parts are handle_length + radius further along than the spoons
+    first = placement_engine.PlannedSpoon(0.0, 0.0, 0.0, 0)
+    for extra, should_keep in ((-0.01, False), (0.01, True)):
+        second = placement_engine.PlannedSpoon(settings.spoon_diameter + gap + extra, 0.0, 0.0, 1)
+        kept = placement_engine.separate_spoons([first, second], settings)
+        if (len(kept) == 2) != should_keep:
+            raise RuntimeError(f"separate_spoons {'dropped' if should_keep else 'kept'} a spoon {gap + extra:.2f}mm from one on another area "
+                               f"with a minimum gap of {gap:.2f}mm")
+
+def check_duplicate_hulls(geometry_helpers) -> None:
+    """Identical hulls (however their points are ordered) only keep the first one, and none of them if they're inside something bigger."""
+    square = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    same_square = np.roll(square, 1, axis=0)[::-1] + 1e-9
+    big_square = square * 3 - 10
+    off_to_the_side = square + 50
+    cases = [
+        ([square, same_square], [0]),
+        ([same_square, square], [0]),
+        ([square, same_square, square], [0]),
+        ([square, off_to_the_side, same_square], [0, 1]),
+        ([square, same_square, big_square], [2]),
+    ]
+    for hulls, expected in cases:
+        kept = geometry_helpers.outermost_hulls(hulls)
+        if kept != expected:
+            raise RuntimeError(f"outermost_hulls kept {kept} instead of {expected} with duplicate hulls")
+
+def run(sizes: list[int], shapes: list[str], repeat: int, max_to_mesh_data: int) -> list[dict]:
+    main_module = stand_ins.load_plugin_module("SpoonAntiWarpingReborn")
+    geometry_helpers = stand_ins.load_plugin_module("geometry_helpers")
+    placement_engine = stand_ins.load_plugin_module("placement_engine")
+    tool = stand_ins.make_tool(main_module)
+    import trimesh
+
+    check_spoon_clearance(placement_engine)
+    check_duplicate_hulls(geometry_helpers)
+
+    results = []
+
+    # Spoon meshes are the same size whatever they're put on
+    for teardrop in (False, True):
+        spoon = tool._createSpoon(10.0, 2.0, 2.0, 10, 0, 0.3, teardrop, 0.7)
+        triangle_count = len(spoon.getIndices())
+        results.append(result("createSpoon", "teardrop" if teardrop else "round", triangle_count,
+                              measure(lambda: tool._createSpoon(10.0, 2.0, 2.0, 10, 0, 0.3, teardrop, 0.7), repeat * 20)))
+
+    for shape in shapes:
+        for size in sizes:
+            vertices, indices = synthetic_meshes.SHAPES[shape](size)
+            triangle_count = len(indices)
+            runs = repeats_for(triangle_count, repeat)
+            node = stand_ins.Node(f"{shape}_{size}", vertices, indices)
+
+            if triangle_count <= max_to_mesh_data:
+                tri_mesh = trimesh.base.Trimesh(vertices=vertices, faces=indices, process=False)
+                results.append(result("toMeshData", shape, triangle_count, measure(lambda: tool._toMeshData(tri_mesh), runs)))
+            else:
+                results.append({"benchmark": "toMeshData", "mesh": shape, "triangles": triangle_count,
+                                "skipped": f"more than --max-to-mesh-data ({max_to_mesh_data}) triangles"})
+
+            def uncached_hulls():
+                tool._footprint_cache.clear()
+                return tool._get_base_convex_hulls(node)
+            hulls = uncached_hulls()
+            results.append(result("get_base_convex_hulls", shape, triangle_count, measure(uncached_hulls, runs), hull_count=len(hulls)))
+            results.append(result("get_base_convex_hulls_cached", shape, triangle_count,
+                                  measure(lambda: tool._get_base_convex_hulls(node), runs)))
+
+            first_point = hulls[0].getPoints()[0] if hulls else node.getConvexHull().getPoints()[0]
+            position = stand_ins.Vector(first_point[0], 0, first_point[1])
+            results.append(result("defineAngle", shape, triangle_count,
+                                  measure(lambda: tool.defineAngle(node, position, hulls[0] if hulls else None), runs * 5)))
+
+            # The whole of automatic placement for a node, like AutoSpoonJob runs it. AutoSpoonJob
+            # swallows exceptions, so this also makes sure planning really does come up with spoons.
+            snapshot = tool._snapshot_node(node)
+            for placement in placement_engine.PLACEMENT_MODES:
+                settings = tool._placement_settings()
+                settings.placement = placement
+                _, placements = tool._plan_auto_spoons(snapshot, settings)
+                if not placements:
+                    raise RuntimeError(f"_plan_auto_spoons didn't place any spoons on {shape} with {placement} placement")
+                results.append(result("plan_auto_spoons", shape, triangle_count,
+                                      measure(lambda: tool._plan_auto_spoons(snapshot, settings), runs),
+                                      placement=placement, spoons=len(placements)))
+            del snapshot
+            del node, vertices, indices
+            gc.collect()
+
+    for count in (10, 100, 500):
+        hull_points = nested_hulls(count)
+        kept = geometry_helpers.outermost_hulls(hull_points)
+        results.append(result("outermost_hulls", f"{count}_hulls", None, measure(lambda: geometry_helpers.outermost_hulls(hull_points), repeat),
+                              hulls=count, kept=len(kept)))
+
+    return results
+
+def metadata() -> dict:
+    import scipy
+    import trimesh
+    plugin = json.loads((stand_ins.PLUGIN_DIR / "plugin.json").read_text())
+    return {
+        "plugin_version": plugin.get("version"),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "trimesh": trimesh.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Spoon Anti-Warping Reborn's geometry code on synthetic meshes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, help="Triangle counts to generate meshes with")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(synthetic_meshes.SHAPES), default=sorted(synthetic_meshes.SHAPES))
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs of each benchmark (fewer for meshes over 1M triangles)")
+    parser.add_argument("--max-to-mesh-data", type=int, default=250_000,
+                        help="Largest mesh to run _toMeshData on, since it goes through every face in Python")
+    parser.add_argument("--quick", action="store_true", help=f"Only use {QUICK_SIZES} triangles and 3 runs")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON here instead of printing it")
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    repeat = 3 if args.quick else args.repeat
+    report = {
+        "meta": metadata(),
+        "results": run(sizes, args.shapes, repeat, args.max_to_mesh_data),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
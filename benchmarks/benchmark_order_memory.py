@@ -0,0 +1,88 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Checks how much memory print ordering uses on a big synthetic G-code file, using the same
+# tracemalloc profiling as spoon_order_cli.py --profile. It's a check as well as a benchmark: if the
+# peak for any mode is over its limit (a multiple of the file size) it raises an error once the results
+# are out, so a memory regression shows up before a user's Cura runs out of memory saving a big print.
+#
+# Usage (from the plugin directory):
+#   python benchmarks/benchmark_order_memory.py                          1GB file, loaded and memory-mapped (slow, and needs ~5GB free)
+#   python benchmarks/benchmark_order_memory.py --size-mb 100 --modes mapped --max-ratio 0.05
+#   python benchmarks/benchmark_order_memory.py --gcode print.gcode      Check a real file instead
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import synthetic_gcode
+import spoon_order_cli
+
+# Most memory each mode is allowed as a multiple of the file size.
+# Loading peaks at just under 5x: splitting the file into layers, and writing it back out while the
+# file, its original layers and the reordered ones are all still around. Mapped only ever holds a few layers.
+MAX_RATIOS = {
+    "memory": 5.0,
+    "mapped": 0.1,
+}
+
+def check(gcode: Path, mode: str, max_ratio: float, output_dir: Path) -> dict:
+    reorder = spoon_order_cli.reorder_mapped_file if mode == "mapped" else spoon_order_cli.reorder_file
+    result = reorder(gcode, output_dir / f"{gcode.stem}_{mode}.gcode", {}, True, "SpoonTab", True)
+    if result.error:
+        raise RuntimeError(f"{mode}: {result.error}")
+    size = gcode.stat().st_size
+    peak = result.report["peak_mb"] * 1024 * 1024
+    return {
+        "mode": mode,
+        "size_mb": round(size / (1024 * 1024), 3),
+        "seconds": round(result.seconds, 3),
+        "reordered_layers": result.reordered_layers,
+        "peak_mb": result.report["peak_mb"],
+        "ratio": round(peak / size, 4),
+        "max_ratio": max_ratio,
+        "passed": peak <= max_ratio * size,
+        "stages": result.report["stages"],
+    }
+
+def check_peak(result: dict) -> None:
+    """Fails if a mode's peak memory went over its limit."""
+    if not result["passed"]:
+        raise RuntimeError(f"{result['mode']} peaked at {result['peak_mb']:.1f}MB, which is {result['ratio']:.2f}x the file "
+                           f"when the limit is {result['max_ratio']}x")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check print ordering's peak memory stays under a multiple of the G-code size.")
+    parser.add_argument("--size-mb", type=float, default=1024, help="Size of the synthetic G-code (default: %(default)s)")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MAX_RATIOS), default=sorted(MAX_RATIOS),
+                        help="memory: like the default, mapped: like --low-memory")
+    parser.add_argument("--max-ratio", type=float, default=None, help=f"Limit for every mode instead of {MAX_RATIOS}")
+    parser.add_argument("--spoon-layers", type=int, default=None, help="Only put spoons on this many layers (default: every layer)")
+    parser.add_argument("--gcode", type=Path, default=None, help="Use this file instead of making one. The limits are meant for big files; small ones are mostly overhead")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON here instead of printing it")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="spoonorder_memory_") as temp_dir:
+        temp_dir = Path(temp_dir)
+        gcode = args.gcode
+        if gcode is None:
+            gcode = temp_dir / "synthetic.gcode"
+            synthetic_gcode.write_gcode(gcode, int(args.size_mb * 1024 * 1024), spoon_layers=args.spoon_layers)
+        results = [check(gcode, mode, args.max_ratio if args.max_ratio is not None else MAX_RATIOS[mode], temp_dir)
+                   for mode in args.modes]
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    for result in results:
+        check_peak(result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Finds parameters and local variables with the same name as a function, class or import at the
+# top of their module. Inside that function the name isn't the module's any more, so calling it
+# raises UnboundLocalError (or worse, quietly calls the wrong thing), and code like automatic
+# placement runs in background jobs which swallow the error. Exits with 1 if it finds any.
+#
+# Usage (from the plugin directory):
+#   python benchmarks/check_shadowing.py                  Every module in the plugin
+#   python benchmarks/check_shadowing.py placement_engine.py
+
+import argparse
+import ast
+import sys
+from pathlib import Path
+
+PLUGIN_DIR = Path(__file__).resolve().parent.parent
+
+def module_names(tree: ast.Module) -> set[str]:
+    """Functions, classes and imports defined at the top of a module (not its constants)."""
+    names: set[str] = set()
+    for statement in tree.body:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(statement.name)
+        elif isinstance(statement, (ast.Import, ast.ImportFrom)):
+            for alias in statement.names:
+                if alias.name != "*":
+                    names.add((alias.asname or alias.name).split(".")[0])
+    return names
+
+def _local_names(function: ast.FunctionDef | ast.AsyncFunctionDef):
+    """Yields (name, line) for everything a function binds itself, not counting nested functions,
+    classes, lambdas or comprehensions since they're scopes of their own."""
+    arguments = function.args
+    for argument in [*arguments.posonlyargs, *arguments.args, *arguments.kwonlyargs, arguments.vararg, arguments.kwarg]:
+        if argument is not None:
+            yield argument.arg, argument.lineno
+
+    def visit(node: ast.AST):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                yield child.name, child.lineno
+                continue
+            if isinstance(child, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+                continue
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                yield child.id, child.lineno
+            elif isinstance(child, ast.ExceptHandler) and child.name:
+                yield child.name, child.lineno
+            elif isinstance(child, (ast.Import, ast.ImportFrom)):
+                for alias in child.names:
+                    yield (alias.asname or alias.name).split(".")[0], child.lineno
+            yield from visit(child)
+
+    for statement in function.body:
+        yield from visit(ast.Module(body=[statement], type_ignores=[]))
+
+def check_file(path: Path) -> list[str]:
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    shadowable = module_names(tree)
+    problems: list[str] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        reported: set[str] = set()
+        for name, line in _local_names(node):
+            if name in shadowable and name not in reported:
+                reported.add(name)
+                problems.append(f"{path.name}:{line}: {name} in {node.name}() hides the module's {name}")
+    return problems
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Find parameters and locals which hide a function, class or import from their module.")
+    parser.add_argument("files", nargs="*", type=Path, help="Files to check (default: every .py file in the plugin)")
+    args = parser.parse_args()
+
+    files = args.files or sorted(PLUGIN_DIR.glob("*.py"))
+    problems = [problem for path in files for problem in check_file(path)]
+    for problem in problems:
+        print(problem)
+    if problems:
+        print(f"{len(problems)} shadowed names found", file=sys.stderr)
+        return 1
+    print(f"No shadowed names in {len(files)} files")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
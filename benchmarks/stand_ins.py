@@ -0,0 +1,259 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Just enough of Uranium and Cura for the plugin's geometry code to run outside of Cura.
+# Vector, Polygon, MeshBuilder and MeshData do the real maths (close enough to Uranium's to be
+# representative), everything else is a placeholder that quietly accepts whatever's done to it.
+# Only for benchmarking - none of this gets shipped with the plugin.
+
+import importlib.abc
+import importlib.machinery
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+
+PLUGIN_DIR = Path(__file__).resolve().parent.parent
+PLUGIN_PACKAGE = "spoonawreborn"
+
+class _StandInMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StandIn
+
+class StandIn(metaclass=_StandInMeta):
+    """Placeholder for anything from Cura that the benchmarks don't actually use."""
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StandIn()
+
+    def __call__(self, *args, **kwargs):
+        return StandIn()
+
+    def __iter__(self):
+        return iter(())
+
+class Vector:
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> None:
+        self._data = np.array([x, y, z], dtype=np.float64)
+
+    @property
+    def x(self) -> float:
+        return float(self._data[0])
+
+    @property
+    def y(self) -> float:
+        return float(self._data[1])
+
+    @property
+    def z(self) -> float:
+        return float(self._data[2])
+
+    def length(self) -> float:
+        return float(np.linalg.norm(self._data))
+
+    def __add__(self, other: "Vector") -> "Vector":
+        return Vector(*(self._data + other._data))
+
+    def __sub__(self, other: "Vector") -> "Vector":
+        return Vector(*(self._data - other._data))
+
+    def __repr__(self) -> str:
+        return f"Vector({self.x}, {self.y}, {self.z})"
+
+class Polygon:
+    def __init__(self, points=None) -> None:
+        self._points = None if points is None else np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+    def getPoints(self) -> np.ndarray:
+        return self._points
+
+    def isValid(self) -> bool:
+        return self._points is not None and len(self._points) >= 3
+
+    def getMinkowskiHull(self, other: "Polygon") -> "Polygon":
+        from scipy.spatial import ConvexHull
+        sums = (self._points[:, None, :] + other.getPoints()[None, :, :]).reshape(-1, 2)
+        return Polygon(sums[ConvexHull(sums).vertices])
+
+    def scale(self, factor: float, origin=None) -> "Polygon":
+        origin = np.zeros(2) if origin is None else np.asarray(origin, dtype=np.float64)
+        return Polygon((self._points - origin) * factor + origin)
+
+class MeshData:
+    def __init__(self, vertices=None, normals=None, indices=None, colors=None, **kwargs) -> None:
+        self._vertices = vertices
+        self._normals = normals
+        self._indices = indices
+        self._colors = colors
+
+    def getVertices(self) -> np.ndarray:
+        return self._vertices
+
+    def getIndices(self) -> np.ndarray:
+        return self._indices
+
+    def getVertexCount(self) -> int:
+        return 0 if self._vertices is None else len(self._vertices)
+
+def calculateNormalsFromIndexedVertices(vertices: np.ndarray, indices: np.ndarray, face_count: int) -> np.ndarray:
+    triangles = vertices[indices]
+    face_normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(face_normals, axis=1, keepdims=True)
+    face_normals = face_normals / np.where(lengths == 0, 1, lengths)
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        np.add.at(normals, indices[:, corner], face_normals)
+    return normals
+
+class MeshBuilder:
+    def __init__(self) -> None:
+        self._vertices = None
+        self._indices = None
+        self._normals = None
+        self._colors = None
+
+    def setVertices(self, vertices: np.ndarray) -> None:
+        self._vertices = vertices
+
+    def setIndices(self, indices: np.ndarray) -> None:
+        self._indices = indices
+
+    def setColors(self, colors: np.ndarray) -> None:
+        self._colors = colors
+
+    def getVertices(self) -> np.ndarray:
+        return self._vertices
+
+    def getIndices(self) -> np.ndarray:
+        return self._indices
+
+    def calculateNormals(self, fast: bool = False) -> None:
+        self._normals = calculateNormalsFromIndexedVertices(self._vertices, self._indices, len(self._indices))
+
+    def build(self) -> MeshData:
+        return MeshData(vertices=self._vertices, normals=self._normals, indices=self._indices, colors=self._colors)
+
+class Logger:
+    @staticmethod
+    def log(level: str, message: str) -> None:
+        pass
+
+# Modules which need to do something real. Anything else under these prefixes is all placeholders.
+_REAL_STAND_INS = {
+    "UM.Math.Vector": {"Vector": Vector},
+    "UM.Math.Polygon": {"Polygon": Polygon},
+    "UM.Mesh.MeshData": {"MeshData": MeshData, "calculateNormalsFromIndexedVertices": calculateNormalsFromIndexedVertices},
+    "UM.Mesh.MeshBuilder": {"MeshBuilder": MeshBuilder},
+    "UM.Logger": {"Logger": Logger},
+}
+_STAND_IN_PREFIXES = ("UM", "cura", "PyQt6")
+
+def _placeholder_attribute(name: str):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return StandIn
+
+class _StandInFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname.split(".")[0] not in _STAND_IN_PREFIXES:
+            return None
+        return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+
+    def create_module(self, spec):
+        module = types.ModuleType(spec.name)
+        module.__path__ = []
+        module.__getattr__ = _placeholder_attribute
+        module.__dict__.update(_REAL_STAND_INS.get(spec.name, {}))
+        return module
+
+    def exec_module(self, module) -> None:
+        pass
+
+def install() -> None:
+    """Makes UM, cura and PyQt6 importable with stand-ins."""
+    if not any(isinstance(finder, _StandInFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _StandInFinder())
+
+def load_plugin_module(name: str) -> types.ModuleType:
+    """Imports a module from the plugin as part of a package, without running the plugin's __init__."""
+    install()
+    if PLUGIN_PACKAGE not in sys.modules:
+        package = types.ModuleType(PLUGIN_PACKAGE)
+        package.__path__ = [str(PLUGIN_DIR)]
+        package.__spec__ = importlib.machinery.ModuleSpec(PLUGIN_PACKAGE, None, is_package=True)
+        package.__spec__.submodule_search_locations = [str(PLUGIN_DIR)]
+        sys.modules[PLUGIN_PACKAGE] = package
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+class Signal:
+    def connect(self, receiver) -> None:
+        pass
+
+    def disconnect(self, receiver) -> None:
+        pass
+
+class Matrix:
+    def __init__(self, data: np.ndarray) -> None:
+        self._data = data
+
+    def getData(self) -> np.ndarray:
+        return self._data
+
+class Node:
+    """Stands in for a CuraSceneNode holding a mesh."""
+    def __init__(self, name: str, vertices: np.ndarray, indices: np.ndarray, transformation: np.ndarray = None) -> None:
+        self._name = name
+        self._mesh_data = MeshData(vertices=vertices, indices=indices)
+        self._transformation = Matrix(np.eye(4) if transformation is None else transformation)
+        self._hull = None
+        self.transformationChanged = Signal()
+        self.meshDataChanged = Signal()
+
+    def getName(self) -> str:
+        return self._name
+
+    def getMeshData(self) -> MeshData:
+        return self._mesh_data
+
+    def getWorldTransformation(self) -> Matrix:
+        return self._transformation
+
+    def getConvexHull(self) -> Polygon:
+        """2D convex hull of the whole mesh, like Cura's ConvexHullDecorator."""
+        if self._hull is None:
+            from scipy.spatial import ConvexHull
+            data = self._transformation.getData()
+            points = (self._mesh_data.getVertices() @ data[:3, :3].T + data[:3, 3])[:, [0, 2]]
+            self._hull = Polygon(points[ConvexHull(points).vertices])
+        return self._hull
+
+    def callDecoration(self, name: str, *args):
+        match name:
+            case "isSliceable":
+                return True
+            case "getConvexHull" | "getConvexHullBoundary":
+                return self.getConvexHull()
+            case _:
+                return None
+
+def make_tool(module: types.ModuleType, spoon_diameter: float = 10.0, handle_length: float = 2.0, handle_width: float = 2.0):
+    """Makes the tool without running its __init__, which needs Cura, and sets up what the geometry code uses."""
+    import weakref
+    tool = object.__new__(module.SpoonAntiWarpingReborn)
+    tool._spoon_diameter = spoon_diameter
+    tool._handle_length = handle_length
+    tool._handle_width = handle_width
+    tool._layer_count = 1
+    tool._teardrop_shape = False
+    tool._default_reference_distance = 5
+    tool._outline_tolerance_nozzles = 0.0  # No extruder stacks to get the nozzle size from
+    tool._footprint_cache = weakref.WeakKeyDictionary()
+    tool._stage_timer = load_plugin_module("stage_timing").StageTimer()
+    return tool
@@ -0,0 +1,55 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Writes test G-code of (roughly) whatever size is asked for, laid out like Cura's with a few
+# objects and a spoon on each layer. It's written a layer at a time so it can be bigger than memory.
+
+from pathlib import Path
+
+HEADER = ";FLAVOR:Marlin\n;Generated with Cura_SteamEngine 5.8\nM82\nT0\nG28\nG92 E0\n"
+FOOTER = "M104 S0\nM140 S0\n;End of Gcode\n"
+
+def _section(mesh: str, x: float, y: float, lines: int, e: float) -> tuple[str, float]:
+    """One object's part of a layer: a travel, a square spiral of extrusions, then a retract."""
+    out = [f"G0 F9000 X{x:.3f} Y{y:.3f}", ";TYPE:WALL-OUTER", f";MESH:{mesh}", f"G1 F2700 E{e:.5f}"]
+    for line in range(lines):
+        e += 0.05
+        side = line % 4
+        out.append(f"G1 F1500 X{x + (5 if side in (1, 2) else 0) + line * 0.001:.3f} Y{y + (5 if side >= 2 else 0):.3f} E{e:.5f}")
+    out.append(f"G1 F2700 E{e - 6.5:.5f}")
+    return "\n".join(out) + "\n", e
+
+def write_gcode(path: Path, size_bytes: int, objects: int = 3, lines_per_section: int = 200,
+                spoon_layers: int | None = None, in_order_every: int = 4) -> int:
+    """Writes the G-code and returns how many layers it has.
+
+    Args:
+        path (Path): Where to write it.
+        size_bytes (int): Keeps adding layers until it's at least this big.
+        objects (int): Objects on each layer, not counting the spoon.
+        lines_per_section (int): Extrusion lines in each object's part of a layer.
+        spoon_layers (int | None): How many layers have a spoon. None for every layer, which is the worst case.
+        in_order_every (int): Every this many layers has the spoon printed first already. 0 for never.
+    """
+    layer_index = 0
+    written = 0
+    e = 0.0
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        written += file.write(HEADER)
+        while written < size_bytes:
+            sections: list[str] = []
+            for index in range(objects):
+                section, e = _section(f"part_{index}.stl", 20.0 + index * 30, 20.0, lines_per_section, e)
+                sections.append(section)
+            if spoon_layers is None or layer_index < spoon_layers:
+                spoon, e = _section("<SpoonTab:0001>", 10.0, 60.0, max(4, lines_per_section // 10), e)
+                if in_order_every and layer_index % in_order_every == 0:
+                    sections.insert(0, spoon)
+                else:
+                    sections.append(spoon)
+            z = 0.3 + layer_index * 0.2
+            written += file.write(f";LAYER:{layer_index}\nG0 F6000 X0 Y0 Z{z:.2f}\n" + "".join(sections)
+                                  + f";MESH:NONMESH\nG0 F9000 X0 Y0\n;TIME_ELAPSED:{layer_index * 10}\n")
+            layer_index += 1
+        file.write(FOOTER)
+    return layer_index
@@ -0,0 +1,109 @@
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Makes test meshes of (roughly) whatever triangle count is asked for.
+# Everything is Y-up like Cura, sitting on Y = 0, as (vertices float32 (n, 3), indices int32 (m, 3)).
+
+import math
+
+import numpy as np
+
+def _revolve(profile: np.ndarray, segments: int) -> tuple[np.ndarray, np.ndarray]:
+    """Spins a (radius, y) profile around the Y axis and caps the ends.
+    Gives 2 * segments * (len(profile) - 1) + 2 * segments triangles."""
+    rings = len(profile)
+    angles = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+    ring_x = profile[:, 0, None] * np.cos(angles)[None, :]
+    ring_z = profile[:, 0, None] * np.sin(angles)[None, :]
+    ring_y = np.broadcast_to(profile[:, 1, None], ring_x.shape)
+    vertices = np.stack([ring_x, ring_y, ring_z], axis=-1).reshape(-1, 3)
+
+    ring = np.arange(segments)
+    next_ring = (ring + 1) % segments
+    faces = []
+    for level in range(rings - 1):
+        lower = level * segments
+        upper = (level + 1) * segments
+        faces.append(np.stack([lower + ring, upper + ring, lower + next_ring], axis=1))
+        faces.append(np.stack([lower + next_ring, upper + ring, upper + next_ring], axis=1))
+
+    # Fan each end around a center point
+    bottom_center = len(vertices)
+    top_center = bottom_center + 1
+    vertices = np.vstack([vertices, [[0, profile[0, 1], 0], [0, profile[-1, 1], 0]]])
+    faces.append(np.stack([np.full(segments, bottom_center), ring, next_ring], axis=1))
+    top = (rings - 1) * segments
+    faces.append(np.stack([np.full(segments, top_center), top + next_ring, top + ring], axis=1))
+    return vertices.astype(np.float32), np.vstack(faces).astype(np.int32)
+
+def _revolved_size(triangles: int) -> tuple[int, int]:
+    """Segments and rings so a revolved mesh has about the right number of triangles."""
+    segments = max(8, int(math.sqrt(triangles / 2)))
+    rings = max(2, round(triangles / (2 * segments)))
+    return segments, rings
+
+def cylinder(triangles: int, radius: float = 20.0, height: float = 30.0) -> tuple[np.ndarray, np.ndarray]:
+    segments, rings = _revolved_size(triangles)
+    profile = np.stack([np.full(rings, radius), np.linspace(0, height, rings)], axis=1)
+    return _revolve(profile, segments)
+
+def chamfered_base(triangles: int, radius: float = 20.0, height: float = 30.0, chamfer: float = 3.0) -> tuple[np.ndarray, np.ndarray]:
+    """Cylinder with a 45 degree chamfer around the bottom, so the base is smaller than the outline."""
+    segments, rings = _revolved_size(triangles)
+    heights = np.linspace(0, height, rings)
+    radii = radius - np.clip(chamfer - heights, 0, None)
+    return _revolve(np.stack([radii, heights], axis=1), segments)
+
+def box(triangles: int, size: float = 40.0) -> tuple[np.ndarray, np.ndarray]:
+    """Cube with each face split into a grid. Gives 12 * divisions^2 triangles."""
+    divisions = max(1, int(math.sqrt(triangles / 12)))
+    steps = np.linspace(-size / 2, size / 2, divisions + 1)
+    u, v = np.meshgrid(steps, steps, indexing="ij")
+    u = u.ravel()
+    v = v.ravel()
+    cell = np.arange(divisions)
+    corner = (cell[:, None] * (divisions + 1) + cell[None, :]).ravel()
+    quads = np.stack([corner, corner + divisions + 1, corner + divisions + 2, corner + 1], axis=1)
+    face_indices = np.vstack([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+    half = np.full_like(u, size / 2)
+    faces = [  # Each side of the cube as (x, y, z) in terms of the grid
+        (u, -half, v), (u, half, v),
+        (-half, u, v), (half, u, v),
+        (u, v, -half), (u, v, half),
+    ]
+    vertices = []
+    indices = []
+    for i, (x, y, z) in enumerate(faces):
+        vertices.append(np.stack([x, y, z], axis=1))
+        indices.append(face_indices + i * len(u))
+    vertices = np.vstack(vertices)
+    vertices[:, 1] += size / 2  # Sit it on the build plate
+    return vertices.astype(np.float32), np.vstack(indices).astype(np.int32)
+
+def multi_island_plate(triangles: int, islands: int = 9, spacing: float = 30.0) -> tuple[np.ndarray, np.ndarray]:
+    """A grid of separate cylinders joined by a raised plate, like a part with feet.
+    Only the feet touch the build plate, so each one is its own area."""
+    per_island = max(64, triangles // (islands + 1))
+    side = math.ceil(math.sqrt(islands))
+    vertices = []
+    indices = []
+    offset = 0
+    for island in range(islands):
+        foot_vertices, foot_indices = cylinder(per_island, radius=spacing / 4, height=10.0)
+        foot_vertices = foot_vertices + [(island % side) * spacing, 0, (island // side) * spacing]
+        vertices.append(foot_vertices)
+        indices.append(foot_indices + offset)
+        offset += len(foot_vertices)
+    plate_vertices, plate_indices = box(per_island, size=side * spacing)
+    plate_vertices = plate_vertices * [1, 0.1, 1] + [(side - 1) * spacing / 2, 10.0, (side - 1) * spacing / 2]
+    vertices.append(plate_vertices.astype(np.float32))
+    indices.append(plate_indices + offset)
+    return np.vstack(vertices).astype(np.float32), np.vstack(indices).astype(np.int32)
+
+SHAPES = {
+    "box": box,
+    "cylinder": cylinder,
+    "chamfered_base": chamfered_base,
+    "multi_island_plate": multi_island_plate,
+}
@@ -0,0 +1,68 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Bits the command line tools share: loading the plugin's modules without Cura,
+# finding the files to work on and spreading them over worker processes.
+# Cura never imports this, it's only for running things from the plugin's folder.
+#--------------------------------------------------------------------------------------------------
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import importlib
+import importlib.machinery
+import logging
+from pathlib import Path
+import sys
+import types
+from typing import Any, Callable, Iterator
+
+PLUGIN_DIR = Path(__file__).resolve().parent
+PLUGIN_PACKAGE = "spoonawreborn"
+
+def load_plugin_module(name: str) -> types.ModuleType:
+    """Imports a module from the plugin as part of a package, without running the plugin's __init__ (which needs Cura)."""
+    if PLUGIN_PACKAGE not in sys.modules:
+        package = types.ModuleType(PLUGIN_PACKAGE)
+        package.__path__ = [str(PLUGIN_DIR)]
+        package.__spec__ = importlib.machinery.ModuleSpec(PLUGIN_PACKAGE, None, is_package=True)
+        package.__spec__.submodule_search_locations = [str(PLUGIN_DIR)]
+        sys.modules[PLUGIN_PACKAGE] = package
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+def gather_files(paths: list[Path], extensions: tuple[str, ...], recursive: bool, skip_suffix: str = "") -> list[Path]:
+    """Finds the files to process. Files in folders whose names end with skip_suffix are left out
+    so running a tool on the same folder again doesn't pick up what it wrote last time."""
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.glob("*")
+            files.extend(sorted(file for file in candidates
+                                if file.is_file() and file.suffix.lower() in extensions
+                                and not (skip_suffix and file.stem.endswith(skip_suffix))))
+        else:
+            files.append(path)
+    # The same file could be given twice (e.g. it and its folder)
+    return list(dict.fromkeys(file.resolve() for file in files))
+
+def output_path(source: Path, output_dir: Path | None, in_place: bool, suffix: str, extension: str | None = None) -> Path:
+    extension = extension if extension is not None else source.suffix
+    if in_place:
+        return source.with_suffix(extension)
+    name = f"{source.stem}{suffix}{extension}"
+    return (output_dir / name) if output_dir is not None else source.with_name(name)
+
+def setup_logging(log_level: int) -> None:
+    logging.basicConfig(level=log_level, format="%(levelname)s %(processName)s: %(message)s")
+
+def run_jobs(function: Callable[..., Any], jobs: list[tuple], workers: int, log_level: int) -> Iterator[Any]:
+    """Runs function on each job's arguments, in worker processes if there's more than one worker.
+    Results come back in whatever order they finish."""
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        # Not worth starting processes for
+        for job in jobs:
+            yield function(*job)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=setup_logging, initargs=(log_level,)) as executor:
+        futures = [executor.submit(function, *job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
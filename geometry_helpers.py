@@ -0,0 +1,552 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Geometry helpers for automatic spoon placement.
+# Everything in here works on plain NumPy arrays so none of it needs Cura to be running.
+# trimesh and scipy take a while to import, so they only get imported when they're first needed.
+#--------------------------------------------------------------------------------------------------
+import math
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from scipy.spatial import cKDTree
+
+def warm_up_imports() -> float:
+    """Imports the heavy geometry libraries so the first automatic placement doesn't have to wait for them.
+    Safe to call from a background thread.
+
+    Returns:
+        float: How long it took in seconds (next to nothing if they were already imported).
+    """
+    start = time.perf_counter()
+    import trimesh  # noqa: F401
+    from scipy.spatial import ConvexHull, cKDTree  # noqa: F401
+    return time.perf_counter() - start
+
+def base_band_triangles(vertices: np.ndarray, indices: np.ndarray | None, transformation: np.ndarray,
+                        height: float) -> tuple[np.ndarray, float]:
+    """Finds the triangles of a mesh which cross a horizontal plane just above its lowest point.
+
+    Only the Y coordinates of the whole mesh get transformed, so the expensive part
+    scales with the size of the band instead of the size of the mesh.
+
+    Args:
+        vertices (np.ndarray): Untransformed vertices of the mesh, shape (n, 3).
+        indices (np.ndarray | None): Triangle indices, shape (m, 3). None if every three vertices make a triangle.
+        transformation (np.ndarray): 4x4 world transformation matrix of the mesh.
+        height (float): How far above the lowest point of the mesh the plane is.
+
+    Returns:
+        tuple[np.ndarray, float]: The world space triangles crossing the plane, shape (k, 3, 3),
+        and the Y coordinate of the plane.
+    """
+    if indices is None:
+        # Some file formats (eg 3mf) don't supply indices, but have unique vertices per face
+        indices = np.arange(len(vertices) - len(vertices) % 3).reshape(-1, 3)
+
+    world_y = vertices @ transformation[1, :3] + transformation[1, 3]
+    slice_y = float(world_y.min()) + height
+
+    triangle_y = world_y[indices]
+    crosses_plane = (triangle_y.min(axis=1) <= slice_y) & (triangle_y.max(axis=1) >= slice_y)
+
+    triangles = vertices[indices[crosses_plane]].astype(np.float64)
+    triangles = triangles @ transformation[:3, :3].T + transformation[:3, 3]
+    return triangles, slice_y
+
+def simplify_outline(points: np.ndarray, tolerance: float, closed: bool = True) -> np.ndarray:
+    """Douglas-Peucker simplification: drops points which are within tolerance of the line between the ones kept.
+
+    Scanned and organic models can have outlines with tens of thousands of points a fraction of a
+    nozzle apart, and nothing needs that much detail.
+
+    Args:
+        points (np.ndarray): Points of the outline in order, shape (n, 2).
+        tolerance (float): Furthest any of the original outline can be from the simplified one. 0 leaves it alone.
+        closed (bool): Whether the last point joins back up to the first one.
+
+    Returns:
+        np.ndarray: The points kept, in order, shape (m, 2).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if closed and len(points) > 1 and np.array_equal(points[0], points[-1]):
+        points = points[:-1]
+    if tolerance <= 0 or len(points) < 3:
+        return points
+
+    if closed:
+        # Split it at the point furthest from the first one so both halves are open lines
+        furthest = int(np.argmax(np.einsum("ij,ij->i", points - points[0], points - points[0])))
+        if furthest == 0:
+            return points[:1]
+        path = np.concatenate((points, points[:1]))
+        spans = [(0, furthest), (furthest, len(path) - 1)]
+    else:
+        path = points
+        spans = [(0, len(path) - 1)]
+    keep = np.zeros(len(path), dtype=bool)
+    keep[[start for start, _ in spans] + [-1]] = True
+
+    while spans:
+        start, end = spans.pop()
+        if end - start < 2:
+            continue
+        offsets = path[start + 1:end] - path[start]
+        line = path[end] - path[start]
+        line_length = math.hypot(line[0], line[1])
+        if line_length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(offsets[:, 0] * line[1] - offsets[:, 1] * line[0]) / line_length
+        furthest = int(np.argmax(distances))
+        if distances[furthest] > tolerance:
+            split = start + 1 + furthest
+            keep[split] = True
+            spans.append((start, split))
+            spans.append((split, end))
+
+    simplified = path[keep]
+    return simplified[:-1] if closed else simplified
+
+def base_footprint(vertices: np.ndarray, indices: np.ndarray | None, transformation: np.ndarray,
+                   height: float = 0.05, simplify_tolerance: float = 0.0) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """Slices a mesh just above its lowest point and finds the outlines and convex hulls of what's there.
+
+    Doesn't touch the mesh or anything else Cura owns, so it's safe to run off the main thread.
+
+    Args:
+        vertices (np.ndarray): Untransformed vertices of the mesh, shape (n, 3).
+        indices (np.ndarray | None): Triangle indices, shape (m, 3). None if every three vertices make a triangle.
+        transformation (np.ndarray): 4x4 world transformation matrix of the mesh.
+        height (float): How far above the lowest point of the mesh to slice it.
+        simplify_tolerance (float): Outlines get simplified to within this distance before anything else
+            is done with them, see simplify_outline(). 0 keeps every point.
+
+    Returns:
+        tuple[list[np.ndarray], list[np.ndarray]]: The (x, z) outline of each area on the build plate
+        and the vertices of its convex hull.
+    """
+    import trimesh
+    from scipy.spatial import ConvexHull
+
+    contours: list[np.ndarray] = []
+    hulls: list[np.ndarray] = []
+
+    # Only the triangles crossing the slice plane matter, so don't build a trimesh out of the rest
+    band_triangles, slice_y = base_band_triangles(vertices, indices, transformation, height)
+    if len(band_triangles) == 0:
+        return contours, hulls
+    trimesh_mesh = trimesh.base.Trimesh(vertices=band_triangles.reshape(-1, 3),
+                                        faces=np.arange(len(band_triangles) * 3).reshape(-1, 3))
+
+    plane_origin = np.array([0, slice_y, 0])
+    plane_normal = np.array([0, 1, 0])
+
+    def add_outline(vertices_2d: np.ndarray, ordered: bool) -> None:
+        if ordered and simplify_tolerance > 0:
+            simplified = simplify_outline(vertices_2d, simplify_tolerance)
+            if len(simplified) >= 3:  # Anything smaller than the tolerance is better off as it was
+                vertices_2d = simplified
+        if vertices_2d.shape[0] >= 3:
+            hull = ConvexHull(vertices_2d)
+            contours.append(vertices_2d)
+            hulls.append(vertices_2d[hull.vertices])
+
+    section = trimesh_mesh.section(plane_normal=plane_normal, plane_origin=plane_origin)
+    if section is not None:
+        if hasattr(section, 'discrete'):  # It's a Path3D (series of contours)
+            for contour in section.discrete:
+                add_outline(np.asarray(contour, dtype=np.float64)[:, [0, 2]], True)
+        elif hasattr(section, 'vertices'): # It's a Trimesh (intersection is a face)
+            add_outline(section.vertices[:, [0, 2]], False)  # Not in any order, so only good for the hull
+    return contours, hulls
+
+def nearest_point_angles(tree: "cKDTree", positions: np.ndarray) -> np.ndarray:
+    """Works out the angle for spoons at each position so they point away from the nearest reference point.
+
+    Args:
+        tree (scipy.spatial.cKDTree): KD-tree of the (x, z) reference points.
+        positions (np.ndarray): (x, z) positions of the spoons, shape (n, 2).
+
+    Returns:
+        np.ndarray: The angle (in radians) for each spoon, shape (n,). Spoons without any
+        reference point other than one sitting exactly on them get an angle of 0.
+    """
+    positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+    angles = np.zeros(len(positions))
+    if tree.n == 0 or len(positions) == 0:
+        return angles
+
+    # A reference point right on top of the spoon doesn't give it a direction, so get the next one as well.
+    neighbour_count = min(2, tree.n)
+    distances, neighbours = tree.query(positions, k=neighbour_count)
+    distances = distances.reshape(len(positions), neighbour_count)
+    neighbours = neighbours.reshape(len(positions), neighbour_count)
+
+    use_second = distances[:, 0] == 0
+    chosen = np.where(use_second, neighbours[:, -1], neighbours[:, 0])
+    chosen_distance = np.where(use_second, distances[:, -1], distances[:, 0])
+
+    # Duplicate reference points could still leave us on top of one, so do those the slow way.
+    for row in np.flatnonzero(chosen_distance == 0):
+        all_distances = np.linalg.norm(tree.data - positions[row], axis=1)
+        all_distances[all_distances == 0] = np.inf
+        chosen[row] = np.argmin(all_distances)
+        chosen_distance[row] = all_distances[chosen[row]]
+
+    valid = np.isfinite(chosen_distance) & (chosen_distance > 0)
+    difference = positions[valid] - tree.data[chosen[valid]]
+    length = chosen_distance[valid]
+    calculated_angle = np.arcsin(np.clip(difference[:, 1] / length, -1.0, 1.0))
+    angles[valid] = np.where(difference[:, 0] >= 0, math.pi + calculated_angle, -calculated_angle)
+    return angles
+
+def flat_motion(old_transformation: np.ndarray, new_transformation: np.ndarray, tolerance: float = 1e-5) -> np.ndarray | None:
+    """Checks whether going from one world transformation to another keeps whatever's flat on the build plate flat,
+    so its outline on the plate only gets moved, turned, mirrored or scaled.
+
+    Scaling it vertically changes which part of it is just above the plate a tiny bit, but outlines are taken
+    so close to the bottom that it doesn't make any difference.
+
+    Returns:
+        np.ndarray | None: The 4x4 matrix which takes the old transformation to the new one, or None if it tilts.
+    """
+    try:
+        motion = np.asarray(new_transformation, dtype=np.float64) @ np.linalg.inv(np.asarray(old_transformation, dtype=np.float64))
+    except np.linalg.LinAlgError:
+        return None
+    if motion[1, 1] <= tolerance or np.any(np.abs(motion[[0, 2, 1, 1], [1, 1, 0, 2]]) > tolerance):
+        return None
+    return motion
+
+def flat_rigid_motion(old_transformation: np.ndarray, new_transformation: np.ndarray, tolerance: float = 1e-5) -> np.ndarray | None:
+    """Checks whether going from one world transformation to another only slides something around on the
+    build plate, turns it around the vertical axis or mirrors it, so anything flat on the plate stays flat and the same size.
+
+    Returns:
+        np.ndarray | None: The 4x4 matrix which takes the old transformation to the new one, or None if it
+        does anything else (tilts, scales, lifts etc.).
+    """
+    motion = flat_motion(old_transformation, new_transformation, tolerance)
+    if (motion is None
+        or abs(motion[1, 1] - 1.0) > tolerance
+        or abs(motion[1, 3]) > 1e-3):  # Lifting it by a micron is close enough to not moving
+        return None
+    flat = motion[np.ix_([0, 2], [0, 2])]
+    if not np.allclose(flat @ flat.T, np.eye(2), atol=tolerance):
+        return None
+    return motion
+
+def move_flat_points(points: np.ndarray, motion: np.ndarray) -> np.ndarray:
+    """Applies a motion from flat_motion() or flat_rigid_motion() to (x, z) points, shape (n, 2)."""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return points @ motion[np.ix_([0, 2], [0, 2])].T + motion[[0, 2], 3]
+
+def nearest_point_on_outline(outline: np.ndarray, point: tuple[float, float]) -> tuple[np.ndarray, float]:
+    """Finds the closest point to point on the edges of a closed polygon.
+
+    Returns:
+        tuple[np.ndarray, float]: The (x, z) point and how far away it is.
+    """
+    starts = np.asarray(outline, dtype=np.float64).reshape(-1, 2)
+    ends = np.roll(starts, -1, axis=0)
+    edges = ends - starts
+    edge_length_squared = np.einsum("ij,ij->i", edges, edges)
+    offsets = np.asarray(point, dtype=np.float64) - starts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        along = np.clip(np.einsum("ij,ij->i", offsets, edges) / edge_length_squared, 0.0, 1.0)
+    along = np.nan_to_num(along)  # Zero length edges are just a point
+    closest = starts + edges * along[:, None]
+    distances = np.hypot(closest[:, 0] - point[0], closest[:, 1] - point[1])
+    nearest = int(np.argmin(distances))
+    return closest[nearest], float(distances[nearest])
+
+def outermost_hulls(hulls: list[np.ndarray], tolerance: float = 1e-6) -> list[int]:
+    """Finds which convex hulls aren't completely inside another one.
+
+    Hulls are checked from largest to smallest against the hulls already kept, so each
+    one is only ever tested against larger ones. A bounding box check weeds out most
+    pairs before the proper point-in-convex-polygon test. If two hulls are identical,
+    the first one is kept.
+
+    Args:
+        hulls (list[np.ndarray]): Vertices of each convex hull in order, shape (n, 2).
+        tolerance (float): How far outside another hull a point can be and still count as inside,
+            relative to the size of the coordinates (like np.allclose).
+
+    Returns:
+        list[int]: Indices of the hulls which aren't contained in another hull, in their original order.
+    """
+    hull_points = [np.asarray(hull, dtype=np.float64).reshape(-1, 2) for hull in hulls]
+    if len(hull_points) < 2:
+        return list(range(len(hull_points)))
+
+    areas = np.zeros(len(hull_points))
+    for i, points in enumerate(hull_points):
+        if len(points) == 0:
+            continue
+        next_points = np.roll(points, -1, axis=0)
+        signed_area = 0.5 * np.sum(points[:, 0] * next_points[:, 1] - next_points[:, 0] * points[:, 1])
+        if signed_area < 0:
+            # Half-plane test below needs counterclockwise winding
+            hull_points[i] = points = points[::-1]
+        areas[i] = abs(signed_area)
+
+    bounds_min = np.array([points.min(axis=0) if len(points) else (np.inf, np.inf) for points in hull_points])
+    bounds_max = np.array([points.max(axis=0) if len(points) else (-np.inf, -np.inf) for points in hull_points])
+
+    kept: list[int] = []
+    for candidate in np.argsort(-areas, kind="stable"):
+        points = hull_points[candidate]
+        if len(points) == 0:
+            continue
+
+        contained = False
+        if kept:
+            kept_array = np.asarray(kept)
+            scale = tolerance * (1.0 + np.maximum(np.abs(bounds_min[kept_array]), np.abs(bounds_max[kept_array])).max(axis=1))
+            inside_bounds = np.all((bounds_min[kept_array] <= bounds_min[candidate] + scale[:, None])
+                                   & (bounds_max[kept_array] >= bounds_max[candidate] - scale[:, None]), axis=1)
+            for container, allowance in zip(kept_array[inside_bounds], scale[inside_bounds]):
+                container_points = hull_points[container]
+                edge_starts = container_points
+                edges = np.roll(container_points, -1, axis=0) - edge_starts
+                edge_lengths = np.linalg.norm(edges, axis=1)
+                # Cross product of each edge with each candidate point, scaled to a signed distance from the edge
+                offsets = points[None, :, :] - edge_starts[:, None, :]
+                cross = edges[:, None, 0] * offsets[:, :, 1] - edges[:, None, 1] * offsets[:, :, 0]
+                valid_edges = edge_lengths > 0
+                distances = cross[valid_edges] / edge_lengths[valid_edges, None]
+                if np.all(distances >= -allowance):
+                    contained = True
+                    # Identical hulls can come out of the sort either way round depending on rounding, so swap back to the first one
+                    if container > candidate and np.isclose(areas[container], areas[candidate], rtol=tolerance, atol=0.0):
+                        kept[kept.index(container)] = int(candidate)
+                    break
+
+        if not contained:
+            kept.append(int(candidate))
+
+    return sorted(kept)
+
+def world_triangles(vertices: np.ndarray, indices: np.ndarray | None, transformation: np.ndarray) -> np.ndarray:
+    """Every triangle of a mesh in world space, shape (m, 3, 3)."""
+    if indices is None:
+        # Some file formats (eg 3mf) don't supply indices, but have unique vertices per face
+        indices = np.arange(len(vertices) - len(vertices) % 3).reshape(-1, 3)
+    world_vertices = vertices.astype(np.float64) @ transformation[:3, :3].T + transformation[:3, 3]
+    return world_vertices[indices]
+
+class RayMesh:
+    """World space triangles of a mesh, ready for casting rays at.
+
+    The triangles get sorted along a Morton (Z-order) curve so ones next to each other in the
+    list are close together in space, then grouped into small leaves with a bounding box each.
+    That gives a flat two level bounding volume hierarchy: each ray checks the leaf boxes, then
+    the boxes of the triangles in the leaves it passes through, and only does the full
+    Moller-Trumbore test on the triangles left after that.
+    """
+    LEAF_SIZE = 64
+
+    def __init__(self, triangles: np.ndarray) -> None:
+        triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        if len(triangles) > 0:
+            triangles = triangles[np.argsort(_morton_codes(triangles.mean(axis=1)), kind="stable")]
+        self._triangles: np.ndarray = triangles
+        self._bounds_min: np.ndarray = triangles.min(axis=1) if len(triangles) else np.zeros((0, 3))
+        self._bounds_max: np.ndarray = triangles.max(axis=1) if len(triangles) else np.zeros((0, 3))
+
+        leaf_starts = np.arange(0, len(triangles), self.LEAF_SIZE)
+        self._leaf_starts: np.ndarray = leaf_starts
+        self._leaf_min: np.ndarray = np.minimum.reduceat(self._bounds_min, leaf_starts) if len(triangles) else np.zeros((0, 3))
+        self._leaf_max: np.ndarray = np.maximum.reduceat(self._bounds_max, leaf_starts) if len(triangles) else np.zeros((0, 3))
+
+    def __len__(self) -> int:
+        return len(self._triangles)
+
+    def intersect(self, origin: np.ndarray, direction: np.ndarray, epsilon: float = 1e-9) -> float | None:
+        """Finds how far along a ray it first hits the mesh.
+
+        Args:
+            origin (np.ndarray): Start of the ray, shape (3,).
+            direction (np.ndarray): Direction of the ray, shape (3,). Doesn't need to be normalised.
+            epsilon (float): Anything closer to parallel than this counts as a miss.
+
+        Returns:
+            float | None: Distance along the ray (in multiples of direction) of the nearest hit,
+            or None if it doesn't hit.
+        """
+        if len(self._triangles) == 0:
+            return None
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+
+        leaves = np.flatnonzero(_ray_hits_boxes(origin, direction, self._leaf_min, self._leaf_max))
+        if len(leaves) == 0:
+            return None
+        candidates = (self._leaf_starts[leaves, None] + np.arange(self.LEAF_SIZE)).ravel()
+        candidates = candidates[candidates < len(self._triangles)]
+        candidates = candidates[_ray_hits_boxes(origin, direction, self._bounds_min[candidates], self._bounds_max[candidates])]
+        if len(candidates) == 0:
+            return None
+
+        triangles = self._triangles[candidates]
+        edge_1 = triangles[:, 1] - triangles[:, 0]
+        edge_2 = triangles[:, 2] - triangles[:, 0]
+        p = np.cross(direction, edge_2)
+        determinant = np.einsum("ij,ij->i", edge_1, p)
+        not_parallel = np.abs(determinant) > epsilon
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse_determinant = 1.0 / determinant
+            t_vector = origin - triangles[:, 0]
+            u = np.einsum("ij,ij->i", t_vector, p) * inverse_determinant
+            q = np.cross(t_vector, edge_1)
+            v = (q @ direction) * inverse_determinant
+            distance = np.einsum("ij,ij->i", edge_2, q) * inverse_determinant
+        hits = not_parallel & (u >= 0) & (v >= 0) & (u + v <= 1) & (distance > epsilon)
+        if not np.any(hits):
+            return None
+        return float(distance[hits].min())
+
+def _ray_hits_boxes(origin: np.ndarray, direction: np.ndarray, bounds_min: np.ndarray, bounds_max: np.ndarray) -> np.ndarray:
+    """Slab test of a ray against a batch of axis aligned boxes. Returns a bool for each box."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = 1.0 / direction
+        near = (bounds_min - origin) * inverse
+        far = (bounds_max - origin) * inverse
+    # Axes the ray is parallel to give nan when the ray is right on a box's edge, which counts as inside
+    entry = np.nanmax(np.minimum(near, far), axis=1)
+    exit = np.nanmin(np.maximum(near, far), axis=1)
+    return (entry <= exit) & (exit >= 0)
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """Position of each point along a Z-order curve through their bounding box, 10 bits per axis."""
+    low = points.min(axis=0)
+    size = np.maximum(points.max(axis=0) - low, 1e-12)
+    quantised = np.clip(((points - low) / size * 1023).astype(np.uint64), 0, 1023)
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for axis in range(3):
+        # Spread the bits out so there's room to interleave the other two axes
+        spread = quantised[:, axis]
+        spread = (spread | (spread << np.uint64(16))) & np.uint64(0x030000FF)
+        spread = (spread | (spread << np.uint64(8))) & np.uint64(0x0300F00F)
+        spread = (spread | (spread << np.uint64(4))) & np.uint64(0x030C30C3)
+        spread = (spread | (spread << np.uint64(2))) & np.uint64(0x09249249)
+        codes |= spread << np.uint64(axis)
+    return codes
+
+class SpatialGrid:
+    """Uniform grid of circles and polygons on the build plate for quick "does this overlap anything" checks.
+
+    Each item goes in every cell its bounding box touches, so a query only has to look at the
+    handful of items near it no matter how many there are. Items are looked up by whatever key
+    they were inserted with, which makes moving or removing one cheap as well.
+    """
+    def __init__(self, cell_size: float) -> None:
+        if cell_size <= 0:
+            raise ValueError(f"SpatialGrid cell size must be positive, not {cell_size}")
+        self._cell_size: float = float(cell_size)
+        self._cells: dict[tuple[int, int], set] = {}
+        # key -> (cells it's in, circle (x, z, radius) or None, polygon points or None)
+        self._items: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def keys(self) -> list:
+        return list(self._items)
+
+    def insert_circle(self, key, center: tuple[float, float], radius: float) -> None:
+        """Adds (or moves) a circle. Center is (x, z)."""
+        x, z = float(center[0]), float(center[1])
+        radius = float(radius)
+        self._insert(key, (x - radius, z - radius, x + radius, z + radius), (x, z, radius), None)
+
+    def insert_polygon(self, key, points: np.ndarray) -> None:
+        """Adds (or moves) a polygon with vertices in order, shape (n, 2)."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) == 0:
+            self.remove(key)
+            return
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        self._insert(key, (low[0], low[1], high[0], high[1]), None, points)
+
+    def remove(self, key) -> None:
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        for cell in item[0]:
+            occupants = self._cells.get(cell)
+            if occupants is not None:
+                occupants.discard(key)
+                if not occupants:
+                    del self._cells[cell]
+
+    def circle_collision(self, center: tuple[float, float], radius: float, clearance: float = 0.0, ignore=()):
+        """Finds something a circle would overlap (or come closer than clearance to).
+
+        Args:
+            center (tuple[float, float]): (x, z) center of the circle.
+            radius (float): Radius of the circle.
+            clearance (float): Extra gap required between the circle and anything else.
+            ignore: Keys which don't count.
+
+        Returns:
+            The key of the first item it collides with, or None if it's clear.
+        """
+        x, z = float(center[0]), float(center[1])
+        reach = float(radius) + float(clearance)
+        checked: set = set()
+        for cell in self._cells_for((x - reach, z - reach, x + reach, z + reach)):
+            for key in self._cells.get(cell, ()):
+                if key in checked or key in ignore:
+                    continue
+                checked.add(key)
+                _, circle, polygon = self._items[key]
+                if circle is not None:
+                    if math.hypot(circle[0] - x, circle[1] - z) < circle[2] + reach:
+                        return key
+                elif _circle_hits_polygon(x, z, reach, polygon):
+                    return key
+        return None
+
+    def _insert(self, key, bounds: tuple[float, float, float, float], circle, polygon) -> None:
+        self.remove(key)
+        cells = self._cells_for(bounds)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._items[key] = (cells, circle, polygon)
+
+    def _cells_for(self, bounds: tuple[float, float, float, float]) -> list[tuple[int, int]]:
+        min_x, min_z, max_x, max_z = (math.floor(value / self._cell_size) for value in bounds)
+        return [(cell_x, cell_z) for cell_x in range(min_x, max_x + 1) for cell_z in range(min_z, max_z + 1)]
+
+def _circle_hits_polygon(x: float, z: float, radius: float, polygon: np.ndarray) -> bool:
+    """Whether a circle overlaps a polygon, either by being inside it or crossing an edge."""
+    starts = polygon
+    ends = np.roll(polygon, -1, axis=0)
+
+    # Even-odd ray cast for the center being inside
+    crosses = (starts[:, 1] > z) != (ends[:, 1] > z)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = starts[:, 0] + (z - starts[:, 1]) * (ends[:, 0] - starts[:, 0]) / (ends[:, 1] - starts[:, 1])
+    if np.count_nonzero(crosses & (x < crossing_x)) % 2 == 1:
+        return True
+
+    # Otherwise it has to be close enough to an edge
+    edges = ends - starts
+    edge_length_squared = np.einsum("ij,ij->i", edges, edges)
+    offsets = np.array([x, z]) - starts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        along = np.clip(np.einsum("ij,ij->i", offsets, edges) / edge_length_squared, 0.0, 1.0)
+    along = np.nan_to_num(along)  # Zero length edges are just a point
+    closest = starts + edges * along[:, None]
+    return bool(np.min(np.hypot(closest[:, 0] - x, closest[:, 1] - z)) < radius)
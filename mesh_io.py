@@ -0,0 +1,151 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Reading and writing mesh files for the command line tools.
+# 3MF is done here with the standard library since trimesh needs lxml for it, which Cura doesn't have.
+# Everything else gets read with trimesh. Files are Z up, unlike Cura which is Y up.
+#--------------------------------------------------------------------------------------------------
+from pathlib import Path
+import struct
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+import numpy as np
+
+# File (Z up) coordinates to Cura's (Y up) ones, as a 4x4 transformation: (x, y, z) -> (x, z, -y)
+Z_UP_TO_Y_UP = np.array([
+    [1.0, 0.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0, 0.0],
+    [0.0, -1.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0, 1.0],
+])
+
+_CORE_NAMESPACE = "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+_NS = {"m": _CORE_NAMESPACE}
+_UNIT_SCALES = {"micron": 0.001, "millimeter": 1.0, "centimeter": 10.0, "inch": 25.4, "foot": 304.8, "meter": 1000.0}
+
+def y_up_to_z_up(points: np.ndarray) -> np.ndarray:
+    """Puts points from Cura's coordinates back into file coordinates: (x, y, z) -> (x, -z, y)."""
+    points = np.asarray(points, dtype=np.float64)
+    return np.stack([points[:, 0], -points[:, 2], points[:, 1]], axis=1)
+
+def load_mesh(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """Loads every mesh in a file as one, in millimetres.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Vertices (shape (n, 3)) and triangle indices (shape (m, 3)).
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".3mf":
+        return _load_3mf(path)
+    import trimesh
+    mesh = trimesh.load(str(path), force="mesh", process=False)
+    return np.asarray(mesh.vertices, dtype=np.float64), np.asarray(mesh.faces, dtype=np.int64)
+
+def _model_path(archive: zipfile.ZipFile) -> str:
+    """Finds the 3D model part from the package relationships, which is nearly always 3D/3dmodel.model."""
+    try:
+        relationships = ElementTree.fromstring(archive.read("_rels/.rels"))
+        for relationship in relationships:
+            if relationship.get("Type", "").endswith("/3dmodel"):
+                return relationship.get("Target").lstrip("/")
+    except KeyError:
+        pass
+    return "3D/3dmodel.model"
+
+def _transform(attribute: str | None) -> np.ndarray:
+    """4x4 matrix (for column vectors) from a 3MF transform attribute, which is a 3x4 matrix for row vectors."""
+    matrix = np.eye(4)
+    if attribute:
+        values = np.array(attribute.split(), dtype=np.float64).reshape(4, 3)
+        matrix[:3, :3] = values[:3].T
+        matrix[:3, 3] = values[3]
+    return matrix
+
+def _load_3mf(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read(_model_path(archive)))
+    scale = _UNIT_SCALES.get(root.get("unit", "millimeter"), 1.0)
+
+    meshes: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    components: dict[str, list[tuple[str, np.ndarray]]] = {}
+    for item in root.iterfind("m:resources/m:object", _NS):
+        object_id = item.get("id")
+        mesh = item.find("m:mesh", _NS)
+        if mesh is not None:
+            vertices = np.array([[float(vertex.get("x")), float(vertex.get("y")), float(vertex.get("z"))]
+                                 for vertex in mesh.iterfind("m:vertices/m:vertex", _NS)], dtype=np.float64).reshape(-1, 3)
+            triangles = np.array([[int(triangle.get("v1")), int(triangle.get("v2")), int(triangle.get("v3"))]
+                                  for triangle in mesh.iterfind("m:triangles/m:triangle", _NS)], dtype=np.int64).reshape(-1, 3)
+            meshes[object_id] = (vertices, triangles)
+        else:
+            components[object_id] = [(component.get("objectid"), _transform(component.get("transform")))
+                                      for component in item.iterfind("m:components/m:component", _NS)]
+
+    all_vertices: list[np.ndarray] = []
+    all_triangles: list[np.ndarray] = []
+    vertex_count = 0
+
+    def add_object(object_id: str, transformation: np.ndarray, depth: int = 0) -> None:
+        nonlocal vertex_count
+        if depth > 32:
+            raise ValueError(f"{path} has components nested too deeply (or in a loop)")
+        if object_id in meshes:
+            vertices, triangles = meshes[object_id]
+            all_vertices.append(vertices @ transformation[:3, :3].T + transformation[:3, 3])
+            all_triangles.append(triangles + vertex_count)
+            vertex_count += len(vertices)
+        for child_id, child_transformation in components.get(object_id, []):
+            add_object(child_id, transformation @ child_transformation, depth + 1)
+
+    for item in root.iterfind("m:build/m:item", _NS):
+        add_object(item.get("objectid"), _transform(item.get("transform")))
+    if not all_vertices:
+        raise ValueError(f"{path} doesn't have any meshes to print")
+    return np.concatenate(all_vertices) * scale, np.concatenate(all_triangles)
+
+def write_3mf(path: Path, objects: list[tuple[str, np.ndarray, np.ndarray]]) -> None:
+    """Writes a 3MF with each (name, vertices, triangles) as a separate object, in millimetres."""
+    model = [f'<?xml version="1.0" encoding="UTF-8"?>\n<model unit="millimeter" xml:lang="en-US" xmlns="{_CORE_NAMESPACE}">\n<resources>\n']
+    for object_id, (name, vertices, triangles) in enumerate(objects, start=1):
+        model.append(f'<object id="{object_id}" name="{_escape(name)}" type="model">\n<mesh>\n<vertices>\n')
+        model.extend(f'<vertex x="{x:.6g}" y="{y:.6g}" z="{z:.6g}"/>\n' for x, y, z in np.asarray(vertices, dtype=np.float64))
+        model.append("</vertices>\n<triangles>\n")
+        model.extend(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>\n' for a, b, c in np.asarray(triangles, dtype=np.int64))
+        model.append("</triangles>\n</mesh>\n</object>\n")
+    model.append("</resources>\n<build>\n")
+    model.extend(f'<item objectid="{object_id}"/>\n' for object_id in range(1, len(objects) + 1))
+    model.append("</build>\n</model>\n")
+
+    content_types = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+                     '</Types>\n')
+    relationships = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                     '<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+                     '</Relationships>\n')
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", content_types)
+        archive.writestr("_rels/.rels", relationships)
+        archive.writestr("3D/3dmodel.model", "".join(model))
+
+def write_stl(path: Path, vertices: np.ndarray, triangles: np.ndarray) -> None:
+    """Writes a binary STL."""
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(triangles)]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = normals / np.where(lengths == 0, 1, lengths)
+
+    records = np.zeros(len(corners), dtype=[("normal", "<f4", 3), ("corners", "<f4", (3, 3)), ("attributes", "<u2")])
+    records["normal"] = normals
+    records["corners"] = corners
+    with open(path, "wb") as stl_file:
+        stl_file.write(b"Spoon Anti-Warping Reborn".ljust(80, b" "))
+        stl_file.write(struct.pack("<I", len(records)))
+        stl_file.write(records.tobytes())
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
@@ -0,0 +1,494 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Automatic placement without Cura: where spoons go around a mesh, which way they point, and the
+# spoon mesh itself. The tool and spoon_place_cli.py both use this so they always agree.
+# Everything is in Cura's coordinates, with Y up and the build plate on the X/Z plane.
+#--------------------------------------------------------------------------------------------------
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+from .geometry_helpers import SpatialGrid, base_footprint, nearest_point_angles, outermost_hulls
+
+# Minimum gap between automatic spoons as a fraction of spoon diameter
+DENSITY_GAPS = {
+    "Tight": 0.65,
+    "Dense": 0.8,
+    "Normal": 0.9,
+    "Sparse": 1.0,
+}
+DEFAULT_DENSITY = "Dense"
+
+# Corners: on the corners of the hull, skipping any too close together.
+# Even spacing: evenly spaced all the way around the outline, starting from the sharpest corner.
+PLACEMENT_MODES = ("Corners", "Even spacing")
+DEFAULT_PLACEMENT = "Corners"
+# Even spacing puts spoons this many times the density's minimum gap apart
+PERIMETER_SPACING_GAPS = 2.0
+# Outlines on the build plate get simplified to within this fraction of the nozzle size
+OUTLINE_TOLERANCE_NOZZLES = 0.25
+
+@dataclass
+class SpoonSettings:
+    """Everything about the spoons which placement needs, same as the settings in the tool panel."""
+    spoon_diameter: float = 10.0
+    handle_length: float = 2.0
+    handle_width: float = 2.0
+    spoon_height: float = 0.36  # Total thickness, see spoon_height()
+    teardrop_shape: bool = False
+    density: str = DEFAULT_DENSITY
+    placement: str = DEFAULT_PLACEMENT
+    reference_distance: float = 5.0  # Spacing of the points spoons point away from
+    outline_tolerance: float = 0.1  # See outline_tolerance()
+
+@dataclass
+class PlannedSpoon:
+    x: float
+    z: float
+    angle: float  # Radians
+    shape_index: int  # Which area on the build plate it's for
+
+def minimum_gap(density: str, spoon_diameter: float) -> float:
+    """Minimum distance between automatic spoons on the same area for a density setting."""
+    return DENSITY_GAPS.get(density, DENSITY_GAPS[DEFAULT_DENSITY]) * spoon_diameter
+
+def outline_tolerance(nozzle_size: float, nozzles: float = OUTLINE_TOLERANCE_NOZZLES) -> float:
+    """How far outlines on the build plate can be simplified for a nozzle size. Detail smaller than that can't be printed anyway."""
+    return max(0.0, nozzle_size * nozzles)
+
+def spoon_height(layer_height_0: float, layer_height: float, layer_count: int) -> float:
+    """How tall spoons need to be for the number of layers they're set to."""
+    return (layer_height_0 * 1.2) + (layer_height * (layer_count - 1))
+
+def spoon_outset(spoon_diameter: float, handle_length: float) -> float:
+    """How far out the reference points spoons point away from are."""
+    return round((spoon_diameter + handle_length) * 1.1, 4)
+
+def spoon_circle(x: float, z: float, angle: float, spoon_diameter: float, handle_length: float) -> tuple[tuple[float, float], float]:
+    """Where the round part of a spoon at (x, z) pointing at angle would be, as ((x, z), radius)."""
+    spoon_radius = spoon_diameter / 2
+    center_distance = handle_length + spoon_radius
+    return (x + center_distance * math.cos(angle), z + center_distance * math.sin(angle)), spoon_radius
+
+def select_spoon_positions(hull_points: np.ndarray, minimum_spoon_gap: float) -> np.ndarray:
+    """Picks the hull points to put spoons on, going around the hull and skipping any too close to the last one.
+
+    Args:
+        hull_points (np.ndarray): Vertices of the hull in order, shape (n, 2).
+        minimum_spoon_gap (float): Smallest distance allowed between spoons.
+
+    Returns:
+        np.ndarray: (x, z) positions of the spoons, shape (m, 2).
+    """
+    hull_points = np.asarray(hull_points, dtype=np.float64).reshape(-1, 2)
+    if len(hull_points) == 0:
+        return np.zeros((0, 2))
+
+    first_point = hull_points[0]
+    last_spoon_position = hull_points[0]
+    chosen = [0]
+    for i in range(1, len(hull_points)):
+        point_position = hull_points[i]
+        difference_length = round(float(np.linalg.norm(last_spoon_position - point_position)), 4)
+        first_to_last_distance = float(np.linalg.norm(first_point - point_position)) if i == len(hull_points) - 1 else 0
+
+        # Make sure not to place spoons too close together
+        if (first_to_last_distance == 0 and difference_length >= minimum_spoon_gap) or (first_to_last_distance >= minimum_spoon_gap and difference_length >= minimum_spoon_gap):
+            chosen.append(i)
+            last_spoon_position = point_position
+    return hull_points[chosen]
+
+def perimeter_distances(points: np.ndarray, closed: bool = True) -> np.ndarray:
+    """How far along the outline each point is, starting from 0 at the first one.
+    If it's closed there's one extra on the end for the whole way back around to the first point."""
+    path = np.concatenate((points, points[:1])) if closed else points
+    return np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(path, axis=0).T))))
+
+def resample_perimeter(points: np.ndarray, spacing: float, closed: bool = True, start: float = 0.0) -> np.ndarray:
+    """Points evenly spaced along an outline, no more than spacing apart.
+    Done in one go with np.interp on the distance along the outline, so it doesn't matter how many vertices it has.
+
+    Args:
+        points (np.ndarray): Vertices of a hull or contour in order, shape (n, 2).
+        spacing (float): Largest distance between points along the outline.
+        closed (bool): Whether the last vertex joins back up to the first one.
+        start (float): How far along the outline the first point is. Only used if it's closed.
+
+    Returns:
+        np.ndarray: The points, shape (m, 2). Open outlines include both ends.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2 or spacing <= 0:
+        return points.copy()
+    distances = perimeter_distances(points, closed)
+    total = float(distances[-1])
+    if total == 0:
+        return points[:1].copy()
+
+    count = max(1, math.ceil(round(total / spacing, 6)))
+    if closed:
+        targets = (start + np.arange(count) * (total / count)) % total
+        path = np.concatenate((points, points[:1]))
+    else:
+        targets = np.linspace(0.0, total, count + 1)
+        path = points
+    return np.column_stack((np.interp(targets, distances, path[:, 0]), np.interp(targets, distances, path[:, 1])))
+
+def sharpest_corner(points: np.ndarray) -> int:
+    """Index of the vertex of a closed outline where it turns the most."""
+    incoming = points - np.roll(points, 1, axis=0)
+    outgoing = np.roll(points, -1, axis=0) - points
+    cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+    dot = (incoming * outgoing).sum(axis=1)
+    return int(np.argmax(np.abs(np.arctan2(cross, dot))))
+
+def even_spoon_positions(outline_points: np.ndarray, spacing: float) -> np.ndarray:
+    """Spoons spread evenly around an outline, starting at its sharpest corner since that's where it's most likely to warp.
+
+    Args:
+        outline_points (np.ndarray): Vertices of the hull or contour in order, shape (n, 2).
+        spacing (float): Largest distance between spoons along the outline.
+
+    Returns:
+        np.ndarray: (x, z) positions of the spoons, shape (m, 2).
+    """
+    outline_points = np.asarray(outline_points, dtype=np.float64).reshape(-1, 2)
+    if len(outline_points) < 3:
+        return outline_points.copy()
+    start = perimeter_distances(outline_points)[sharpest_corner(outline_points)]
+    return resample_perimeter(outline_points, spacing, start=start)
+
+def spoon_positions(hull_points: np.ndarray, minimum_spoon_gap: float, placement: str = DEFAULT_PLACEMENT) -> np.ndarray:
+    """Where the spoons go around a hull for a placement mode (see PLACEMENT_MODES)."""
+    if placement == "Even spacing":
+        return even_spoon_positions(hull_points, minimum_spoon_gap * PERIMETER_SPACING_GAPS)
+    return select_spoon_positions(hull_points, minimum_spoon_gap)
+
+def hull_bounds(hull_points: np.ndarray) -> tuple[float, float]:
+    """Calculates the width and height of a set of hull points."""
+    width, height = hull_points.max(axis=0) - hull_points.min(axis=0)
+    return float(width), float(height)
+
+def hull_bounds_center(hull_points: np.ndarray) -> np.ndarray:
+    """Calculates the center of the bounding box of a set of hull points."""
+    return (hull_points.min(axis=0) + hull_points.max(axis=0)) / 2.0
+
+def corner_scale_factor(hull_points: np.ndarray, main_outset: float) -> float:
+    """Calculates a scaling factor for corner outset."""
+    larger_dimension = max(hull_bounds(hull_points))
+    if larger_dimension == 0:  # Avoid division by zero for degenerate cases
+        return 1.0 + (0.70 * main_outset)
+    return 1.0 + (0.70 * main_outset) / larger_dimension
+
+def angle_reference_points(hull_points: np.ndarray, outset: float, reference_distance: float) -> np.ndarray:
+    """Points around a hull which spoons on it point away from.
+
+    That's points around the hull grown outwards by a square of outset, plus the hull scaled up
+    a bit so points on the hull have one close to them perpendicularly.
+
+    Args:
+        hull_points (np.ndarray): Vertices of the convex hull, shape (n, 2).
+        outset (float): How far out to grow the hull, see spoon_outset().
+        reference_distance (float): Spacing of the points around the grown hull.
+
+    Returns:
+        np.ndarray: The (x, z) reference points, shape (m, 2).
+    """
+    from scipy.spatial import ConvexHull
+
+    hull_points = np.asarray(hull_points, dtype=np.float64).reshape(-1, 2)
+    minkowski_square = np.array([[outset, -outset], [-outset, -outset], [-outset, outset], [outset, outset]])
+    sums = (hull_points[:, None, :] + minkowski_square[None, :, :]).reshape(-1, 2)
+    minkowski_points = sums[ConvexHull(sums).vertices]
+
+    # Keep the corners as well as the points in between so spoons on a corner still point straight out from it
+    reference_points = np.concatenate((minkowski_points, resample_perimeter(minkowski_points, reference_distance)), axis=0)
+
+    center = hull_bounds_center(hull_points)
+    scaled_hull_points = (hull_points - center) * corner_scale_factor(hull_points, outset) + center
+    return np.concatenate((reference_points, scaled_hull_points), axis=0)
+
+def spoon_angles(hull_points: np.ndarray, positions: np.ndarray, outset: float, reference_distance: float) -> np.ndarray:
+    """Which way spoons at positions around a hull should point, in radians, shape (n,)."""
+    from scipy.spatial import cKDTree
+
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    if len(positions) == 0 or len(hull_points) == 0:
+        return np.zeros(len(positions))
+    return nearest_point_angles(cKDTree(angle_reference_points(hull_points, outset, reference_distance)), positions)
+
+def plan_shape(hull_points: np.ndarray, settings: SpoonSettings) -> tuple[np.ndarray, np.ndarray]:
+    """Positions (shape (n, 2)) and angles (shape (n,)) of the spoons around one hull."""
+    positions = spoon_positions(hull_points, minimum_gap(settings.density, settings.spoon_diameter), settings.placement)
+    angles = spoon_angles(hull_points, positions, spoon_outset(settings.spoon_diameter, settings.handle_length), settings.reference_distance)
+    return positions, angles
+
+def outer_footprint_hulls(hulls: list[np.ndarray]) -> list[np.ndarray]:
+    """Leaves out any hulls which are completely inside another one (like holes in a base)."""
+    if len(hulls) < 2:
+        return list(hulls)
+    return [hulls[i] for i in outermost_hulls(hulls)]
+
+def plan_mesh(vertices: np.ndarray, indices: np.ndarray | None, transformation: np.ndarray,
+              settings: SpoonSettings, height: float = 0.05) -> tuple[list[np.ndarray], list[PlannedSpoon]]:
+    """Works out every spoon for a mesh, the same way as Add Automatically.
+
+    Args:
+        vertices (np.ndarray): Untransformed vertices of the mesh, shape (n, 3).
+        indices (np.ndarray | None): Triangle indices, shape (m, 3). None if every three vertices make a triangle.
+        transformation (np.ndarray): 4x4 transformation into Cura's (Y up) coordinates.
+        settings (SpoonSettings): Spoon settings.
+        height (float): How far above the lowest point of the mesh to look for what's on the build plate.
+
+    Returns:
+        tuple[list[np.ndarray], list[PlannedSpoon]]: Convex hull of each area on the build plate
+        which gets spoons, and the spoons.
+    """
+    _, hulls = base_footprint(vertices, indices, transformation, height, settings.outline_tolerance)
+    if not hulls:
+        # Nothing sliced cleanly (not a closed mesh?) so just go around the whole thing
+        from scipy.spatial import ConvexHull
+        points = (np.asarray(vertices, dtype=np.float64) @ transformation[:3, :3].T + transformation[:3, 3])[:, [0, 2]]
+        if len(points) < 3:
+            return [], []
+        hulls = [points[ConvexHull(points).vertices]]
+    hulls = outer_footprint_hulls(hulls)
+
+    spoons: list[PlannedSpoon] = []
+    for shape_index, hull_points in enumerate(hulls):
+        positions, angles = plan_shape(hull_points, settings)
+        spoons.extend(PlannedSpoon(float(x), float(z), float(angle), shape_index) for (x, z), angle in zip(positions, angles))
+    return hulls, spoons
+
+def separate_spoons(spoons: list[PlannedSpoon], settings: SpoonSettings) -> list[PlannedSpoon]:
+    """Drops spoons which would overlap or come closer than the density's minimum gap to a spoon on another area.
+    Spoons on the same area are already kept apart by the density setting, so they don't get checked against each other."""
+    clearance = minimum_gap(settings.density, settings.spoon_diameter)
+    grid = SpatialGrid(max(settings.spoon_diameter * 2, 1.0))
+    kept: list[PlannedSpoon] = []
+    shape_keys: dict[int, list[int]] = {}
+    for spoon in spoons:
+        center, radius = spoon_circle(spoon.x, spoon.z, spoon.angle, settings.spoon_diameter, settings.handle_length)
+        same_shape = shape_keys.setdefault(spoon.shape_index, [])
+        if grid.circle_collision(center, radius, clearance, ignore=same_shape) is not None:
+            continue
+        key = len(kept)
+        grid.insert_circle(key, center, radius)
+        same_shape.append(key)
+        kept.append(spoon)
+    return kept
+
+def tangential_points_on_circle(center, radius, start_point) -> list[tuple[float, float]]:
+    """Return 2 tangenital points of circle from a given point
+    ...even though only the first one is ever used."""
+    # Calculation of the distance between point_fix and (center[0], center[1])
+    start_distance = math.sqrt((center[0] - start_point[0])**2 + (center[1] - start_point[1])**2)
+
+    # Search for the points of tangency of the line with the circle
+    tangency_points = []
+
+    # If point_fix is on the circle, there is only one point of tangency
+    if start_distance == radius:
+        tangency_points.append((start_point[0], start_point[1]))
+
+    else:
+        # Calculation of the angle between the line and the radius of the circle passing through the point of tangency
+        theta = math.asin(radius / start_distance)
+        # Calculation of the angle of the line
+        alpha = math.atan2(center[1] - start_point[1] , center[0] - start_point[0] )
+        # Calculation of the angles of the two rays passing through the points of tangency
+        beta1 = alpha + theta
+        beta2 = alpha - theta
+        # Calculation of the coordinates of the tangency points
+        tan_x_1 = center[0] - radius* math.sin(beta1)
+        tan_y_1 = center[1] + radius* math.cos(beta1)
+        tangency_points.append((tan_x_1, tan_y_1))
+
+        tan_x_2 = center[0] - radius* math.sin(beta2)
+        tan_y_2 = center[1] + radius* math.cos(beta2)
+        tangency_points.append((tan_x_2, tan_y_2))
+    return tangency_points
+
+def spoon_mesh(size, handle_length, handle_width, segments,
+               height, max_y, teardrop_shape, angle) -> tuple[np.ndarray, np.ndarray]:
+    """Makes the mesh for a spoon with its handle starting at the origin, pointing along angle.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Vertices (float32, shape (n, 3)) and triangle indices (int32, shape (m, 3)).
+    """
+    # Per-vertex normals require duplication of vertices
+    circle_radius = size / 2
+    # First layer length
+    max_y = -height + max_y
+    negative_height = -height
+
+    segment_degrees = round((360 / segments),4)
+    segment_radians = math.radians(segments)
+
+    vertices = []
+
+    # Add the handle of the spoon
+    half_handle_width = handle_width / 2
+
+    if teardrop_shape:
+        circle_start = [0, half_handle_width]
+        circle_center = [(circle_radius + handle_length), 0]
+        tangent_points = tangential_points_on_circle(circle_center, circle_radius, circle_start)
+        #log("d", f"Tangent points: {tangent_points}")
+        vertex_count = 20
+        vertices = [ # 5 faces with 4 corners each
+            [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width,  max_y,  half_handle_width], [ tangent_points[0][0],  max_y,  tangent_points[0][1]], [ tangent_points[0][0], negative_height,  tangent_points[0][1]],
+            [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [ tangent_points[0][0], negative_height, -tangent_points[0][1]], [ tangent_points[0][0],  max_y, -tangent_points[0][1]],
+            [ tangent_points[0][0], negative_height, -tangent_points[0][1]], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width, negative_height,  half_handle_width], [ tangent_points[0][0], negative_height,  tangent_points[0][1]],
+            [-half_handle_width,  max_y, -half_handle_width], [ tangent_points[0][0],  max_y, -tangent_points[0][1]], [ tangent_points[0][0],  max_y,  tangent_points[0][1]], [-half_handle_width,  max_y,  half_handle_width],
+            [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width,  max_y,  half_handle_width]
+        ]
+        max_width=tangent_points[0][1]
+        max_length=tangent_points[0][0]
+    else:
+        vertex_count = 20
+        vertices = [ # 5 faces with 4 corners each
+            [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width,  max_y,  half_handle_width], [ handle_length,  max_y,  half_handle_width], [ handle_length, negative_height,  half_handle_width],
+            [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [ handle_length, negative_height, -half_handle_width], [ handle_length,  max_y, -half_handle_width],
+            [ handle_length, negative_height, -half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width, negative_height,  half_handle_width], [ handle_length, negative_height,  half_handle_width],
+            [-half_handle_width,  max_y, -half_handle_width], [ handle_length,  max_y, -half_handle_width], [ handle_length,  max_y,  half_handle_width], [-half_handle_width,  max_y,  half_handle_width],
+            [-half_handle_width, negative_height,  half_handle_width], [-half_handle_width, negative_height, -half_handle_width], [-half_handle_width,  max_y, -half_handle_width], [-half_handle_width,  max_y,  half_handle_width]
+        ]
+        max_width=half_handle_width
+        max_length=handle_length
+
+    # Add Round Part of the Spoon
+    vertex_count_round = 0
+    # Used to fill in any gaps if the division of the circle into segments didn't quite add up
+    remainder_1 = 0
+    remainder_2 = 0
+
+    for i in range(0, math.ceil(segment_degrees)):
+        if (circle_radius*math.cos((i+1)*segment_radians)) >= 0 or (abs(circle_radius*math.sin((i+1)*segment_radians)) > max_width and abs(circle_radius*math.sin(i*segment_radians)) > max_width)  :
+            vertex_count_round += 1
+            # Top
+            vertices.append([handle_length+circle_radius, max_y, 0])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), max_y, circle_radius*math.sin((i+1)*segment_radians)])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), max_y, circle_radius*math.sin(i*segment_radians)])
+            #Side 1a
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), max_y, circle_radius*math.sin(i*segment_radians)])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), max_y, circle_radius*math.sin((i+1)*segment_radians)])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), negative_height, circle_radius*math.sin((i+1)*segment_radians)])
+            #Side 1b
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), negative_height, circle_radius*math.sin((i+1)*segment_radians)])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), negative_height, circle_radius*math.sin(i*segment_radians)])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), max_y, circle_radius*math.sin(i*segment_radians)])
+            #Bottom
+            vertices.append([handle_length+circle_radius, negative_height, 0])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos(i*segment_radians), negative_height, circle_radius*math.sin(i*segment_radians)])
+            vertices.append([handle_length+circle_radius+circle_radius*math.cos((i+1)*segment_radians), negative_height, circle_radius*math.sin((i+1)*segment_radians)])
+        else :
+            if remainder_1 == 0 :
+                remainder_1 = i*segment_radians
+                remainder_2 = 2*math.pi-remainder_1
+
+                if teardrop_shape :
+                    vertex_count_round += 1
+                    # Top
+                    vertices.append([handle_length+circle_radius, max_y, 0])
+                    vertices.append([max_length, max_y, max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
+                    #Side 1a
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
+                    vertices.append([max_length, max_y, max_width])
+                    vertices.append([max_length, negative_height, max_width])
+                    #Side 1b
+                    vertices.append([max_length, negative_height, max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
+                    #Bottom
+                    vertices.append([handle_length+circle_radius, negative_height, 0])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
+                    vertices.append([max_length, negative_height, max_width])
+
+                    vertex_count_round += 1
+                    # Top
+                    vertices.append([handle_length+circle_radius, max_y, 0])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
+                    vertices.append([max_length, max_y, -max_width])
+                    #Side 1a
+                    vertices.append([max_length, max_y, -max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
+                    #Side 1b
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
+                    vertices.append([max_length, negative_height, -max_width])
+                    vertices.append([max_length, max_y, -max_width])
+                    #Bottom
+                    vertices.append([handle_length+circle_radius, negative_height, 0])
+                    vertices.append([max_length, negative_height, -max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
+                else:
+                    vertex_count_round += 1
+                    # Top
+                    vertices.append([handle_length+circle_radius, max_y, 0])
+                    vertices.append([handle_length, max_y, max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
+                    #Side 1a
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
+                    vertices.append([handle_length, max_y, max_width])
+                    vertices.append([handle_length, negative_height, max_width])
+                    #Side 1b
+                    vertices.append([handle_length, negative_height, max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), max_y, circle_radius*math.sin(remainder_1)])
+                    #Bottom
+                    vertices.append([handle_length+circle_radius, negative_height, 0])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_1), negative_height, circle_radius*math.sin(remainder_1)])
+                    vertices.append([handle_length, negative_height, max_width])
+
+                    vertex_count_round += 1
+                    # Top
+                    vertices.append([handle_length+circle_radius, max_y, 0])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
+                    vertices.append([handle_length, max_y, -max_width])
+                    #Side 1a
+                    vertices.append([handle_length, max_y, -max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), max_y, circle_radius*math.sin(remainder_2)])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
+                    #Side 1b
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
+                    vertices.append([handle_length, negative_height, -max_width])
+                    vertices.append([handle_length, max_y, -max_width])
+                    #Bottom
+                    vertices.append([handle_length+circle_radius, negative_height, 0])
+                    vertices.append([handle_length, negative_height, -max_width])
+                    vertices.append([handle_length+circle_radius+circle_radius*math.cos(remainder_2), negative_height, circle_radius*math.sin(remainder_2)])
+
+    # Add link part between handle and Round Part
+    # Top center
+    vertices.append([max_length, max_y, max_width])
+    vertices.append([handle_length+circle_radius, max_y, 0])
+    vertices.append([max_length, max_y, -max_width])
+
+    # Bottom  center
+    vertices.append([max_length, negative_height, -max_width])
+    vertices.append([handle_length+circle_radius, negative_height, 0])
+    vertices.append([max_length, negative_height, max_width])
+
+    # Rotate the mesh
+    vertex_total = vertex_count_round * 12 + 6 + vertex_count
+    vertices = np.asarray(vertices[:vertex_total], dtype=np.float64)
+    rotated_vertices = np.empty_like(vertices)
+    rotated_vertices[:, 0] = (vertices[:, 0] * math.cos(angle)) - (vertices[:, 2] * math.sin(angle))
+    rotated_vertices[:, 1] = vertices[:, 1]
+    rotated_vertices[:, 2] = (vertices[:, 0] * math.sin(angle)) + (vertices[:, 2] * math.cos(angle))
+
+    indices = []
+    for i in range(0, vertex_count, 4): # All 6 quads (12 triangles)
+        indices.append([i, i+2, i+1])
+        indices.append([i, i+3, i+2])
+
+    # for every angle increment 12 Vertices
+    for i in range(vertex_count, vertex_total, 3): #
+        indices.append([i, i+1, i+2])
+
+    return rotated_vertices.astype(np.float32), np.asarray(indices, dtype=np.int32)
@@ -11,6 +11,13 @@ https://github.com/5axes/SpoonAntiWarping
     "HandleWidth"   : Width of spoon handle (float)
     "LayerCount"    : Number of layers (int)
     "TeardropShape" : Create teardrop shaped "spoons" (bool)
+    "AutoPlacement" : Where automatic placement puts spoons, "Corners" or "Even spacing" (string)
+    "AutoProgress"  : Progress of automatic placement from 0 to 1 (float, read only)
+    "AutoRunning"   : Automatic placement is running in the background (bool, read only)
+    "PreviewActive" : Preview of automatic placement is being shown (bool, read only)
+    "PreviewCount"  : Number of spoons in the preview (int, read only)
+    "Profiling"     : Time taken by each stage of the last run, if spoonawreborn/profiling is on,
+                      and memory used if spoonawreborn/profile_memory is as well (string, read only)
 
 -----------------------------------------------------------------------------*/
 
@@ -173,6 +180,11 @@ Item
     property string layerCount: ""
     property bool teardropShape: false
     property string notifications: getProperty("Notifications")
+    property real autoProgress: getProperty("AutoProgress")
+    property bool autoRunning: getProperty("AutoRunning")
+    property bool previewActive: getProperty("PreviewActive")
+    property int previewCount: getProperty("PreviewCount")
+    property string profiling: getProperty("Profiling")
     
     property bool inputsValid: false
 
@@ -190,6 +202,7 @@ Item
         Qt.callLater(validateInputs)
         printOrderBox.currentIndex = printOrderBox.find(getProperty("PrintOrder"))
         autoDensityBox.currentIndex = autoDensityBox.find(getProperty("AutoDensity"))
+        autoPlacementBox.currentIndex = autoPlacementBox.find(getProperty("AutoPlacement"))
     }
 	
 	property int localwidth: UM.Theme.getSize("setting_control").width
@@ -361,9 +374,68 @@ Item
                 id: addAutoButton
                 height: UM.Theme.getSize("setting_control").height	
                 text: catalog.i18nc("@label", "Add Automatically")
+                enabled: !autoRunning
                 onClicked: triggerAction("addAutoSpoonMesh")
             }
 
+            RowLayout
+            {
+                id: previewRow
+                spacing: UM.Theme.getSize("default_margin").width
+
+                Cura.SecondaryButton
+                {
+                    id: previewButton
+                    height: UM.Theme.getSize("setting_control").height
+                    text: catalog.i18nc("@button:preview_auto", "Preview")
+                    enabled: inputsValid
+                    onClicked: triggerAction("previewAutoSpoonMesh")
+                }
+
+                Cura.SecondaryButton
+                {
+                    id: confirmButton
+                    height: UM.Theme.getSize("setting_control").height
+                    visible: previewActive
+                    enabled: !autoRunning && previewCount > 0
+                    text: catalog.i18nc("@button:confirm_preview", "Confirm (%1)").arg(previewCount)
+                    onClicked: triggerAction("confirmAutoSpoonMesh")
+                }
+
+                Cura.TertiaryButton
+                {
+                    id: clearPreviewButton
+                    height: UM.Theme.getSize("setting_control").height
+                    visible: previewActive
+                    text: catalog.i18nc("@button:clear_preview", "Clear")
+                    onClicked: triggerAction("clearAutoSpoonPreview")
+                }
+            }
+
+            RowLayout
+            {
+                id: autoProgressRow
+                visible: autoRunning
+                spacing: UM.Theme.getSize("default_margin").width
+                Layout.fillWidth: true
+
+                UM.ProgressBar
+                {
+                    id: autoProgressBar
+                    Layout.fillWidth: true
+                    Layout.alignment: Qt.AlignVCenter
+                    value: autoProgress
+                }
+
+                Cura.TertiaryButton
+                {
+                    id: cancelAutoButton
+                    height: UM.Theme.getSize("setting_control").height
+                    text: catalog.i18nc("@button:cancel_auto", "Cancel")
+                    onClicked: triggerAction("cancelAutoSpoonMesh")
+                }
+            }
+
             RowLayout
             {
                 spacing: UM.theme.getSize("default_margin").width
@@ -386,6 +458,38 @@ Item
                     }
                 }
             }
+
+            RowLayout
+            {
+                spacing: UM.theme.getSize("default_margin").width
+                Layout.fillWidth: true
+                Layout.alignment: Qt.AlignLeft | Qt.AlignTop
+
+                UM.Label
+                {
+                    text: catalog.i18nc("@labels:auto_placement", "Automatic Placement")
+                }
+
+                Cura.ComboBox
+                {
+                    id: autoPlacementBox
+                    Layout.minimumWidth: textFieldMinWidth
+                    Layout.minimumHeight: UM.Theme.getSize("setting_control").height
+                    model: ["Corners", "Even spacing"]
+                    onActivated: {
+                        setProperty("AutoPlacement", currentText)
+                    }
+                }
+            }
+
+            UM.Label
+            {
+                id: profilingLabel
+                visible: profiling != ""
+                text: profiling
+                font: UM.Theme.getFont("small")
+                color: UM.Theme.getColor("text_medium")
+            }
         }
         UM.Label {
             Layout.alignment: Qt.AlignTop
@@ -8,6 +8,9 @@
 # PostProcessingPlugin is released under the terms of the LGPLv3 or higher.
 #--------------------------------------------------------------------------------------------------
 from typing import Any
+import ast
+import configparser
+import json
 import re
 
 from .slasheetools import log as log
@@ -129,6 +132,22 @@ def section_ends_z_hopped(section: list[str]) -> bool:
                 last_z = get_value(line, "Z")
     return False
 
+TOOL_CHANGE_PATTERN = re.compile(r"^T(\d+)(?![\d.])", re.MULTILINE)
+
+def get_tool_change(line: str) -> int | None:
+    """Returns the extruder a line switches to if it's a tool change (like "T1"), otherwise None."""
+    if not line.startswith("T"):
+        return None
+    match = TOOL_CHANGE_PATTERN.match(line)
+    return int(match.group(1)) if match else None
+
+def get_last_tool_change(gcode: str, default: int) -> int:
+    """Returns the extruder the last tool change in a block of G-code switches to, or default if there isn't one."""
+    tool = default
+    for match in TOOL_CHANGE_PATTERN.finditer(gcode):
+        tool = int(match.group(1))
+    return tool
+
 def is_extrusion_move(line: str):
     """Checks to see if a line is an extrusion move
     (Starts with G1, G2 or G3, contains E property as well as X and/or Y)
@@ -260,3 +279,97 @@ def make_travel(x: float, y: float, speed: float, z: float = None,
     output += "; SpoonOrder added travel end\n"
     log("d", f"make_travel output:\n{output}")
     return output
+
+def split_gcode_layers(gcode: str) -> list[str]:
+    """Splits a whole G-code file up the same way Cura's gcode_dict is, so joining it back up gives the same file.
+    That's the header, the start G-code, one string for each ";LAYER:" (ending with its ";TIME_ELAPSED:" line)
+    and whatever's left after the last layer.
+    """
+    lines = gcode.splitlines(keepends=True)
+    sections: list[str] = []
+    current: list[str] = []
+    in_layer = False
+    for line in lines:
+        if line.startswith(";LAYER:"):
+            if current:
+                sections.append("".join(current))
+            current = [line]
+            in_layer = True
+            continue
+        current.append(line)
+        if not in_layer and not sections and line.startswith(";Generated with"):
+            # End of the header, the start G-code comes next
+            sections.append("".join(current))
+            current = []
+        elif in_layer and line.startswith(";TIME_ELAPSED:"):
+            sections.append("".join(current))
+            current = []
+            in_layer = False
+    if current:
+        sections.append("".join(current))
+    return sections
+
+def _parse_setting_value(value: str) -> Any:
+    """Turns a value from one of Cura's profiles into a Python value.
+    Formulas (starting with "=") only work out if they're just a number or True/False."""
+    value = value.strip()
+    if value.startswith("="):
+        value = value[1:].strip()
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return None
+
+def _read_profile_values(profile: str) -> dict[str, Any]:
+    """Reads the [values] section of one of the profiles in the setting footer."""
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read_string(profile)
+    except configparser.Error as e:
+        log("w", f"read_setting_footer couldn't read a profile: {e}")
+        return {}
+    if not parser.has_section("values"):
+        return {}
+    values: dict[str, Any] = {}
+    for key, value in parser.items("values"):
+        parsed = _parse_setting_value(value)
+        if parsed is not None:
+            values[key] = parsed
+    return values
+
+def read_setting_footer(gcode: str) -> dict[str, Any]:
+    """Reads the settings Cura saves in ";SETTING_3" lines at the end of a G-code file.
+    These are only the settings which were changed from the profile's defaults. The global ones
+    are returned as they are, and each extruder's are in "extruders" (keyed by extruder number)
+    the way SpoonOrder.execute() takes them.
+    Values which can't be worked out (like most formulas) are left out.
+    """
+    footer_start = gcode.find(";SETTING_3 ")
+    if footer_start == -1:
+        return {}
+    payload = "".join(line[len(";SETTING_3 "):] for line in gcode[footer_start:].splitlines() if line.startswith(";SETTING_3 "))
+    try:
+        serialised = json.loads(payload)
+    except json.JSONDecodeError as e:
+        log("w", f"read_setting_footer couldn't read the settings: {e}")
+        return {}
+
+    settings = _read_profile_values(serialised.get("global_quality", ""))
+    extruders = {index: _read_profile_values(profile) for index, profile in enumerate(serialised.get("extruder_quality", []))}
+    if extruders:
+        settings["extruders"] = extruders
+    return settings
+
+def uses_relative_extrusion(gcode_sections: list[str]) -> bool | None:
+    """Checks whether the start G-code (everything before the first layer) switches to relative (M83)
+    or absolute (M82) extrusion. Returns None if it doesn't do either."""
+    relative = None
+    for section in gcode_sections:
+        if section.startswith(";LAYER:"):
+            break
+        for line in section.splitlines():
+            if line.startswith("M83"):
+                relative = True
+            elif line.startswith("M82"):
+                relative = False
+    return relative
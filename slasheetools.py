@@ -2,7 +2,7 @@
 # slasheetools
 # - log():
 #       A wrapper function arount UM.Logger that allows debug level messages
-#       to be removed by changing DEBUG_LOG_MODE.
+#       to be removed by changing DEBUG_LOG_MODE. Uses the logging module if UM isn't there.
 # - log_debug():
 #       A wrapper function around log() that forces debug mode to be on.
 #       The idea is that you import it as log for debugging but switch
@@ -15,10 +15,22 @@
 #       constrain it to upper or lower bounds.
 #------------
 # v1: log() and log_debug() implementations including "dd" for debug that should show up anyway.
+# v2: log() falls back to Python's logging module when it's used outside of Cura.
 
 import math
 
-from UM.Logger import Logger
+try:
+    from UM.Logger import Logger
+except ImportError:
+    # Not running in Cura (e.g. the command line tools), so use the standard library's logging instead
+    import logging
+
+    class Logger:
+        _levels = {"d": logging.DEBUG, "i": logging.INFO, "w": logging.WARNING, "e": logging.ERROR, "c": logging.CRITICAL}
+
+        @classmethod
+        def log(cls, log_type: str, message: str) -> None:
+            logging.getLogger("spoonawreborn").log(cls._levels.get(log_type, logging.INFO), message)
 
 DEBUG_LOG_MODE = False
 
@@ -0,0 +1,192 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Puts spoons first (or last) in G-code files without Cura, for G-code that was sliced somewhere else.
+# The settings SpoonOrder needs come from the ";SETTING_3" lines Cura puts at the end of the file,
+# then from a JSON file if there is one, with Cura's defaults for anything that's still missing.
+#
+# Usage:
+#   python spoon_order_cli.py print.gcode                         Writes print_spoonorder.gcode next to it
+#   python spoon_order_cli.py gcode_folder --output-dir reordered  Every .gcode in the folder, using all CPU cores
+#   python spoon_order_cli.py print.gcode --settings settings.json --spoons-last --in-place
+#   python spoon_order_cli.py huge_print.gcode --low-memory       Doesn't load the whole file into memory
+#   python spoon_order_cli.py print.gcode --profile --workers 1    Time and memory used by each phase
+#--------------------------------------------------------------------------------------------------
+import argparse
+from dataclasses import dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import sys
+import time
+
+from cli_helpers import gather_files, load_plugin_module, output_path, run_jobs, setup_logging
+
+@dataclass
+class FileResult:
+    source: Path
+    output: Path | None  # None if nothing needed writing
+    reordered_layers: int = 0
+    seconds: float = 0.0
+    error: str = ""
+    report: dict | None = None  # From the StageTimer, with --profile
+
+def _prime_speed_follows(settings: dict) -> None:
+    """Cura's prime speed follows the retraction speed unless it's been changed."""
+    if "retraction_speed" in settings and "retraction_prime_speed" not in settings:
+        settings["retraction_prime_speed"] = settings["retraction_speed"]
+
+def file_settings(gcode: str, sections: list[str], overrides: dict) -> dict:
+    """Works out the settings for one file. Anything SpoonOrder needs that isn't in here gets Cura's default.
+    Settings from the settings file beat the ones from the G-code, including each extruder's."""
+    script_helpers = load_plugin_module("script_helpers")
+    settings = script_helpers.read_setting_footer(gcode)
+    if "relative_extrusion" not in settings:
+        relative = script_helpers.uses_relative_extrusion(sections)
+        if relative is not None:
+            settings["relative_extrusion"] = relative
+
+    extruders: dict[int, dict] = settings.pop("extruders", {})
+    extruder_overrides = {int(index): values for index, values in overrides.get("extruders", {}).items()}
+    global_overrides = {key: value for key, value in overrides.items() if key != "extruders"}
+    settings.update(global_overrides)
+    _prime_speed_follows(settings)
+    for index in extruders.keys() | extruder_overrides.keys():
+        extruder = {key: value for key, value in extruders.get(index, {}).items() if key not in global_overrides}
+        extruder.update(extruder_overrides.get(index, {}))
+        _prime_speed_follows(extruder)
+        extruders[index] = extruder
+    if extruders:
+        settings["extruders"] = extruders
+    return settings
+
+def _order_and_timer(target_name: str, spoons_first: bool, profile: bool, run_name: str):
+    """A SpoonOrder, and a StageTimer it reports its phases to which has already begun if profile is on."""
+    spoon_order = load_plugin_module("SpoonOrder")
+    stage_timing = load_plugin_module("stage_timing")
+    order = spoon_order.SpoonOrder(target_name, spoons_first)
+    order.timer = stage_timing.StageTimer(enabled=profile, track_memory=profile)
+    order.timer.begin(run_name)
+    return order, order.timer
+
+def reorder_file(source: Path, output: Path, overrides: dict, spoons_first: bool, target_name: str, profile: bool = False) -> FileResult:
+    """Reorders one file. Runs in a worker process, so it loads what it needs itself."""
+    start = time.perf_counter()
+    try:
+        script_helpers = load_plugin_module("script_helpers")
+        order, timer = _order_and_timer(target_name, spoons_first, profile, source.name)
+
+        gcode = source.read_text(encoding="utf-8")
+        timer.checkpoint("read_file")
+        sections = script_helpers.split_gcode_layers(gcode)
+        original = list(sections)
+        timer.checkpoint("split_layers")
+        if target_name in gcode:
+            settings = file_settings(gcode, sections, overrides)
+            sections = order.execute(sections, settings)
+        reordered_layers = sum(before != after for before, after in zip(original, sections))
+
+        if output == source and reordered_layers == 0:
+            output = None
+        else:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text("".join(sections), encoding="utf-8")
+        timer.checkpoint("write_file")
+        return FileResult(source, output, reordered_layers, time.perf_counter() - start, report=timer.end())
+    except Exception as e:
+        return FileResult(source, None, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+def reorder_mapped_file(source: Path, output: Path, overrides: dict, spoons_first: bool, target_name: str, profile: bool = False) -> FileResult:
+    """Same as reorder_file() but only reads the layers it needs into memory, for files too big to load all at once."""
+    start = time.perf_counter()
+    try:
+        mapped_gcode = load_plugin_module("MappedGcode")
+        order, timer = _order_and_timer(target_name, spoons_first, profile, source.name)
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with mapped_gcode.MappedGcode(source) as gcode:
+            timer.checkpoint("map_file")
+            if gcode.contains(target_name):
+                settings = file_settings(gcode.footer(), gcode.start_sections(), overrides)
+                reordered_layers = gcode.reorder(output, order, settings)
+            else:
+                reordered_layers = 0
+                if output != source:
+                    shutil.copyfile(source, output)
+        timer.checkpoint("finish_file")
+        if output == source and reordered_layers == 0:
+            output = None
+        return FileResult(source, output, reordered_layers, time.perf_counter() - start, report=timer.end())
+    except Exception as e:
+        return FileResult(source, None, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+def read_settings_file(path: Path) -> dict:
+    spoon_order = load_plugin_module("SpoonOrder")
+    settings = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(settings, dict):
+        raise ValueError(f"{path} should have a JSON object of setting names and values")
+    for key in settings:
+        if key not in spoon_order.SpoonOrder.SETTING_DEFAULTS and key != "extruders":
+            logging.warning(f"{path}: {key} isn't a setting SpoonOrder uses, so it'll be ignored")
+    for index, extruder in settings.get("extruders", {}).items():
+        if not str(index).isdigit() or not isinstance(extruder, dict):
+            raise ValueError(f"{path}: \"extruders\" should have extruder numbers with a JSON object of settings for each")
+        for key in extruder:
+            if key not in spoon_order.SpoonOrder.EXTRUDER_SETTING_KEYS:
+                logging.warning(f"{path}: {key} can't be set for each extruder, so it'll be ignored for extruder {index}")
+    return settings
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reorder spoons in G-code files sliced with Spoon Anti-Warping Reborn, without needing Cura.")
+    parser.add_argument("paths", type=Path, nargs="+", help="G-code files, or folders of them")
+    parser.add_argument("--settings", type=Path, default=None,
+                        help="JSON file of Cura setting names and values, which take priority over the ones in the G-code")
+    parser.add_argument("--spoons-last", action="store_true", help="Print spoons after everything else on each layer instead of before")
+    parser.add_argument("--target-name", default="SpoonTab", help="Part of the mesh name which marks something as a spoon")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output-dir", type=Path, default=None, help="Write reordered files here instead of next to the originals")
+    output.add_argument("--in-place", action="store_true", help="Overwrite the original files")
+    parser.add_argument("--suffix", default="_spoonorder", help="Added to the name of reordered files (default: %(default)s)")
+    parser.add_argument("--recursive", action="store_true", help="Look for G-code in subfolders as well")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Read files through a memory map and only keep the layers with spoons in memory, for really big prints")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Files to process at once (default: %(default)s)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Show the time and memory each phase takes. Memory tracking makes it a lot slower, and use --workers 1 for the times to mean much")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+
+    log_level = logging.DEBUG if args.verbose else logging.WARNING
+    setup_logging(log_level)
+
+    stage_timing = load_plugin_module("stage_timing")
+    overrides = read_settings_file(args.settings) if args.settings else {}
+    files = gather_files(args.paths, (".gcode",), args.recursive, "" if args.in_place else args.suffix)
+    if not files:
+        logging.error("No G-code files found")
+        return 1
+    jobs = [(source, output_path(source, args.output_dir, args.in_place, args.suffix), overrides, not args.spoons_last, args.target_name, args.profile)
+            for source in files]
+
+    start = time.perf_counter()
+    results: list[FileResult] = list(run_jobs(reorder_mapped_file if args.low_memory else reorder_file, jobs, args.workers, log_level))
+
+    failed = 0
+    for result in sorted(results, key=lambda result: str(result.source)):
+        if result.error:
+            failed += 1
+            print(f"FAILED {result.source}: {result.error}", file=sys.stderr)
+        elif result.output is None:
+            print(f"unchanged {result.source} ({result.seconds:.2f}s)")
+        else:
+            print(f"{result.reordered_layers} layers reordered {result.source} -> {result.output} ({result.seconds:.2f}s)")
+        if result.report:
+            print(stage_timing.format_report(result.report))
+    print(f"{len(results) - failed} of {len(results)} files done in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Adds spoons to models without Cura, the same way Add Automatically does.
+# Reads STL, 3MF, OBJ or PLY files and writes either a 3MF with the model and each spoon as
+# separate objects (named like the spoons Cura makes so Print Order still finds them), or an
+# STL with just the spoons to load alongside the model.
+#
+# Usage:
+#   python spoon_place_cli.py part.stl                              Writes part_spoons.3mf next to it
+#   python spoon_place_cli.py parts_folder --output-dir with_spoons  Every model in the folder, using all CPU cores
+#   python spoon_place_cli.py part.3mf --format stl --spoon-diameter 12 --density Sparse --layer-count 2
+#--------------------------------------------------------------------------------------------------
+import argparse
+from dataclasses import dataclass
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+
+from cli_helpers import gather_files, load_plugin_module, output_path, run_jobs, setup_logging
+
+MODEL_EXTENSIONS = (".stl", ".3mf", ".obj", ".ply")
+
+@dataclass
+class FileResult:
+    source: Path
+    output: Path | None
+    spoons: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+def spoon_name(index: int) -> str:
+    """Same pattern as the names the tool gives spoons."""
+    return f"<SpoonTab:{index & 0xFFFF:04X}>"
+
+def place_file(source: Path, output: Path, settings, output_format: str) -> FileResult:
+    """Adds spoons to one model. Runs in a worker process, so it loads what it needs itself."""
+    start = time.perf_counter()
+    try:
+        import mesh_io
+        engine = load_plugin_module("placement_engine")
+
+        vertices, triangles = mesh_io.load_mesh(source)
+        _, spoons = engine.plan_mesh(vertices, triangles, mesh_io.Z_UP_TO_Y_UP, settings)
+        spoons = engine.separate_spoons(spoons, settings)
+
+        # Spoons sit on whatever the bottom of the model is, even if it isn't on Z = 0
+        base_height = float(vertices[:, 2].min())
+        spoon_objects: list[tuple[str, "np.ndarray", "np.ndarray"]] = []
+        for index, spoon in enumerate(spoons, start=1):
+            spoon_vertices, spoon_triangles = engine.spoon_mesh(settings.spoon_diameter, settings.handle_length, settings.handle_width, 10,
+                                                                0, settings.spoon_height, settings.teardrop_shape, spoon.angle)
+            spoon_vertices = spoon_vertices.astype(float) + (spoon.x, base_height, spoon.z)
+            spoon_objects.append((spoon_name(index), mesh_io.y_up_to_z_up(spoon_vertices), spoon_triangles))
+
+        if not spoon_objects:
+            return FileResult(source, None, 0, time.perf_counter() - start)
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if output_format == "3mf":
+            mesh_io.write_3mf(output, [(source.stem, vertices, triangles)] + spoon_objects)
+        else:
+            import numpy as np
+            offsets = np.cumsum([0] + [len(spoon_vertices) for _, spoon_vertices, _ in spoon_objects[:-1]])
+            mesh_io.write_stl(output,
+                              np.concatenate([spoon_vertices for _, spoon_vertices, _ in spoon_objects]),
+                              np.concatenate([spoon_triangles + offset for (_, _, spoon_triangles), offset in zip(spoon_objects, offsets)]))
+        return FileResult(source, output, len(spoon_objects), time.perf_counter() - start)
+    except Exception as e:
+        return FileResult(source, None, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+def main() -> int:
+    engine = load_plugin_module("placement_engine")
+
+    parser = argparse.ArgumentParser(description="Add anti-warping spoons to models without needing Cura.")
+    parser.add_argument("paths", type=Path, nargs="+", help="Model files (STL, 3MF, OBJ or PLY), or folders of them")
+    parser.add_argument("--format", choices=("3mf", "stl"), default="3mf",
+                        help="3mf: the model and each spoon as separate objects. stl: just the spoons (default: %(default)s)")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Write files here instead of next to the originals")
+    parser.add_argument("--suffix", default="_spoons", help="Added to the name of the files written (default: %(default)s)")
+    parser.add_argument("--recursive", action="store_true", help="Look for models in subfolders as well")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Files to process at once (default: %(default)s)")
+    parser.add_argument("--verbose", "-v", action="store_true")
+
+    spoon = parser.add_argument_group("spoon settings", "Same as the settings in the tool panel")
+    spoon.add_argument("--spoon-diameter", type=float, default=10.0)
+    spoon.add_argument("--handle-length", type=float, default=2.0)
+    spoon.add_argument("--handle-width", type=float, default=2.0)
+    spoon.add_argument("--layer-count", type=int, default=1)
+    spoon.add_argument("--teardrop", action="store_true", help="Teardrop shaped spoons")
+    spoon.add_argument("--density", choices=list(engine.DENSITY_GAPS), default=engine.DEFAULT_DENSITY, help="Automatic placement density")
+    spoon.add_argument("--placement", choices=list(engine.PLACEMENT_MODES), default=engine.DEFAULT_PLACEMENT,
+                       help="Put spoons on the corners or evenly spaced around the outline (default: %(default)s)")
+    spoon.add_argument("--nozzle-size", type=float, default=0.4, help="Outlines get simplified to a fraction of this")
+    spoon.add_argument("--outline-tolerance", type=float, default=engine.OUTLINE_TOLERANCE_NOZZLES,
+                       help="How much outlines get simplified, as a fraction of the nozzle size. 0 turns it off (default: %(default)s)")
+    spoon.add_argument("--initial-layer-height", type=float, default=0.2, help="Should match what the model gets sliced with")
+    spoon.add_argument("--layer-height", type=float, default=0.2, help="Should match what the model gets sliced with")
+    args = parser.parse_args()
+
+    log_level = logging.DEBUG if args.verbose else logging.WARNING
+    setup_logging(log_level)
+
+    if args.spoon_diameter <= 0 or args.handle_width <= 0 or args.handle_length < 0 or args.layer_count < 1:
+        parser.error("spoon sizes need to be positive and there needs to be at least one layer")
+    settings = engine.SpoonSettings(
+        spoon_diameter = args.spoon_diameter,
+        handle_length = args.handle_length,
+        handle_width = args.handle_width,
+        spoon_height = engine.spoon_height(args.initial_layer_height, args.layer_height, args.layer_count),
+        teardrop_shape = args.teardrop,
+        density = args.density,
+        placement = args.placement,
+        outline_tolerance = engine.outline_tolerance(args.nozzle_size, args.outline_tolerance),
+    )
+
+    files = gather_files(args.paths, MODEL_EXTENSIONS, args.recursive, args.suffix)
+    if not files:
+        logging.error("No model files found")
+        return 1
+    jobs = [(source, output_path(source, args.output_dir, False, args.suffix, f".{args.format}"), settings, args.format)
+            for source in files]
+
+    start = time.perf_counter()
+    results: list[FileResult] = list(run_jobs(place_file, jobs, args.workers, log_level))
+
+    failed = 0
+    for result in sorted(results, key=lambda result: str(result.source)):
+        if result.error:
+            failed += 1
+            print(f"FAILED {result.source}: {result.error}", file=sys.stderr)
+        elif result.output is None:
+            print(f"no spoons for {result.source} ({result.seconds:.2f}s)")
+        else:
+            print(f"{result.spoons} spoons {result.source} -> {result.output} ({result.seconds:.2f}s)")
+    print(f"{len(results) - failed} of {len(results)} files done in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#--------------------------------------------------------------------------------------------------
+# Spoon Anti-Warping Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Timing for the different stages of things like automatic placement, to see where the time goes.
+# Stages only get timed while the timer is enabled and a run is going. Otherwise the context
+# manager and decorator go straight through, so leaving them in costs next to nothing.
+# It can also track memory with tracemalloc, which slows everything down a lot so it's separate.
+#--------------------------------------------------------------------------------------------------
+from contextlib import nullcontext
+from dataclasses import dataclass
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from typing import Callable
+
+# Handed out when timing is off so there's nothing to create or clean up
+_NOT_TIMING = nullcontext()
+
+@dataclass
+class StageStats:
+    count: int = 0
+    seconds: float = 0.0
+    allocated: int = 0  # Bytes still allocated at the end of the stage that weren't at the start
+    peak: int = 0  # Most bytes allocated during the stage, on top of what was there when the run began
+
+class StageTimer:
+    """Adds up how many times each stage runs and how long it takes over a run.
+    Stages can be timed from worker threads, in which case their times overlap
+    and can add up to more than the run took.
+
+    With memory tracking on, memory is read at the start and end of every stage (and checkpoint).
+    tracemalloc only has one peak for everything, so each reading passes it on to every stage
+    that's open at the time before resetting it."""
+    def __init__(self, enabled: bool = False, track_memory: bool = False) -> None:
+        self._enabled: bool = enabled
+        self._track_memory: bool = track_memory
+        self._lock = threading.RLock()
+        self._run_name: str = ""
+        self._run_start: float | None = None
+        self._stages: dict[str, StageStats] = {}
+        self._last_report: dict | None = None
+
+        self._started_tracing: bool = False  # So it only stops tracemalloc if it was the one who started it
+        self._memory_baseline: int = 0
+        self._memory_peak: int = 0
+        self._open_stages: list["_TimedStage"] = []
+        self._checkpoint: "_TimedStage | None" = None  # Whatever's happened since the last checkpoint
+
+    def isEnabled(self) -> bool:
+        return self._enabled
+
+    def setEnabled(self, enabled: bool) -> None:
+        self._enabled = bool(enabled)
+
+    def isTrackingMemory(self) -> bool:
+        return self._track_memory
+
+    def setTrackMemory(self, track_memory: bool) -> None:
+        """Takes effect from the next run."""
+        self._track_memory = bool(track_memory)
+
+    def isTiming(self) -> bool:
+        return self._enabled and self._run_start is not None
+
+    def begin(self, run_name: str) -> None:
+        """Starts a new run, throwing away anything from one which never finished."""
+        if not self._enabled:
+            return
+        with self._lock:
+            self._stop_tracing()
+            self._run_name = run_name
+            self._stages = {}
+            if self._track_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                self._memory_baseline = tracemalloc.get_traced_memory()[0]
+                self._memory_peak = self._memory_baseline
+                tracemalloc.reset_peak()
+            self._run_start = time.perf_counter()
+            self._checkpoint = _TimedStage(self, "")
+            self._checkpoint.__enter__()
+
+    def end(self) -> dict | None:
+        """Finishes the run and returns its report, or None if there wasn't one going."""
+        if self._run_start is None:
+            return None
+        with self._lock:
+            total = time.perf_counter() - self._run_start
+            memory = self._memory_reading() if self._tracing() else None
+            self._last_report = {
+                "run": self._run_name,
+                "total_ms": round(total * 1000, 3),
+                "stages": {name: self._stage_report(stats, memory is not None) for name, stats in self._stages.items()},
+            }
+            if memory is not None:
+                self._last_report["peak_mb"] = _megabytes(self._memory_peak - self._memory_baseline)
+                self._last_report["allocated_mb"] = _megabytes(memory - self._memory_baseline)
+            self._run_start = None
+            self._stages = {}
+            self._stop_tracing()
+        return self._last_report
+
+    def cancel(self) -> None:
+        """Drops the run without a report."""
+        with self._lock:
+            self._run_start = None
+            self._stages = {}
+            self._stop_tracing()
+
+    def checkpoint(self, stage_name: str | None) -> None:
+        """Records everything since the last checkpoint (or the start of the run) as stage_name.
+        For splitting a long function up into phases without wrapping each one in stage().
+        None starts the next phase without recording what came before it."""
+        if not self.isTiming():
+            return
+        with self._lock:
+            finished = self._checkpoint
+            if finished is not None:
+                if stage_name is None:
+                    if finished in self._open_stages:
+                        self._open_stages.remove(finished)
+                else:
+                    finished._stage_name = stage_name
+                    finished.__exit__(None, None, None)
+            self._checkpoint = _TimedStage(self, "")
+            self._checkpoint.__enter__()
+
+    def _tracing(self) -> bool:
+        return self._track_memory and tracemalloc.is_tracing()
+
+    def _memory_reading(self) -> int:
+        """Memory allocated right now, after passing the peak since the last reading on to everything open."""
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._memory_peak = max(self._memory_peak, peak)
+        for stage in self._open_stages:
+            stage._peak = max(stage._peak, peak)
+        return current
+
+    def _stage_report(self, stats: StageStats, memory: bool) -> dict:
+        report = {"count": stats.count, "ms": round(stats.seconds * 1000, 3)}
+        if memory:
+            report["allocated_mb"] = _megabytes(stats.allocated)
+            report["peak_mb"] = _megabytes(stats.peak)
+        return report
+
+    def _stop_tracing(self) -> None:
+        self._open_stages = []
+        self._checkpoint = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def getLastReport(self) -> dict | None:
+        return self._last_report
+
+    def record(self, stage_name: str, seconds: float, count: int = 1, allocated: int = 0, peak: int = 0) -> None:
+        """Adds to a stage's totals. Peak is in bytes allocated, including what was there before the run."""
+        if not self.isTiming():
+            return
+        with self._lock:
+            stats = self._stages.setdefault(stage_name, StageStats())
+            stats.count += count
+            stats.seconds += seconds
+            stats.allocated += allocated
+            stats.peak = max(stats.peak, peak - self._memory_baseline)
+
+    def stage(self, stage_name: str):
+        """Context manager which times everything inside it as stage_name."""
+        if not self.isTiming():
+            return _NOT_TIMING
+        return _TimedStage(self, stage_name)
+
+    def timed(self, stage_name: str) -> Callable:
+        """Decorator which times every call of a function as stage_name."""
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.isTiming():
+                    return function(*args, **kwargs)
+                with _TimedStage(self, stage_name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+class _TimedStage:
+    __slots__ = ("_timer", "_stage_name", "_start", "_memory_start", "_peak")
+
+    def __init__(self, timer: StageTimer, stage_name: str) -> None:
+        self._timer = timer
+        self._stage_name = stage_name
+        self._start = 0.0
+        self._memory_start: int | None = None
+        self._peak = 0
+
+    def __enter__(self) -> "_TimedStage":
+        timer = self._timer
+        if timer._tracing():
+            with timer._lock:
+                self._memory_start = timer._memory_reading()
+                self._peak = self._memory_start
+                timer._open_stages.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        seconds = time.perf_counter() - self._start
+        timer = self._timer
+        if self._memory_start is None or not timer._tracing():
+            timer.record(self._stage_name, seconds)
+            return
+        with timer._lock:
+            memory = timer._memory_reading()
+            if self in timer._open_stages:
+                timer._open_stages.remove(self)
+            timer.record(self._stage_name, seconds, allocated=memory - self._memory_start, peak=self._peak)
+
+def timed_method(stage_name: str, timer_attribute: str) -> Callable:
+    """Decorator for methods of an object which keeps its StageTimer in timer_attribute.
+    The timer's looked up on each call, so it can be swapped or switched on and off later."""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer: StageTimer | None = getattr(self, timer_attribute, None)
+            if timer is None or not timer.isTiming():
+                return method(self, *args, **kwargs)
+            with _TimedStage(timer, stage_name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def _megabytes(size: int) -> float:
+    return round(size / (1024 * 1024), 3)
+
+def format_report(report: dict | None) -> str:
+    """Readable breakdown of a report for the tool panel, slowest stage first."""
+    if not report:
+        return ""
+    if "peak_mb" in report:
+        lines = [f"{report['run']}: {report['total_ms']:.0f}ms, peak {report['peak_mb']:.1f}MB"]
+    else:
+        lines = [f"{report['run']}: {report['total_ms']:.0f}ms"]
+    for name, stats in sorted(report["stages"].items(), key=lambda item: item[1]["ms"], reverse=True):
+        if "peak_mb" in stats:
+            lines.append(f"  {name}: {stats['ms']:.1f}ms ({stats['count']}x), peak {stats['peak_mb']:.1f}MB, kept {stats['allocated_mb']:+.1f}MB")
+        else:
+            lines.append(f"  {name}: {stats['ms']:.1f}ms ({stats['count']}x)")
+    return "\n".join(lines)
+
+def report_log_line(report: dict) -> str:
+    """The whole report on one line so it can be picked out of cura.log."""
+    return "spoonawreborn_timing " + json.dumps(report, separators=(",", ":"))